@@ -11,7 +11,8 @@ import hats.pixel_math as hist
 import hats.pixel_math.healpix_shim as hp
 from hats.catalog import Catalog, PartitionInfo, TableProperties
 from hats.catalog.association_catalog.partition_join_info import PartitionJoinInfo
-from hats.pixel_math import HealpixPixel
+from hats.pixel_math import HealpixPixel, partition_stats
+from hats.pixel_math.sparse_histogram import SparseHistogram
 from hats.pixel_tree import PixelAlignment, align_trees
 from hats.pixel_tree.pixel_tree import PixelTree
 
@@ -42,6 +43,88 @@ def time_test_cone_filter_multiple_order():
     assert filtered_catalog.get_healpix_pixels() == [HealpixPixel(6, 30), HealpixPixel(7, 124)]
 
 
+class PartitionStatsSuite:
+    """Suite that benchmarks the partitioning of high order histograms."""
+
+    params = [8, 10, 12]
+    param_names = ["highest_order"]
+
+    def __init__(self) -> None:
+        """Just initialize things"""
+        self.histogram = None
+        self.sparse_pixels = None
+        self.sparse_counts = None
+
+    def setup(self, highest_order):
+        self.histogram = np.full(hp.order2npix(highest_order), 1, dtype=np.int64)
+        ## Sparse histogram, where only every 20th pixel is occupied
+        self.sparse_pixels = np.arange(0, hp.order2npix(highest_order), 20, dtype=np.int64)
+        self.sparse_counts = np.full(len(self.sparse_pixels), 1, dtype=np.int64)
+
+    def time_nested_sums(self, highest_order):
+        partition_stats._get_nested_sums(self.histogram, highest_order, 0)
+
+    def time_generate_alignment_arrays(self, highest_order):
+        hist.generate_alignment(
+            self.histogram, highest_order=highest_order, threshold=1_000, return_arrays=True
+        )
+
+    def time_generate_alignment_dropping_siblings(self, highest_order):
+        hist.generate_alignment(
+            self.histogram,
+            highest_order=highest_order,
+            threshold=1_000,
+            drop_empty_siblings=True,
+            return_arrays=True,
+        )
+
+    def time_generate_sparse_alignment(self, highest_order):
+        hist.generate_sparse_alignment(
+            (self.sparse_pixels, self.sparse_counts), highest_order=highest_order, threshold=1_000
+        )
+
+
+class RadecToPixSuite:
+    """Suite that benchmarks mapping coordinates to healpix pixels."""
+
+    params = [1_000_000, 100_000_000]
+    param_names = ["num_points"]
+
+    def __init__(self) -> None:
+        """Just initialize things"""
+        self.ra = None
+        self.dec = None
+
+    def setup(self, num_points):
+        rng = np.random.default_rng(seed=53)
+        self.ra = rng.uniform(0, 360, size=num_points)
+        self.dec = rng.uniform(-90, 90, size=num_points)
+
+    def time_radec2pix(self, _num_points):
+        hp.radec2pix(29, self.ra, self.dec)
+
+    def time_radec2pix_astropy(self, _num_points):
+        hp._radec2pix_astropy(29, self.ra, self.dec)
+
+
+class SparseHistogramSuite:
+    """Suite that benchmarks combining many partial sparse histograms."""
+
+    def __init__(self) -> None:
+        """Just initialize things"""
+        self.partials = None
+
+    def setup(self):
+        rng = np.random.default_rng(seed=53)
+        self.partials = []
+        for _ in range(2_000):
+            indexes = rng.integers(0, hp.order2npix(10), size=5_000)
+            self.partials.append(SparseHistogram.make_from_counts(indexes, np.ones(len(indexes)), 10))
+
+    def time_merge_many(self):
+        SparseHistogram.merge_many(self.partials)
+
+
 class Suite:
     def __init__(self) -> None:
         """Just initialize things"""
@@ -65,6 +148,31 @@ class Suite:
     def time_outer_pixel_alignment(self):
         align_trees(self.pixel_tree_1, self.pixel_tree_2, alignment_type="outer")
 
+    def time_outer_pixel_alignment_threaded(self):
+        align_trees(self.pixel_tree_1, self.pixel_tree_2, alignment_type="outer", n_threads=4, split_order=3)
+
+
+class PixelTreeCreationSuite:
+    """Suite that benchmarks building pixel trees from many pixels."""
+
+    params = [1_000_000, 10_000_000]
+    param_names = ["num_pixels"]
+
+    def __init__(self) -> None:
+        """Just initialize things"""
+        self.orders = None
+        self.pixels = None
+
+    def setup(self, num_pixels):
+        self.orders = np.full(num_pixels, 12, dtype=np.int64)
+        self.pixels = np.arange(num_pixels, dtype=np.int64)
+
+    def time_pixel_tree_from_arrays(self, _num_pixels):
+        PixelTree.from_arrays(self.orders, self.pixels)
+
+    def time_pixel_tree_from_numpy_healpix(self, _num_pixels):
+        PixelTree.from_healpix(np.column_stack((self.orders, self.pixels)))
+
 
 class MetadataSuite:
     """Suite that generates catalog files and benchmarks the operations on them."""
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from hats.catalog.healpix_dataset.healpix_dataset import HealpixDataset
-from hats.pixel_math import HealpixPixel
+from hats.pixel_math import PixelArray
 from hats.pixel_tree.negative_tree import compute_negative_tree_pixels
 
 
@@ -15,7 +15,7 @@ class Catalog(HealpixDataset):
     `Norder=/Dir=/Npix=.parquet`
     """
 
-    def generate_negative_tree_pixels(self) -> list[HealpixPixel]:
+    def generate_negative_tree_pixels(self) -> PixelArray:
         """Get the leaf nodes at each healpix order that have zero catalog data.
 
         For example, if an example catalog only had data points in pixel 0 at
@@ -23,6 +23,6 @@ class Catalog(HealpixDataset):
         Used for getting full coverage on margin caches.
 
         Returns:
-            List of HealpixPixels representing the 'negative tree' for the catalog.
+            `PixelArray` of HealpixPixels representing the 'negative tree' for the catalog.
         """
         return compute_negative_tree_pixels(self.pixel_tree)
@@ -16,8 +16,9 @@ from hats.catalog.dataset.table_properties import TableProperties
 from hats.catalog.partition_info import PartitionInfo
 from hats.inspection import plot_pixels
 from hats.inspection.visualize_catalog import plot_moc
-from hats.pixel_math import HealpixPixel
+from hats.pixel_math import HealpixPixel, PixelArray
 from hats.pixel_math.box_filter import generate_box_moc, wrap_ra_angles
+from hats.pixel_math.spatial_index import compute_spatial_index
 from hats.pixel_math.validators import (
     validate_box,
     validate_declination_values,
@@ -25,6 +26,8 @@ from hats.pixel_math.validators import (
     validate_radius,
 )
 from hats.pixel_tree import PixelAlignment, PixelAlignmentType
+from hats.pixel_tree.alignment_cache import ALIGNMENT_CACHE
+from hats.pixel_tree.cone_filter import get_cone_partition_indexes
 from hats.pixel_tree.moc_filter import filter_by_moc
 from hats.pixel_tree.pixel_alignment import align_with_mocs
 from hats.pixel_tree.pixel_tree import PixelTree
@@ -42,7 +45,7 @@ class HealpixDataset(Dataset):
     def __init__(
         self,
         catalog_info: TableProperties,
-        pixels: PartitionInfo | PixelTree | list[HealpixPixel],
+        pixels: PartitionInfo | PixelTree | PixelArray | list[HealpixPixel],
         catalog_path: str | Path | UPath | None = None,
         moc: MOC | None = None,
         schema: pa.Schema | None = None,
@@ -52,28 +55,54 @@ class HealpixDataset(Dataset):
         Args:
             catalog_info: TableProperties object with catalog metadata
             pixels: Specifies the pixels contained in the catalog. Can be either a
-                list of HealpixPixel, `PartitionInfo object`, or a `PixelTree` object
+                list of HealpixPixel, a `PixelArray`, `PartitionInfo object`, or a `PixelTree` object
             catalog_path: If the catalog is stored on disk, specify the location of the catalog
                 Does not load the catalog from this path, only store as metadata
             moc (mocpy.MOC): MOC object representing the coverage of the catalog
             schema (pa.Schema): The pyarrow schema for the catalog
         """
         super().__init__(catalog_info, catalog_path=catalog_path, schema=schema)
-        self.partition_info = self._get_partition_info_from_pixels(pixels)
-        self.pixel_tree = self._get_pixel_tree_from_pixels(pixels)
+        if not isinstance(pixels, (PartitionInfo, PixelTree)) and not pd.api.types.is_list_like(pixels):
+            raise TypeError("Pixels must be of type PartitionInfo, PixelTree, or List[HealpixPixel]")
+        # The partition info and pixel tree are each only built from the pixels on first access.
+        self._pixels = pixels
+        self._partition_info = pixels if isinstance(pixels, PartitionInfo) else None
+        self._pixel_tree = pixels if isinstance(pixels, PixelTree) else None
         self.moc = moc
 
-    def get_healpix_pixels(self) -> list[HealpixPixel]:
+    @property
+    def partition_info(self) -> PartitionInfo:
+        """The `PartitionInfo` for the pixels in the catalog, built when first accessed."""
+        if self._partition_info is None:
+            self._partition_info = self._get_partition_info_from_pixels(self._pixels)
+        return self._partition_info
+
+    @partition_info.setter
+    def partition_info(self, partition_info: PartitionInfo):
+        self._partition_info = partition_info
+
+    @property
+    def pixel_tree(self) -> PixelTree:
+        """The `PixelTree` for the pixels in the catalog, built when first accessed."""
+        if self._pixel_tree is None:
+            self._pixel_tree = self._get_pixel_tree_from_pixels(self._pixels)
+        return self._pixel_tree
+
+    @pixel_tree.setter
+    def pixel_tree(self, pixel_tree: PixelTree):
+        self._pixel_tree = pixel_tree
+
+    def get_healpix_pixels(self) -> list[HealpixPixel] | PixelArray:
         """Get healpix pixel objects for all pixels contained in the catalog.
 
         Returns:
-            List of HealpixPixel
+            List of HealpixPixel, or an array-backed `PixelArray`
         """
         return self.partition_info.get_healpix_pixels()
 
     @staticmethod
     def _get_partition_info_from_pixels(
-        pixels: PartitionInfo | PixelTree | list[HealpixPixel],
+        pixels: PartitionInfo | PixelTree | PixelArray | list[HealpixPixel],
     ) -> PartitionInfo:
         if isinstance(pixels, PartitionInfo):
             return pixels
@@ -84,7 +113,9 @@ class HealpixDataset(Dataset):
         raise TypeError("Pixels must be of type PartitionInfo, PixelTree, or List[HealpixPixel]")
 
     @staticmethod
-    def _get_pixel_tree_from_pixels(pixels: PartitionInfo | PixelTree | list[HealpixPixel]) -> PixelTree:
+    def _get_pixel_tree_from_pixels(
+        pixels: PartitionInfo | PixelTree | PixelArray | list[HealpixPixel],
+    ) -> PixelTree:
         if isinstance(pixels, PartitionInfo):
             return PixelTree.from_healpix(pixels.get_healpix_pixels())
         if isinstance(pixels, PixelTree):
@@ -117,18 +148,19 @@ class HealpixDataset(Dataset):
         )
         return max_order
 
-    def filter_from_pixel_list(self, pixels: list[HealpixPixel]) -> Self:
+    def filter_from_pixel_list(self, pixels: list[HealpixPixel] | PixelArray) -> Self:
         """Filter the pixels in the catalog to only include any that overlap with the requested pixels.
 
         Args:
-            pixels (List[HealpixPixels]): the pixels to include
+            pixels (List[HealpixPixels] | PixelArray): the pixels to include
 
         Returns:
             A new catalog with only the pixels that overlap with the given pixels. Note that we reset the
             total_rows to None, as updating would require a scan over the new pixel sizes.
         """
-        orders = np.array([p.order for p in pixels])
-        pixel_inds = np.array([p.pixel for p in pixels])
+        pixel_array = PixelArray.from_healpix(pixels)
+        orders = pixel_array.orders
+        pixel_inds = pixel_array.pixels
         max_order = np.max(orders) if len(orders) > 0 else 0
         moc = MOC.from_healpix_cells(ipix=pixel_inds, depth=orders, max_depth=max_order)
         return self.filter_by_moc(moc)
@@ -154,6 +186,60 @@ class HealpixDataset(Dataset):
         )
         return self.filter_by_moc(cone_moc)
 
+    def get_partitions_in_cones(
+        self, ra: np.ndarray, dec: np.ndarray, radius_arcsec: np.ndarray | float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the pixels in the catalog that overlap with each of many cones, in a single pass
+
+        Unlike calling `filter_by_cone` for each cone, this does not create a MOC or a catalog per cone.
+        The pixels found for a cone may include a few that are close to the cone without overlapping it.
+
+        Args:
+            ra (np.ndarray): Right ascensions of the centers of the cones, in degrees
+            dec (np.ndarray): Declinations of the centers of the cones, in degrees
+            radius_arcsec (np.ndarray | float): Radii of the cones, in arcseconds. May be a single radius
+                used for all cones.
+
+        Returns:
+            A tuple of (offsets, pixel_indexes) in compressed sparse row format. The pixels overlapping
+            cone i are `self.pixel_tree.get_healpix_pixels()[pixel_indexes[offsets[i]:offsets[i + 1]]]`.
+        """
+        validate_radius(radius_arcsec)
+        validate_declination_values(dec)
+        return get_cone_partition_indexes(self.pixel_tree, ra, dec, radius_arcsec)
+
+    def locate_partitions(
+        self, ra: np.ndarray, dec: np.ndarray, n_threads: int | None = None, chunk_size: int | None = None
+    ) -> np.ndarray:
+        """Find the leaf pixel of the catalog that contains each of many points
+
+        Args:
+            ra (np.ndarray): Right ascensions of the points, in degrees
+            dec (np.ndarray): Declinations of the points, in degrees
+            n_threads (int): number of threads to compute the spatial index of the points with.
+                See `compute_spatial_index`.
+            chunk_size (int): number of points in each chunk when computing the spatial index.
+                See `compute_spatial_index`.
+
+        Returns:
+            int64 array with the index of the leaf pixel containing each point, in the order of
+            `self.pixel_tree.get_healpix_pixels()`, or -1 for points outside the catalog's pixels
+        """
+        spatial_index = compute_spatial_index(ra, dec, n_threads=n_threads, chunk_size=chunk_size)
+        return self.locate_partitions_from_spatial_index(spatial_index)
+
+    def locate_partitions_from_spatial_index(self, spatial_index: np.ndarray) -> np.ndarray:
+        """Find the leaf pixel of the catalog that contains each of many `_healpix_29` values
+
+        Args:
+            spatial_index (np.ndarray): `_healpix_29` values of the points
+
+        Returns:
+            int64 array with the index of the leaf pixel containing each point, in the order of
+            `self.pixel_tree.get_healpix_pixels()`, or -1 for points outside the catalog's pixels
+        """
+        return self.pixel_tree.get_spatial_index_leaf_indexes(spatial_index)
+
     def filter_by_box(self, ra: tuple[float, float], dec: tuple[float, float]) -> Self:
         """Filter the pixels in the catalog to only include the pixels that overlap with a
         zone, defined by right ascension and declination ranges. The right ascension edges follow
@@ -203,7 +289,10 @@ class HealpixDataset(Dataset):
         return self.__class__(filtered_catalog_info, filtered_tree, moc=filtered_moc, schema=self.schema)
 
     def align(
-        self, other_cat: Self, alignment_type: PixelAlignmentType = PixelAlignmentType.INNER
+        self,
+        other_cat: Self,
+        alignment_type: PixelAlignmentType = PixelAlignmentType.INNER,
+        use_cache: bool = False,
     ) -> PixelAlignment:
         """Performs an alignment to another catalog, using the pixel tree and mocs if available
 
@@ -224,11 +313,15 @@ class HealpixDataset(Dataset):
                 - "left" - use all pixels that appear in the left catalog and any overlapping from the right
                 - "right" - use all pixels that appear in the right catalog and any overlapping from the left
                 - "outer" - use all pixels from both catalogs
+            use_cache (bool): If True, the alignment is cached in
+                `hats.pixel_tree.alignment_cache.ALIGNMENT_CACHE`, so aligning catalogs with the same pixels
+                and mocs again returns the same read-only `PixelAlignment` without recomputing it.
 
         Returns (PixelAlignment):
             A `PixelAlignment` object with the alignment from the two catalogs
         """
-        return align_with_mocs(
+        align_function = ALIGNMENT_CACHE.align_with_mocs if use_cache else align_with_mocs
+        return align_function(
             self.pixel_tree, other_cat.pixel_tree, self.moc, other_cat.moc, alignment_type=alignment_type
         )
 
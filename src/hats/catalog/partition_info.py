@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import warnings
 from pathlib import Path
 
@@ -17,7 +18,8 @@ from hats.io.parquet_metadata import (
     row_group_stat_single_value,
     write_parquet_metadata_for_batches,
 )
-from hats.pixel_math import HealpixPixel
+from hats.pixel_math import HealpixPixel, PixelArray
+from hats.pixel_tree.pixel_tree import PixelTree
 
 
 class PartitionInfo:
@@ -26,15 +28,16 @@ class PartitionInfo:
     METADATA_ORDER_COLUMN_NAME = "Norder"
     METADATA_PIXEL_COLUMN_NAME = "Npix"
 
-    def __init__(self, pixel_list: list[HealpixPixel], catalog_base_dir: str = None) -> None:
+    def __init__(self, pixel_list: list[HealpixPixel] | PixelArray, catalog_base_dir: str = None) -> None:
         self.pixel_list = pixel_list
         self.catalog_base_dir = catalog_base_dir
 
-    def get_healpix_pixels(self) -> list[HealpixPixel]:
+    def get_healpix_pixels(self) -> list[HealpixPixel] | PixelArray:
         """Get healpix pixel objects for all pixels represented as partitions.
 
         Returns:
-            List of HealpixPixel
+            List of HealpixPixel, or a `PixelArray` if the partition info was read from
+            a `partition_info.csv` file.
         """
         return self.pixel_list
 
@@ -44,6 +47,8 @@ class PartitionInfo:
         Returns:
             int representing highest order.
         """
+        if isinstance(self.pixel_list, PixelArray):
+            return int(np.max(self.pixel_list.orders))
         max_pixel = np.max(self.pixel_list)
         return max_pixel.order
 
@@ -51,6 +56,7 @@ class PartitionInfo:
         self,
         partition_info_file: str | Path | UPath | None = None,
         catalog_path: str | Path | UPath | None = None,
+        write_pixel_tree: bool = True,
     ):
         """Write all partition data to CSV file.
 
@@ -61,6 +67,11 @@ class PartitionInfo:
                 file will be written.
             catalog_path: base directory for a catalog where the `partition_info.csv`
                 file will be written.
+            write_pixel_tree (bool): if True, also write the `pixel_tree.bin` file with the
+                binary pixel tree of the partitions to the same directory, so the tree can be
+                loaded without parsing the CSV file. The file is only written alongside the
+                directory's own `partition_info.csv`, and not if the pixels overlap, and so do
+                not form a valid tree.
 
         Raises:
             ValueError: if no path is provided, and could not be inferred.
@@ -73,7 +84,48 @@ class PartitionInfo:
             else:
                 raise ValueError("partition_info_file is required if info was not loaded from a directory")
 
+        partition_info_file = file_io.get_upath(partition_info_file)
+        catalog_dir = partition_info_file.parent
+        # The tree file belongs to the directory's partition_info.csv, and is not replaced by other files
+        is_catalog_partition_info = partition_info_file == paths.get_partition_info_pointer(catalog_dir)
+        write_pixel_tree = write_pixel_tree and is_catalog_partition_info
+        # The tree is built before anything is written, so invalid pixels leave no partial output
+        pixel_tree = self._get_pixel_tree() if write_pixel_tree else None
         file_io.write_dataframe_to_csv(self.as_dataframe(), partition_info_file, index=False)
+        if pixel_tree is not None:
+            pixel_array = PixelArray.from_healpix(self.pixel_list)
+            pixel_order = pixel_tree.get_containing_leaf_indexes(pixel_array.orders, pixel_array.pixels)
+            if np.array_equal(pixel_order, np.arange(len(pixel_order))):
+                pixel_order = None
+            pixel_tree.write_to_file(
+                paths.get_pixel_tree_pointer(catalog_dir),
+                checksum=PartitionInfo.get_checksum(partition_info_file),
+                pixel_order=pixel_order,
+            )
+
+    def _get_pixel_tree(self) -> PixelTree | None:
+        """Builds the pixel tree of the partitions, or returns None if the pixels overlap"""
+        try:
+            return PixelTree.from_healpix(self.pixel_list)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def get_checksum(partition_info_file: str | Path | UPath) -> bytes:
+        """Compute the checksum of a `partition_info.csv` file, which is stored in the
+        `pixel_tree.bin` file to check that the tree matches the partition info.
+
+        Args:
+            partition_info_file: path to the `partition_info.csv` file
+
+        Returns:
+            The 16 byte digest of the contents of the file
+        """
+        file_hash = hashlib.blake2b(digest_size=16)
+        with file_io.get_upath(partition_info_file).open("rb") as _file:
+            while chunk := _file.read(1 << 20):
+                file_hash.update(chunk)
+        return file_hash.digest()
 
     def write_to_metadata_files(self, catalog_path: str | Path | UPath | None = None):
         """Generate parquet metadata, using the known partitions.
@@ -140,6 +192,39 @@ class PartitionInfo:
             )
         return cls(pixel_list, catalog_base_dir)
 
+    @classmethod
+    def read_from_pixel_tree_file(
+        cls, catalog_base_dir: str | Path | UPath
+    ) -> tuple[PartitionInfo, PixelTree] | None:
+        """Read partition info and the pixel tree from the `pixel_tree.bin` file in a hats directory.
+
+        The file is only used if it matches the `partition_info.csv` file in the same directory.
+        The partitions are in the same order as in the CSV file, without parsing it.
+
+        Args:
+            catalog_base_dir: path to the root directory of the catalog
+
+        Returns:
+            A tuple of the `PartitionInfo` and the `PixelTree` from the file, or None if the files
+            do not exist, or the pixel tree file does not match the partition info.
+        """
+        pixel_tree_file = paths.get_pixel_tree_pointer(catalog_base_dir)
+        partition_info_file = paths.get_partition_info_pointer(catalog_base_dir)
+        if not (
+            file_io.does_file_or_directory_exist(pixel_tree_file)
+            and file_io.does_file_or_directory_exist(partition_info_file)
+        ):
+            return None
+        try:
+            pixel_tree, pixel_order = PixelTree.read_from_file(
+                pixel_tree_file, checksum=cls.get_checksum(partition_info_file), return_pixel_order=True
+            )
+        except ValueError:
+            warnings.warn("The pixel tree file does not match the partition info, and will not be used.")
+            return None
+        pixels = pixel_tree.pixels if pixel_order is None else pixel_tree.pixels[pixel_order]
+        return cls(PixelArray(pixels[:, 0], pixels[:, 1]), catalog_base_dir), pixel_tree
+
     @classmethod
     def read_from_file(cls, metadata_file: str | Path | UPath, strict: bool = False) -> PartitionInfo:
         """Read partition info from a `_metadata` file to create an object
@@ -221,27 +306,24 @@ class PartitionInfo:
         return cls(cls._read_from_csv(partition_info_file))
 
     @classmethod
-    def _read_from_csv(cls, partition_info_file: str | Path | UPath) -> PartitionInfo:
+    def _read_from_csv(cls, partition_info_file: str | Path | UPath) -> PixelArray:
         """Read partition info from a `partition_info.csv` file to create an object
 
         Args:
             partition_info_file (UPath): path to the `partition_info.csv` file
 
         Returns:
-            A `PartitionInfo` object with the data from the file
+            A `PixelArray` with the pixels from the file
         """
         if not file_io.does_file_or_directory_exist(partition_info_file):
             raise FileNotFoundError(f"No partition info found where expected: {str(partition_info_file)}")
 
         data_frame = file_io.load_csv_to_pandas(partition_info_file)
 
-        return [
-            HealpixPixel(order, pixel)
-            for order, pixel in zip(
-                data_frame[cls.METADATA_ORDER_COLUMN_NAME],
-                data_frame[cls.METADATA_PIXEL_COLUMN_NAME],
-            )
-        ]
+        return PixelArray(
+            data_frame[cls.METADATA_ORDER_COLUMN_NAME].to_numpy(dtype=np.int64),
+            data_frame[cls.METADATA_PIXEL_COLUMN_NAME].to_numpy(dtype=np.int64),
+        )
 
     def as_dataframe(self):
         """Construct a pandas dataframe for the partition info pixels.
@@ -249,21 +331,19 @@ class PartitionInfo:
         Returns:
             Dataframe with order, directory, and pixel info.
         """
+        pixel_array = PixelArray.from_healpix(self.pixel_list)
         partition_info_dict = {
-            PartitionInfo.METADATA_ORDER_COLUMN_NAME: [],
-            PartitionInfo.METADATA_PIXEL_COLUMN_NAME: [],
+            PartitionInfo.METADATA_ORDER_COLUMN_NAME: pixel_array.orders,
+            PartitionInfo.METADATA_PIXEL_COLUMN_NAME: pixel_array.pixels,
         }
-        for pixel in self.pixel_list:
-            partition_info_dict[PartitionInfo.METADATA_ORDER_COLUMN_NAME].append(pixel.order)
-            partition_info_dict[PartitionInfo.METADATA_PIXEL_COLUMN_NAME].append(pixel.pixel)
         return pd.DataFrame.from_dict(partition_info_dict)
 
     @classmethod
-    def from_healpix(cls, healpix_pixels: list[HealpixPixel]) -> PartitionInfo:
+    def from_healpix(cls, healpix_pixels: list[HealpixPixel] | PixelArray) -> PartitionInfo:
         """Create a partition info object from a list of constituent healpix pixels.
 
         Args:
-            healpix_pixels: list of healpix pixels
+            healpix_pixels: list of healpix pixels, or a `PixelArray`
         Returns:
             A `PartitionInfo` object with the same healpix pixels
         """
@@ -271,7 +351,7 @@ class PartitionInfo:
 
     def calculate_fractional_coverage(self):
         """Calculate what fraction of the sky is covered by partition tiles."""
-        pixel_orders = [p.order for p in self.pixel_list]
+        pixel_orders = PixelArray.from_healpix(self.pixel_list).orders
         cov_order, cov_count = np.unique(pixel_orders, return_counts=True)
         area_by_order = [hp.order2pixarea(order, degrees=True) for order in cov_order]
         # 41253 is the number of square degrees in a sphere
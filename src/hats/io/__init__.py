@@ -10,6 +10,7 @@ from .paths import (
     get_common_metadata_pointer,
     get_parquet_metadata_pointer,
     get_partition_info_pointer,
+    get_pixel_tree_pointer,
     get_point_map_file_pointer,
     pixel_catalog_file,
     pixel_directory,
@@ -26,6 +26,7 @@ PARTITION_JOIN_INFO_FILENAME = "partition_join_info.csv"
 PARQUET_METADATA_FILENAME = "_metadata"
 PARQUET_COMMON_METADATA_FILENAME = "_common_metadata"
 POINT_MAP_FILENAME = "point_map.fits"
+PIXEL_TREE_FILENAME = "pixel_tree.bin"
 
 
 def pixel_directory(
@@ -197,6 +198,17 @@ def get_point_map_file_pointer(catalog_base_dir: str | Path | UPath) -> UPath:
     return get_upath(catalog_base_dir) / POINT_MAP_FILENAME
 
 
+def get_pixel_tree_pointer(catalog_base_dir: str | Path | UPath) -> UPath:
+    """Get file pointer to `pixel_tree.bin` binary pixel tree file.
+
+    Args:
+        catalog_base_dir: pointer to base catalog directory
+    Returns:
+        File Pointer to the catalog's `pixel_tree.bin` file.
+    """
+    return get_upath(catalog_base_dir) / PIXEL_TREE_FILENAME
+
+
 def get_partition_join_info_pointer(catalog_base_dir: str | Path | UPath) -> UPath:
     """Get file pointer to `partition_join_info.csv` association metadata file
 
@@ -48,12 +48,21 @@ def read_hats(catalog_path: str | Path | UPath) -> Dataset:
             "catalog_info": properties,
             "schema": _read_schema_from_metadata(catalog_path),
         }
+        pixel_tree = None
         if _is_healpix_dataset(dataset_type):
-            kwargs["pixels"] = PartitionInfo.read_from_dir(catalog_path)
+            # The `pixel_tree.bin` file, if present, gives both the partitions and the pixel tree
+            partition_info_and_tree = PartitionInfo.read_from_pixel_tree_file(catalog_path)
+            if partition_info_and_tree is None:
+                kwargs["pixels"] = PartitionInfo.read_from_dir(catalog_path)
+            else:
+                kwargs["pixels"], pixel_tree = partition_info_and_tree
             kwargs["moc"] = _read_moc_from_point_map(catalog_path)
         if dataset_type == CatalogType.ASSOCIATION:
             kwargs["join_pixels"] = PartitionJoinInfo.read_from_dir(catalog_path)
-        return loader(**kwargs)
+        dataset = loader(**kwargs)
+        if pixel_tree is not None:
+            dataset.pixel_tree = pixel_tree
+        return dataset
     except Exception as exception:  # pylint: disable=broad-except
         raise FileNotFoundError(f"Failed to read HATS at location {catalog_path}") from exception
 
@@ -2,6 +2,13 @@
 
 from .healpix_pixel import HealpixPixel
 from .healpix_pixel_convertor import get_healpix_pixel
-from .partition_stats import empty_histogram, generate_alignment, generate_histogram
+from .partition_stats import (
+    empty_histogram,
+    generate_alignment,
+    generate_histogram,
+    generate_histogram_from_batches,
+    generate_sparse_alignment,
+)
+from .pixel_array import PixelArray
 from .pixel_margins import get_margin
 from .spatial_index import compute_spatial_index, spatial_index_to_healpix
@@ -1,6 +1,7 @@
 import numpy as np
 
 from hats.pixel_math.healpix_pixel import HealpixPixel
+from hats.pixel_math.pixel_array import PixelArray
 
 
 def get_pixel_argsort(pixels: list[HealpixPixel]):
@@ -18,6 +19,9 @@ def get_pixel_argsort(pixels: list[HealpixPixel]):
     """
     if pixels is None or len(pixels) == 0:
         return []
+    if isinstance(pixels, PixelArray):
+        highest_order = np.max(pixels.orders)
+        return np.argsort(pixels.pixels << (2 * (highest_order - pixels.orders)), kind="stable")
     # Construct a parallel list of exploded, high order pixels.
     highest_order = np.max(pixels).order
 
@@ -68,3 +72,54 @@ def get_pixels_from_intervals(intervals: np.ndarray, tree_order: int) -> np.ndar
     orders[non_negative_mask] = tree_order - (np.int64(np.log2(end_intervals - start_intervals)) >> 1)
     pixels[non_negative_mask] = start_intervals >> 2 * (tree_order - orders[non_negative_mask])
     return np.array([orders, pixels]).T
+
+
+def split_ranges_into_intervals(
+    starts: np.ndarray, ends: np.ndarray, tree_order: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits sorted, non-overlapping ranges of pixel numbers into the fewest HEALPix pixels that cover them
+
+    Each step takes the largest pixel that fits at the start of every remaining range, so this takes at
+    most two steps per HEALPix order. No pixel is larger than an order 0 pixel, so ranges may span more
+    than one order 0 pixel.
+
+    Args:
+        starts (np.ndarray): the starts of the ranges
+        ends (np.ndarray): the ends of the ranges
+        tree_order (int): The order of the pixel numbers in the ranges
+
+    Returns:
+        Sorted arrays of the starts and ends of the pixel intervals, and the index of the range that
+        each pixel comes from
+    """
+    max_size = np.int64(1) << (2 * tree_order)
+    pixel_starts, pixel_ends, range_indexes = [], [], []
+    remaining_starts = np.array(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    active = np.arange(len(starts))
+    while len(active) > 0:
+        range_starts = remaining_starts[active]
+        # largest power of 4 that is a factor of the start. Zero is a multiple of any power of 4.
+        max_size_from = np.where(range_starts == 0, max_size, range_starts & -range_starts)
+        max_size_from = np.where(max_size_from & 0xAAAAAAAAAAAAAAA, max_size_from >> 1, max_size_from)
+        # largest power of 4 no larger than the rest of the range
+        remaining = ends[active] - range_starts
+        log2_remaining = np.floor(np.log2(remaining)).astype(np.int64)
+        log2_remaining -= (np.int64(1) << log2_remaining) > remaining
+        max_size_to = np.int64(1) << (log2_remaining - (log2_remaining & 1))
+        sizes = np.minimum(np.minimum(max_size_from, max_size_to), max_size)
+        pixel_starts.append(range_starts)
+        pixel_ends.append(range_starts + sizes)
+        range_indexes.append(active)
+        remaining_starts[active] = range_starts + sizes
+        active = active[remaining_starts[active] < ends[active]]
+    if len(pixel_starts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    pixel_starts = np.concatenate(pixel_starts)
+    sort_order = np.argsort(pixel_starts, kind="stable")
+    return (
+        pixel_starts[sort_order],
+        np.concatenate(pixel_ends)[sort_order],
+        np.concatenate(range_indexes)[sort_order],
+    )
@@ -58,23 +58,105 @@ def order2pixarea(order: int, *, degrees: bool = False, unit=u.sr) -> float:
     return pix_area_rad.to_value(unit)
 
 
-def radec2pix(order: int, ra: float, dec: float) -> np.ndarray[np.int64]:
+def radec2pix(
+    order: int, ra: float, dec: float, out: np.ndarray | None = None, num_threads: int = 0
+) -> np.ndarray[np.int64]:
+    """Converts ra and dec, in degrees, to pixels at the given order.
+
+    If provided, the pixels are written into the int64 array `out`, which is returned.
+    `num_threads` is passed on to cdshealpix, where 0 uses all available cores.
+    """
     if not is_order_valid(order):
         raise ValueError("Invalid value for order")
 
+    if _lonlat_to_healpix_native is not None and _is_native_input(ra, dec):
+        return _radec2pix_native(order, ra, dec, out=out, num_threads=num_threads)
+    pixels = _radec2pix_astropy(order, ra, dec, num_threads=num_threads)
+    if out is None:
+        return pixels
+    out[...] = pixels
+    return out
+
+
+# The native extension of cdshealpix, that the astropy-facing functions wrap.
+_lonlat_to_healpix_native = getattr(getattr(cdshealpix, "cdshealpix", None), "lonlat_to_healpix", None)
+
+
+def _is_native_input(ra, dec) -> bool:
+    """Checks whether ra and dec are float64 arrays of the same shape, for the native path."""
+    if not (isinstance(ra, np.ndarray) and isinstance(dec, np.ndarray)):
+        return False
+    return ra.dtype == np.float64 and dec.dtype == np.float64 and ra.ndim > 0 and ra.shape == dec.shape
+
+
+def _radec2pix_astropy(order: int, ra: float, dec: float, num_threads: int = 0) -> np.ndarray[np.int64]:
+    """Converts ra and dec to pixels, wrapping the values as astropy Longitude and Latitude."""
     ra = Longitude(np.asarray(ra, dtype=np.float64), unit="deg")
     dec = Latitude(np.asarray(dec, dtype=np.float64), unit="deg")
 
-    return cdshealpix.lonlat_to_healpix(ra, dec, order).astype(np.int64)
+    return cdshealpix.lonlat_to_healpix(ra, dec, order, num_threads=num_threads).astype(np.int64)
+
+
+def _radec2pix_native(
+    order: int, ra: np.ndarray, dec: np.ndarray, out: np.ndarray | None = None, num_threads: int = 0
+) -> np.ndarray[np.int64]:
+    """Converts float64 arrays of ra and dec to pixels, validating with plain numpy and
+    calling the native cdshealpix hashing directly, without any astropy quantities."""
+    if dec.size > 0 and (np.min(dec) < -90.0 or np.max(dec) > 90.0):
+        raise ValueError("Latitude angle(s) must be within -90 deg <= angle <= 90 deg")
+    if out is None:
+        out = np.empty(ra.shape, dtype=np.int64)
+    elif out.dtype != np.int64 or out.shape != ra.shape:
+        raise ValueError("out must be an int64 array with the same shape as ra and dec")
+    # Wrap longitudes into [0, 360), as astropy's Longitude does, for consistent pixels on the boundary.
+    # Most inputs are already in range, and are converted to radians in a single pass.
+    if ra.size > 0 and (np.min(ra) < 0.0 or np.max(ra) >= 360.0):
+        lon = np.mod(ra, 360.0)
+        lon[lon == 360.0] = 0.0
+        np.radians(lon, out=lon)
+    else:
+        lon = np.radians(ra)
+    # Offsets within the pixel are not used, but are always computed by the extension.
+    offset_x = np.empty(ra.shape, dtype=np.float64)
+    offset_y = np.empty(ra.shape, dtype=np.float64)
+    # Pixel numbers are at most 12 * 4**29, and so the extension can write its uint64
+    # output directly into the int64 array.
+    _lonlat_to_healpix_native(
+        np.broadcast_to(np.uint8(order), ra.shape),
+        lon,
+        np.radians(dec),
+        out.view(np.uint64),
+        offset_x,
+        offset_y,
+        np.uint16(num_threads),
+    )
+    return out
 
 
 ## Coordinate conversion
 
 
 def ang2vec(ra, dec, **kwargs) -> np.ndarray:
-    """Converts ra and dec to cartesian coordinates on the unit sphere"""
-    coords = SkyCoord(ra=ra * u.deg, dec=dec * u.deg, **kwargs).cartesian
-    return np.array([coords.x.value, coords.y.value, coords.z.value]).T
+    """Converts ra and dec to cartesian coordinates on the unit sphere
+
+    Any keyword arguments (e.g. a ``frame``) are passed on to an astropy ``SkyCoord``,
+    which is then used for the conversion. Otherwise, the conversion is done directly
+    with numpy.
+    """
+    if kwargs:
+        coords = SkyCoord(ra=ra * u.deg, dec=dec * u.deg, **kwargs).cartesian
+        return np.array([coords.x.value, coords.y.value, coords.z.value]).T
+    ra_rad = np.radians(np.asarray(ra, dtype=np.float64))
+    dec_rad = np.radians(np.asarray(dec, dtype=np.float64))
+    if dec_rad.size > 0 and np.max(np.abs(dec_rad)) > np.pi / 2:
+        raise ValueError("Latitude angle(s) must be within -90 deg <= angle <= 90 deg")
+    ra_rad, dec_rad = np.broadcast_arrays(ra_rad, dec_rad)
+    vectors = np.empty(ra_rad.shape + (3,), dtype=np.float64)
+    cos_dec = np.cos(dec_rad)
+    np.multiply(cos_dec, np.cos(ra_rad), out=vectors[..., 0])
+    np.multiply(cos_dec, np.sin(ra_rad), out=vectors[..., 1])
+    np.sin(dec_rad, out=vectors[..., 2])
+    return vectors
 
 
 ## Custom functions
@@ -1,9 +1,18 @@
 """Utilities for generating and manipulating object count histograms"""
 
+from __future__ import annotations
+
+from collections.abc import Iterable
+
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 import hats.pixel_math.healpix_shim as hp
+from hats.pixel_math.sparse_histogram import SparseHistogram
+
+## Number of per-batch sparse histograms to hold, before merging them into the running total.
+_MAX_PENDING_PARTIALS = 16
 
 
 def empty_histogram(highest_order):
@@ -53,8 +62,76 @@ def generate_histogram(
     return histogram_result
 
 
+def generate_histogram_from_batches(
+    batches: Iterable[pa.RecordBatch | pa.Table | tuple[np.ndarray, np.ndarray]],
+    highest_order,
+    ra_column="ra",
+    dec_column="dec",
+    sparse=False,
+):
+    """Generate a histogram of counts for objects found in a stream of batches of data.
+
+    Only a single batch is held in memory at a time, so this can be used for inputs much larger
+    than memory, e.g.::
+
+        batches = pq.ParquetFile(path).iter_batches(columns=["ra", "dec"])
+        histogram = generate_histogram_from_batches(batches, highest_order=10)
+
+    Args:
+        batches (Iterable): iterable of `pyarrow.RecordBatch` or `pyarrow.Table`, with the
+            `ra_column` and `dec_column`, or of tuples of (ra, dec) arrays.
+        highest_order (int):  the highest healpix order (e.g. 0-10)
+        ra_column (str): where in the input to find the celestial coordinate, right ascension
+        dec_column (str): where in the input to find the celestial coordinate, declination
+        sparse (bool): if True, accumulate and return a `SparseHistogram`, whose memory use
+            scales with the number of non-empty pixels. This is preferable for high orders.
+    Returns:
+        one-dimensional numpy array of long integers where the value at each index corresponds
+        to the number of objects found at the healpix pixel, or a `SparseHistogram` if `sparse`.
+    Raises:
+        ValueError: if the `ra_column` or `dec_column` cannot be found in a batch.
+    """
+    if sparse:
+        histogram_result = SparseHistogram.make_empty(highest_order)
+        partials = []
+    else:
+        histogram_result = empty_histogram(highest_order)
+
+    for batch in batches:
+        if isinstance(batch, (pa.RecordBatch, pa.Table)):
+            if ra_column not in batch.schema.names or dec_column not in batch.schema.names:
+                raise ValueError(f"Invalid column names in input: {ra_column}, {dec_column}")
+            ra_values = batch[ra_column].to_numpy()
+            dec_values = batch[dec_column].to_numpy()
+        else:
+            ra_values, dec_values = batch
+        mapped_pixels = hp.radec2pix(highest_order, ra_values, dec_values)
+        if len(mapped_pixels) == 0:
+            continue
+        if sparse:
+            mapped_pixel, count_at_pixel = np.unique(mapped_pixels, return_counts=True)
+            partials.append(SparseHistogram(mapped_pixel, count_at_pixel, highest_order))
+            if len(partials) >= _MAX_PENDING_PARTIALS:
+                histogram_result = SparseHistogram.merge_many([histogram_result, *partials])
+                partials = []
+        else:
+            # Only count over the range of pixels in the batch, which is often spatially local.
+            min_pixel = np.min(mapped_pixels)
+            count_at_pixel = np.bincount(mapped_pixels - min_pixel)
+            histogram_result[min_pixel : min_pixel + len(count_at_pixel)] += count_at_pixel
+
+    if sparse and len(partials) > 0:
+        histogram_result = SparseHistogram.merge_many([histogram_result, *partials])
+    return histogram_result
+
+
 def generate_alignment(
-    histogram, highest_order=10, lowest_order=0, threshold=1_000_000, drop_empty_siblings=False
+    histogram,
+    highest_order=10,
+    lowest_order=0,
+    threshold=1_000_000,
+    drop_empty_siblings=False,
+    return_arrays=False,
 ):
     """Generate alignment from high order pixels to those of equal or lower order
 
@@ -71,6 +148,8 @@ def generate_alignment(
             constrains the partitioning to prevent spatially large pixels.
         threshold (int): the maximum number of objects allowed in a single pixel
         drop_empty_siblings (bool): if 3 of 4 pixels are empty, keep only the non-empty pixel
+        return_arrays (bool): if True, return the alignment as three parallel int64 arrays,
+            instead of an object array of tuples. This is much more compact for high orders.
     Returns:
         one-dimensional numpy array of integer 3-tuples, where the value at each index corresponds
         to the destination pixel at order less than or equal to the `highest_order`.
@@ -80,6 +159,13 @@ def generate_alignment(
         - order of the destination pixel
         - pixel number *at the above order*
         - the number of objects in the pixel
+
+        Empty pixels with no destination have a value of None.
+
+        If `return_arrays` is True, instead returns a tuple of three one-dimensional int64
+        numpy arrays (destination orders, destination pixels, counts), each of length equal to
+        the number of pixels at `highest_order`. Empty pixels with no destination have an
+        order and pixel of -1, and a count of 0.
     Raises:
         ValueError: if the histogram is the wrong size, or some initial histogram bins
             exceed threshold.
@@ -92,53 +178,204 @@ def generate_alignment(
     if max_bin > threshold:
         raise ValueError(f"single pixel count {max_bin} exceeds threshold {threshold}")
 
-    nested_sums = []
-    for i in range(0, highest_order):
-        nested_sums.append(empty_histogram(i))
+    nested_sums = _get_nested_sums(histogram, highest_order, lowest_order)
+
+    if drop_empty_siblings:
+        order_map = _get_alignment_dropping_siblings(nested_sums, highest_order, lowest_order, threshold)
+    else:
+        order_map = _get_alignment(nested_sums, highest_order, lowest_order, threshold)
+    alignment = _get_alignment_arrays(order_map, nested_sums, highest_order)
+    if return_arrays:
+        return alignment
+    return _alignment_arrays_to_tuples(*alignment)
+
+
+def generate_sparse_alignment(
+    histogram: SparseHistogram | tuple[np.ndarray, np.ndarray],
+    highest_order=10,
+    lowest_order=0,
+    threshold=1_000_000,
+    drop_empty_siblings=False,
+):
+    """Generate alignment from high order pixels to those of equal or lower order, using only
+    the non-empty pixels of a sparse histogram.
+
+    This produces the same alignment as `generate_alignment`, but never constructs a dense
+    histogram, or dense sums at any order, so memory use scales with the number of non-empty
+    pixels, instead of the number of pixels at `highest_order`.
+
+    Args:
+        histogram (:obj:`SparseHistogram` | tuple): sparse histogram of counts at the
+            `highest_order`, either as a `SparseHistogram`, or as a tuple of arrays of
+            (pixel indexes, counts at those pixels).
+        highest_order (int):  the highest healpix order (e.g. 5-10)
+        lowest_order (int): the lowest healpix order (e.g. 1-5). specifying a lowest order
+            constrains the partitioning to prevent spatially large pixels.
+        threshold (int): the maximum number of objects allowed in a single pixel
+        drop_empty_siblings (bool): if 3 of 4 pixels are empty, keep only the non-empty pixel
+    Returns:
+        tuple of four one-dimensional int64 numpy arrays, with one element for each non-empty
+        pixel at `highest_order`:
+
+        - sorted pixel index at `highest_order`
+        - order of the destination pixel
+        - pixel number of the destination pixel *at the above order*
+        - the number of objects in the destination pixel
+    Raises:
+        ValueError: if the histogram is the wrong order, or some initial histogram bins
+            exceed threshold.
+    """
+    if isinstance(histogram, SparseHistogram):
+        if histogram.order != highest_order:
+            raise ValueError("histogram is not the right size")
+        pixels, counts = histogram.get_nonzero()
+    else:
+        pixels, counts = histogram
+        pixels = np.asarray(pixels, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        if len(pixels) != len(counts):
+            raise ValueError("pixels and counts must be the same length")
+        if len(pixels) > 0 and (np.min(pixels) < 0 or np.max(pixels) >= hp.order2npix(highest_order)):
+            raise ValueError("histogram is not the right size")
+        if np.any(pixels[1:] <= pixels[:-1]):
+            pixels, inverse = np.unique(pixels, return_inverse=True)
+            counts = np.bincount(inverse, weights=counts, minlength=len(pixels)).astype(np.int64)
+        non_zero = counts != 0
+        pixels, counts = pixels[non_zero], counts[non_zero]
+    if lowest_order > highest_order:
+        raise ValueError("lowest_order should be less than highest_order")
+    if len(pixels) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), empty.copy(), empty.copy()
+    max_bin = np.amax(counts)
+    if max_bin > threshold:
+        raise ValueError(f"single pixel count {max_bin} exceeds threshold {threshold}")
+
+    nested_pixels, nested_sums, nested_max, parent_indexes = _get_sparse_nested_sums(
+        pixels, counts, highest_order, lowest_order
+    )
+
+    if drop_empty_siblings:
+        # Everything non-empty starts at the highest order, and is collapsed into lower order
+        # cells that have more than one non-empty subcell, and fall under the threshold.
+        orders = np.full(len(pixels), highest_order, dtype=np.int64)
+        ancestor_index = np.arange(len(pixels))
+        for pixel_order in range(highest_order - 1, lowest_order - 1, -1):
+            ancestor_index = parent_indexes[pixel_order + 1][ancestor_index]
+            collapse = (nested_sums[pixel_order] != nested_max[pixel_order]) & (
+                nested_sums[pixel_order] <= threshold
+            )
+            orders[collapse[ancestor_index]] = pixel_order
+    else:
+        # Every non-empty pixel inherits the destination of its parent, if it has one.
+        orders = np.full(len(nested_pixels[lowest_order]), -1, dtype=np.int64)
+        for read_order in range(lowest_order, highest_order + 1):
+            if read_order > lowest_order:
+                orders = orders[parent_indexes[read_order]]
+            orders[(orders < 0) & (nested_sums[read_order] <= threshold)] = read_order
+
+    # Walk back up the hierarchy to find the count in each destination pixel.
+    destination_counts = np.zeros(len(pixels), dtype=np.int64)
+    ancestor_index = np.arange(len(pixels))
+    for pixel_order in range(highest_order, lowest_order - 1, -1):
+        if pixel_order < highest_order:
+            ancestor_index = parent_indexes[pixel_order + 1][ancestor_index]
+        order_mask = orders == pixel_order
+        destination_counts[order_mask] = nested_sums[pixel_order][ancestor_index[order_mask]]
+    destination_pixels = pixels >> (2 * (highest_order - orders))
+
+    return pixels, orders, destination_pixels, destination_counts
+
+
+def _get_sparse_nested_sums(pixels, counts, highest_order, lowest_order):
+    """Compute the per-order sums of the non-empty pixels of a histogram, from `highest_order`
+    down to `lowest_order`.
+
+    As the pixels are sorted, the children of each parent pixel are contiguous, and each
+    order can be reduced with a single pass over the non-empty pixels of the order above.
+
+    Args:
+        pixels (:obj:`np.array`): sorted, unique, non-empty pixel indexes at `highest_order`
+        counts (:obj:`np.array`): counts at the `pixels`
+        highest_order (int):  the highest healpix order of the histogram
+        lowest_order (int): the lowest healpix order to compute sums for
+    Returns:
+        tuple of four lists, each indexed by order (and None below the `lowest_order`):
+
+        - sorted non-empty pixels at the order
+        - the counts at those pixels
+        - the largest count of any of the 4 subcells of those pixels (None at `highest_order`)
+        - for each pixel, the index of its parent in the order below (None at `lowest_order`)
+    """
+    nested_pixels = [None] * (highest_order + 1)
+    nested_sums = [None] * (highest_order + 1)
+    nested_max = [None] * (highest_order + 1)
+    parent_indexes = [None] * (highest_order + 1)
+    nested_pixels[highest_order] = pixels
+    nested_sums[highest_order] = counts
+
+    for read_order in range(highest_order, lowest_order, -1):
+        parent_order = read_order - 1
+        parents = nested_pixels[read_order] >> 2
+        is_new_parent = np.empty(len(parents), dtype=bool)
+        is_new_parent[0] = True
+        np.not_equal(parents[1:], parents[:-1], out=is_new_parent[1:])
+        parent_starts = np.flatnonzero(is_new_parent)
+
+        nested_pixels[parent_order] = parents[parent_starts]
+        nested_sums[parent_order] = np.add.reduceat(nested_sums[read_order], parent_starts)
+        nested_max[parent_order] = np.maximum.reduceat(nested_sums[read_order], parent_starts)
+        parent_indexes[read_order] = np.cumsum(is_new_parent) - 1
+    return nested_pixels, nested_sums, nested_max, parent_indexes
+
+
+def _get_nested_sums(histogram, highest_order, lowest_order):
+    """Compute the per-order pixel sums of a histogram, from `highest_order` down to `lowest_order`.
+
+    In NESTED numbering, the 4 children of a pixel are contiguous, so the counts at the parent
+    order are found by summing each group of 4 consecutive children. Orders below `lowest_order`
+    are never read, and are left as empty histograms.
+
+    Args:
+        histogram (:obj:`np.array`): one-dimensional numpy array of counts at `highest_order`
+        highest_order (int):  the highest healpix order of the histogram
+        lowest_order (int): the lowest healpix order to compute sums for
+    Returns:
+        list of one-dimensional numpy arrays, where the element at index `i` holds the
+        counts for each pixel at order `i`.
+    """
+    nested_sums = [empty_histogram(i) for i in range(0, highest_order)]
     nested_sums.append(histogram)
 
     # work backward - from highest order, fill in the sums of lower order pixels
     for read_order in range(highest_order, lowest_order, -1):
         parent_order = read_order - 1
-        for index in range(0, len(nested_sums[read_order])):
-            parent_pixel = index >> 2
-            nested_sums[parent_order][parent_pixel] += nested_sums[read_order][index]
-
-    if drop_empty_siblings:
-        return _get_alignment_dropping_siblings(nested_sums, highest_order, lowest_order, threshold)
-    return _get_alignment(nested_sums, highest_order, lowest_order, threshold)
+        nested_sums[parent_order][:] = nested_sums[read_order].reshape(-1, 4).sum(axis=1)
+    return nested_sums
 
 
 def _get_alignment(nested_sums, highest_order, lowest_order, threshold):
     """Method to aggregate pixels up to the threshold.
 
     Checks from low order (large areas), drilling down into higher orders (smaller areas) to
-    find the appropriate order for an area of sky."""
-    nested_alignment = []
-    for i in range(0, highest_order + 1):
-        nested_alignment.append(np.full(hp.order2npix(i), None))
+    find the appropriate order for an area of sky. Each pixel inherits the destination of its
+    parent, if it has one, otherwise the pixel becomes a destination if it is non-empty and
+    under the threshold.
+
+    Returns:
+        one-dimensional numpy array with the destination order of each pixel at `highest_order`,
+        or -1 for pixels with no destination.
+    """
+    order_map = np.full(hp.order2npix(lowest_order), -1, dtype=np.int32)
 
     # work forward - determine if we should map to a lower order pixel, this pixel, or keep looking.
     for read_order in range(lowest_order, highest_order + 1):
-        parent_order = read_order - 1
-        for index in range(0, len(nested_sums[read_order])):
-            parent_alignment = None
-            if parent_order >= 0:
-                parent_pixel = index >> 2
-                parent_alignment = nested_alignment[parent_order][parent_pixel]
-
-            if parent_alignment:
-                nested_alignment[read_order][index] = parent_alignment
-            elif nested_sums[read_order][index] == 0:
-                continue
-            elif nested_sums[read_order][index] <= threshold:
-                nested_alignment[read_order][index] = (
-                    read_order,
-                    index,
-                    nested_sums[read_order][index],
-                )
-
-    return nested_alignment[highest_order]
+        if read_order > lowest_order:
+            order_map = np.repeat(order_map, 4)
+        pixel_sums = nested_sums[read_order]
+        order_map[(order_map < 0) & (pixel_sums > 0) & (pixel_sums <= threshold)] = read_order
+
+    return order_map
 
 
 def _get_alignment_dropping_siblings(nested_sums, highest_order, lowest_order, threshold):
@@ -147,9 +384,6 @@ def _get_alignment_dropping_siblings(nested_sums, highest_order, lowest_order, t
     Checks from higher order (smaller areas) out to lower order (large areas). In this way, we are able to
     keep spatially isolated areas in pixels of higher order.
 
-    This method can be slower than the above `_get_alignment` method, and so should only be used
-    when the smaller area pixels are desired.
-
     This uses a form of hiearchical agglomeration (building a tree bottom-up). For each cell
     at order n, we look at the counts in all 4 subcells at order (n+1). We have two numeric
     values that are easy to compute that we can refer to easily:
@@ -167,37 +401,59 @@ def _get_alignment_dropping_siblings(nested_sums, highest_order, lowest_order, t
 
     - total number in cell is greater than the threshold
     - only one subcell contains values
+
+    Returns:
+        one-dimensional numpy array with the destination order of each pixel at `highest_order`,
+        or -1 for pixels with no destination.
     """
-    order_map = np.array(
-        [highest_order if count > 0 else -1 for count in nested_sums[highest_order]], dtype=np.int32
-    )
+    order_map = np.where(nested_sums[highest_order] > 0, highest_order, -1).astype(np.int32)
     for pixel_order in range(highest_order - 1, lowest_order - 1, -1):
-        for quad_start_index in range(0, hp.order2npix(pixel_order)):
-            quad_sum = nested_sums[pixel_order][quad_start_index]
-            quad_max = max(nested_sums[pixel_order + 1][quad_start_index * 4 : quad_start_index * 4 + 4])
-
-            if quad_sum != quad_max and quad_sum <= threshold:
-                ## Condition where we want to collapse pixels to the lower order (larger area)
-                explosion_factor = 4 ** (highest_order - pixel_order)
-                exploded_pixels = [
-                    *range(
-                        quad_start_index * explosion_factor,
-                        (quad_start_index + 1) * explosion_factor,
-                    )
-                ]
-                order_map[exploded_pixels] = pixel_order
-
-    # Construct our results.
-    nested_alignment = [
-        (
-            (intended_order, pixel_high_index >> 2 * (highest_order - intended_order))
-            if intended_order >= 0
-            else None
-        )
-        for pixel_high_index, intended_order in enumerate(order_map)
-    ]
-    nested_alignment = [
-        (tup[0], tup[1], nested_sums[tup[0]][tup[1]]) if tup else None for tup in nested_alignment
-    ]
-
-    return np.array(nested_alignment, dtype="object")
+        quad_sum = nested_sums[pixel_order]
+        quad_max = nested_sums[pixel_order + 1].reshape(-1, 4).max(axis=1)
+
+        ## Condition where we want to collapse pixels to the lower order (larger area)
+        collapse = (quad_sum != quad_max) & (quad_sum <= threshold)
+
+        ## Each row holds the exploded range of highest order pixels within a single cell
+        order_map.reshape(len(quad_sum), -1)[collapse] = pixel_order
+
+    return order_map
+
+
+def _get_alignment_arrays(order_map, nested_sums, highest_order):
+    """Expand the destination order of each pixel into the full destination pixel and count.
+
+    Args:
+        order_map (:obj:`np.array`): destination order of each pixel at `highest_order`,
+            or -1 for pixels with no destination.
+        nested_sums (list): per-order pixel sums, as from `_get_nested_sums`
+        highest_order (int):  the highest healpix order of the `order_map`
+    Returns:
+        tuple of three int64 numpy arrays (destination orders, destination pixels, counts)
+    """
+    orders = order_map.astype(np.int64)
+    has_destination = orders >= 0
+
+    pixels = np.arange(len(orders), dtype=np.int64)
+    pixels >>= np.where(has_destination, 2 * (highest_order - orders), 0)
+    pixels[~has_destination] = -1
+
+    counts = np.zeros(len(orders), dtype=np.int64)
+    for order in np.unique(orders[has_destination]):
+        order_mask = orders == order
+        counts[order_mask] = nested_sums[order][pixels[order_mask]]
+
+    return orders, pixels, counts
+
+
+def _alignment_arrays_to_tuples(orders, pixels, counts):
+    """Convert parallel alignment arrays into an object array of (order, pixel, count) tuples,
+    with None for pixels that have no destination."""
+    nested_alignment = np.full(len(orders), None)
+    (non_empty,) = np.nonzero(orders >= 0)
+    nested_alignment[non_empty] = np.fromiter(
+        zip(orders[non_empty].tolist(), pixels[non_empty].tolist(), counts[non_empty].tolist()),
+        dtype=object,
+        count=len(non_empty),
+    )
+    return nested_alignment
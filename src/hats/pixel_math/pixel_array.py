@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from hats.pixel_math.healpix_pixel import HealpixPixel
+from hats.pixel_math.healpix_pixel_convertor import get_healpix_tuple
+from hats.pixel_math.spatial_index import SPATIAL_INDEX_ORDER
+
+
+class PixelArray(Sequence):
+    """A sequence of HEALPix pixels, stored as parallel arrays of orders and pixel numbers
+
+    This behaves like a read-only list of `HealpixPixel`, but only creates a `HealpixPixel`
+    object when an element is accessed. This keeps the memory for large numbers of pixels
+    to two int64 values per pixel.
+
+    Attributes:
+        orders: int64 array of the HEALPix order of each pixel
+        pixels: int64 array of the HEALPix pixel number of each pixel, in NESTED ordering scheme
+    """
+
+    def __init__(self, orders: np.ndarray, pixels: np.ndarray) -> None:
+        """Initialize an array of HEALPix pixels
+
+        Args:
+            orders (np.ndarray): HEALPix order of each pixel
+            pixels (np.ndarray): HEALPix pixel number of each pixel, in NESTED ordering scheme
+        """
+        self.orders = np.asarray(orders, dtype=np.int64)
+        self.pixels = np.asarray(pixels, dtype=np.int64)
+        if self.orders.ndim != 1 or self.orders.shape != self.pixels.shape:
+            raise ValueError("orders and pixels must be one-dimensional arrays of the same length")
+        if len(self.orders) > 0 and np.max(self.orders) > SPATIAL_INDEX_ORDER:
+            raise ValueError(f"HEALPix order cannot be greater than {SPATIAL_INDEX_ORDER}")
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return HealpixPixel(int(self.orders[key]), int(self.pixels[key]))
+        return PixelArray(self.orders[key], self.pixels[key])
+
+    def __iter__(self):
+        for order, pixel in zip(self.orders.tolist(), self.pixels.tolist()):
+            yield HealpixPixel(order, pixel)
+
+    def __contains__(self, item) -> bool:
+        try:
+            order, pixel = get_healpix_tuple(item)
+        except (TypeError, ValueError):
+            return False
+        return bool(np.any((self.orders == order) & (self.pixels == pixel)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PixelArray):
+            return np.array_equal(self.orders, other.orders) and np.array_equal(self.pixels, other.pixels)
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __add__(self, other) -> PixelArray:
+        if not isinstance(other, (PixelArray, list, tuple)):
+            return NotImplemented
+        other = PixelArray.from_healpix(other)
+        return PixelArray(
+            np.concatenate([self.orders, other.orders]), np.concatenate([self.pixels, other.pixels])
+        )
+
+    def __radd__(self, other) -> PixelArray:
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return PixelArray.from_healpix(other) + self
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        return f"PixelArray(orders={self.orders!r}, pixels={self.pixels!r})"
+
+    @classmethod
+    def from_healpix(cls, healpix_pixels: Sequence[HealpixPixel | tuple[int, int]]) -> PixelArray:
+        """Create a pixel array from a list of healpix pixels
+
+        Args:
+            healpix_pixels: list of healpix pixels, or of tuples of (order, pixel)
+
+        Returns:
+            A `PixelArray` with the same healpix pixels. If the input is already a `PixelArray`,
+            it is returned unchanged.
+        """
+        if isinstance(healpix_pixels, PixelArray):
+            return healpix_pixels
+        if len(healpix_pixels) == 0:
+            return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        pixel_array = np.array([get_healpix_tuple(p) for p in healpix_pixels], dtype=np.int64).T
+        return cls(pixel_array[0], pixel_array[1])
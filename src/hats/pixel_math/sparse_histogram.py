@@ -1,50 +1,116 @@
 """Sparse 1-D histogram of healpix pixel counts."""
 
+from __future__ import annotations
+
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
 import numpy as np
-from scipy.sparse import csc_array, load_npz, save_npz, sparray
+from scipy.sparse import csc_array, sparray
 
 import hats.pixel_math.healpix_shim as hp
 
 
 class SparseHistogram:
-    """Wrapper around scipy's sparse array."""
+    """Sparse histogram, stored as the sorted, unique indexes of non-zero pixels,
+    and the counts at those pixels.
 
-    def __init__(self, sparse_array):
-        if not isinstance(sparse_array, sparray):
-            raise ValueError("The sparse array must be a scipy sparse array.")
-        if sparse_array.format != "csc":
-            raise ValueError("The sparse array must be a Compressed Sparse Column array.")
-        self.sparse_array = sparse_array
+    Memory use is proportional to the number of non-zero pixels, regardless of the
+    healpix order of the histogram.
+
+    Attributes:
+        indexes: sorted, unique int64 pixel indexes with non-zero counts
+        counts: int64 counts at each of the `indexes`
+        order: healpix order of the histogram
+    """
+
+    def __init__(self, indexes, counts=None, order=None):
+        if counts is None and order is None and isinstance(indexes, sparray):
+            warnings.warn(
+                "Creating a SparseHistogram from a scipy sparse array is deprecated. "
+                "Use SparseHistogram.from_sparse_array instead.",
+                DeprecationWarning,
+            )
+            histogram = SparseHistogram.from_sparse_array(indexes)
+            indexes, counts, order = histogram.indexes, histogram.counts, histogram.order
+        indexes = np.asarray(indexes, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        if indexes.ndim != 1 or indexes.shape != counts.shape:
+            raise ValueError("The indexes and counts must be one-dimensional arrays of the same length.")
+        if len(indexes) > 0 and (indexes[0] < 0 or indexes[-1] >= hp.order2npix(order)):
+            raise ValueError("The indexes must be valid pixels at the healpix order.")
+        if np.any(indexes[1:] <= indexes[:-1]):
+            raise ValueError("The indexes must be sorted and unique.")
+        self.indexes = indexes
+        self.counts = counts
+        self.order = order
 
     def add(self, other):
-        """Add in another sparse histogram, updating this wrapper's array.
+        """Add in another sparse histogram, updating this histogram's counts.
 
         Args:
-            other (SparseHistogram): the wrapper containing the addend
+            other (SparseHistogram): the histogram containing the addend
         """
         if not isinstance(other, SparseHistogram):
             raise ValueError("Both addends should be SparseHistogram.")
-        if self.sparse_array.shape != other.sparse_array.shape:
+        if self.order != other.order:
             raise ValueError(
                 "The histogram partials have incompatible sizes due to different healpix orders."
             )
-        self.sparse_array += other.sparse_array
+        self.indexes, self.counts = _merge_counts([self.indexes, other.indexes], [self.counts, other.counts])
+
+    @property
+    def sparse_array(self) -> csc_array:
+        """The histogram as a 1xN scipy Compressed Sparse Column array.
+
+        Deprecated, as the histogram is no longer stored as a scipy array. Use
+        `get_nonzero` or `to_array` instead.
+        """
+        warnings.warn(
+            "SparseHistogram.sparse_array is deprecated. Use get_nonzero or to_array instead.",
+            DeprecationWarning,
+        )
+        return csc_array(
+            (self.counts, (np.zeros(len(self.indexes), dtype=np.int64), self.indexes)),
+            shape=(1, hp.order2npix(self.order)),
+        )
+
+    def get_nonzero(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the pixels with non-zero counts, and the counts at those pixels.
+
+        Returns:
+            tuple of sorted int64 pixel indexes and int64 counts at those pixels.
+        """
+        return self.indexes, self.counts
 
     def to_array(self):
-        """Convert the sparse array to a dense numpy array.
+        """Convert the sparse histogram to a dense numpy array.
 
         Returns:
             dense 1-d numpy array.
         """
-        return self.sparse_array.toarray()[0]
+        dense = np.zeros(hp.order2npix(self.order), dtype=np.int64)
+        dense[self.indexes] = self.counts
+        return dense
 
     def to_file(self, file_name):
-        """Persist the sparse array to disk.
+        """Persist the sparse histogram to disk.
 
-        NB: this saves as a sparse array, and so will likely have lower space requirements
-        than saving the corresponding dense 1-d numpy array.
+        NB: this saves in the same layout as a 1xN coordinate-format array in
+        ``scipy.sparse.save_npz``, and so can be read with ``scipy.sparse.load_npz``,
+        and will likely have lower space requirements than saving the corresponding
+        dense 1-d numpy array.
         """
-        save_npz(file_name, self.sparse_array)
+        np.savez_compressed(
+            file_name,
+            row=np.zeros(len(self.indexes), dtype=np.int64),
+            col=self.indexes,
+            format=b"coo",
+            shape=(1, hp.order2npix(self.order)),
+            data=self.counts,
+            _is_array=True,
+        )
 
     def to_dense_file(self, file_name):
         """Persist the DENSE array to disk as a numpy array."""
@@ -53,7 +119,7 @@ class SparseHistogram:
 
     @classmethod
     def make_empty(cls, healpix_order=10):
-        """Create an empty sparse array for a given healpix order.
+        """Create an empty sparse histogram for a given healpix order.
 
         Args:
             healpix_order (int): healpix order
@@ -61,12 +127,11 @@ class SparseHistogram:
         Returns:
             new sparse histogram
         """
-        histo = csc_array((1, hp.order2npix(healpix_order)), dtype=np.int64)
-        return cls(histo)
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), healpix_order)
 
     @classmethod
     def make_from_counts(cls, indexes, counts_at_indexes, healpix_order=10):
-        """Create an sparse array for a given healpix order, prefilled with counts at
+        """Create an sparse histogram for a given healpix order, prefilled with counts at
         the provided indexes.
 
         e.g. for a dense 1-d numpy histogram of order 0, you might see::
@@ -78,6 +143,8 @@ class SparseHistogram:
 
             make_from_counts([1, 8], [4, 9], 0)
 
+        The indexes do not need to be sorted, and counts at repeated indexes are summed.
+
         Args:
             indexes (int[]): index locations of non-zero values
             counts_at_indexes (int[]): values at the ``indexes``
@@ -86,16 +153,172 @@ class SparseHistogram:
         Returns:
             new sparse histogram
         """
-        row = np.array(np.zeros(len(indexes), dtype=np.int64))
-        histo = csc_array((counts_at_indexes, (row, indexes)), shape=(1, hp.order2npix(healpix_order)))
-        return cls(histo)
+        indexes, counts = _merge_counts([np.asarray(indexes)], [np.asarray(counts_at_indexes)])
+        return cls(indexes, counts, healpix_order)
+
+    @classmethod
+    def from_sparse_array(cls, sparse_array):
+        """Create a sparse histogram from a 1xN scipy sparse array, as previously wrapped
+        by `SparseHistogram`.
+
+        Args:
+            sparse_array (scipy.sparse.sparray): array with a single row, of length equal
+                to the number of pixels at the healpix order
+
+        Returns:
+            new sparse histogram
+        """
+        if not isinstance(sparse_array, sparray):
+            raise ValueError("The sparse array must be a scipy sparse array.")
+        if sparse_array.shape[0] != 1:
+            raise ValueError("The sparse histogram must have a single row.")
+        coo = sparse_array.tocoo()
+        indexes, counts = _merge_counts([np.asarray(coo.col)], [np.asarray(coo.data)])
+        return cls(indexes, counts, hp.npix2order(int(sparse_array.shape[1])))
+
+    @classmethod
+    def merge_many(cls, histograms):
+        """Sum many sparse histograms of the same healpix order, in a single merge.
+
+        This is much faster than calling `add` repeatedly, as each histogram is
+        only read once, instead of re-reading the growing total for every addend.
+
+        Args:
+            histograms (List[SparseHistogram]): the histograms to sum
+
+        Returns:
+            new sparse histogram with the total counts
+        """
+        histograms = list(histograms)
+        if len(histograms) == 0:
+            raise ValueError("At least one histogram is required.")
+        if not all(isinstance(histogram, SparseHistogram) for histogram in histograms):
+            raise ValueError("All addends should be SparseHistogram.")
+        order = histograms[0].order
+        if any(histogram.order != order for histogram in histograms):
+            raise ValueError(
+                "The histogram partials have incompatible sizes due to different healpix orders."
+            )
+        indexes, counts = _merge_counts(
+            [histogram.indexes for histogram in histograms],
+            [histogram.counts for histogram in histograms],
+        )
+        return cls(indexes, counts, order)
 
     @classmethod
     def from_file(cls, file_name):
         """Read sparse histogram from a file.
 
+        Reads files written by `to_file`, as well as files written by earlier versions,
+        that saved a scipy Compressed Sparse Column array.
+
         Returns:
             new sparse histogram
         """
-        histo = load_npz(file_name)
-        return cls(histo)
+        with np.load(file_name) as npz_file:
+            if "format" not in npz_file:
+                raise ValueError(f"The file {file_name} does not contain a sparse histogram.")
+            sparse_format = np.asarray(npz_file["format"]).item()
+            if not isinstance(sparse_format, str):
+                sparse_format = sparse_format.decode("ascii")
+            shape = np.asarray(npz_file["shape"])
+            counts = np.asarray(npz_file["data"])
+            if shape[0] != 1:
+                raise ValueError("The sparse histogram must have a single row.")
+            if sparse_format == "coo":
+                indexes = np.asarray(npz_file["coords"])[-1] if "coords" in npz_file else npz_file["col"]
+            elif sparse_format == "csr":
+                indexes = npz_file["indices"]
+            elif sparse_format == "csc":
+                # Column pointers hold the start of each column's values. Find the
+                # column for each stored value, without expanding to every column.
+                indptr = np.asarray(npz_file["indptr"])
+                indexes = np.searchsorted(indptr, np.arange(len(counts)), side="right") - 1
+            else:
+                raise ValueError(f"Unsupported sparse format {sparse_format}")
+        indexes, counts = _merge_counts([indexes], [counts])
+        return cls(indexes, counts, hp.npix2order(int(shape[1])))
+
+
+def merge_histogram_files(
+    file_names: list[str | Path],
+    max_workers: int | None = None,
+    use_processes: bool = False,
+    files_per_task: int = 64,
+) -> SparseHistogram:
+    """Read many partial histogram files, and sum them into a single histogram.
+
+    Files are read and merged concurrently, in batches of `files_per_task`, and
+    the resulting partial sums are combined with a pairwise tree reduction, so
+    that no single merge has to re-read the growing total.
+
+    Args:
+        file_names (List[str | Path]): paths to sparse histogram files, as written
+            by `SparseHistogram.to_file`. All must be at the same healpix order.
+        max_workers (int): maximum number of concurrent workers. If None, uses the
+            executor's default.
+        use_processes (bool): if True, use a pool of processes instead of threads.
+        files_per_task (int): number of files read and merged by each task.
+
+    Returns:
+        new sparse histogram with the total counts
+    """
+    file_names = list(file_names)
+    if len(file_names) == 0:
+        raise ValueError("At least one histogram file is required.")
+    if files_per_task < 1:
+        raise ValueError("files_per_task must be positive.")
+    batches = [
+        file_names[start : start + files_per_task] for start in range(0, len(file_names), files_per_task)
+    ]
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers) as executor:
+        partials = list(executor.map(_read_and_merge_files, batches))
+        while len(partials) > 1:
+            leftover = [partials[-1]] if len(partials) % 2 else []
+            partials = list(executor.map(_merge_pair, partials[0::2], partials[1::2])) + leftover
+    return partials[0]
+
+
+def _read_and_merge_files(file_names):
+    """Read a batch of histogram files, and sum them into a single histogram."""
+    return SparseHistogram.merge_many([SparseHistogram.from_file(file_name) for file_name in file_names])
+
+
+def _merge_pair(left, right):
+    """Sum two histograms into a new histogram."""
+    return SparseHistogram.merge_many([left, right])
+
+
+def _merge_counts(indexes_list, counts_list):
+    """Merge lists of pixel indexes and counts into sorted, unique indexes, summing
+    the counts at repeated indexes and dropping zero counts.
+
+    Each pair of indexes and counts is typically already sorted, and a stable sort of
+    the concatenated runs merges them in a single pass.
+
+    Args:
+        indexes_list (List[np.ndarray]): arrays of pixel indexes
+        counts_list (List[np.ndarray]): arrays of counts at the corresponding indexes
+
+    Returns:
+        tuple of sorted, unique int64 pixel indexes, and the int64 total counts at those indexes.
+    """
+    indexes = np.concatenate(indexes_list).astype(np.int64, copy=False)
+    counts = np.concatenate(counts_list).astype(np.int64, copy=False)
+    if len(indexes) != len(counts):
+        raise ValueError("The indexes and counts must be the same length.")
+    if len(indexes) == 0:
+        return indexes, counts
+    if np.any(indexes[1:] < indexes[:-1]):
+        sort_order = np.argsort(indexes, kind="stable")
+        indexes = indexes[sort_order]
+        counts = counts[sort_order]
+    is_new_index = np.empty(len(indexes), dtype=bool)
+    is_new_index[0] = True
+    np.not_equal(indexes[1:], indexes[:-1], out=is_new_index[1:])
+    index_starts = np.flatnonzero(is_new_index)
+    indexes = indexes[index_starts]
+    counts = np.add.reduceat(counts, index_starts)
+    non_zero = counts != 0
+    return indexes[non_zero], counts[non_zero]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 import hats.pixel_math.healpix_shim as hp
@@ -7,13 +9,31 @@ import hats.pixel_math.healpix_shim as hp
 SPATIAL_INDEX_COLUMN = "_healpix_29"
 SPATIAL_INDEX_ORDER = 29
 
+## Number of values in each chunk, when computing the spatial index in chunks.
+DEFAULT_CHUNK_SIZE = 1_000_000
+
 
-def compute_spatial_index(ra_values: list[float], dec_values: list[float]) -> np.ndarray:
+def compute_spatial_index(
+    ra_values: list[float],
+    dec_values: list[float],
+    n_threads: int | None = None,
+    chunk_size: int | None = None,
+) -> np.ndarray:
     """Compute the healpix index field.
 
+    By default, the index is computed in a single call. If either `n_threads` or
+    `chunk_size` is provided, the inputs are split into chunks of `chunk_size` values,
+    that are computed on a pool of `n_threads` threads, and written straight into a
+    single output array. This also bounds the size of the intermediate arrays to the
+    size of a chunk.
+
     Args:
         ra_values (List[float]): celestial coordinates, right ascension in degrees
         dec_values (List[float]): celestial coordinates, declination in degrees
+        n_threads (int): number of threads for the chunked computation. If None, uses
+            the default number of workers of a `ThreadPoolExecutor`.
+        chunk_size (int): number of values in each chunk of the chunked computation.
+            If None, uses `DEFAULT_CHUNK_SIZE`.
     Returns:
         one-dimensional numpy array of int64s with healpix NESTED pixel numbers at order 29
     Raises:
@@ -22,7 +42,30 @@ def compute_spatial_index(ra_values: list[float], dec_values: list[float]) -> np
     if len(ra_values) != len(dec_values):
         raise ValueError("ra and dec arrays should have the same length")
 
-    mapped_pixels = hp.radec2pix(SPATIAL_INDEX_ORDER, ra_values, dec_values)
+    if n_threads is None and chunk_size is None:
+        return hp.radec2pix(SPATIAL_INDEX_ORDER, ra_values, dec_values)
+
+    chunk_size = DEFAULT_CHUNK_SIZE if chunk_size is None else chunk_size
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    ra_values = np.asarray(ra_values, dtype=np.float64)
+    dec_values = np.asarray(dec_values, dtype=np.float64)
+    mapped_pixels = np.empty(len(ra_values), dtype=np.int64)
+
+    def compute_chunk(start):
+        end = start + chunk_size
+        # Each chunk uses a single native thread, leaving the parallelism to the pool.
+        hp.radec2pix(
+            SPATIAL_INDEX_ORDER,
+            ra_values[start:end],
+            dec_values[start:end],
+            out=mapped_pixels[start:end],
+            num_threads=1,
+        )
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        # Consume the results, so that any errors in the threads are raised here.
+        list(executor.map(compute_chunk, range(0, len(ra_values), chunk_size)))
 
     return mapped_pixels
 
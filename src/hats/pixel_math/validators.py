@@ -20,16 +20,16 @@ class ValidatorsErrors(str, Enum):
     INVALID_CONCAVE_SHAPE = "polygon must be convex"
 
 
-def validate_radius(radius_arcsec: float):
-    """Validates that a cone search radius is positive
+def validate_radius(radius_arcsec: float | np.ndarray):
+    """Validates that cone search radii are positive
 
     Args:
-        radius_arcsec (float): The cone radius, in arcseconds
+        radius_arcsec (float | np.ndarray): The cone radius, or radii, in arcseconds
 
     Raises:
-        ValueError: if radius is non-positive
+        ValueError: if any radius is non-positive
     """
-    if radius_arcsec <= 0:
+    if np.any(np.asarray(radius_arcsec) <= 0):
         raise ValueError(ValidatorsErrors.INVALID_RADIUS.value)
 
 
@@ -1,2 +1,2 @@
-from .pixel_alignment import PixelAlignment, align_trees
+from .pixel_alignment import PixelAlignment, align_many, align_trees
 from .pixel_alignment_types import PixelAlignmentType
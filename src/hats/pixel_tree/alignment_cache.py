@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from mocpy import MOC
+
+from hats.pixel_tree.pixel_alignment import PixelAlignment, align_with_mocs
+from hats.pixel_tree.pixel_alignment_types import PixelAlignmentType
+from hats.pixel_tree.pixel_tree import PixelTree
+
+
+class AlignmentCache:
+    """A bounded least-recently-used cache of `PixelAlignment` results of `align_with_mocs`
+
+    Alignments are keyed by a hash of the contents of both trees and mocs, and the alignment type, so
+    aligning equal trees and mocs again returns the cached alignment without recomputing it. Cached
+    alignments are shared between calls, so their aligned tree and mapping arrays are made read-only.
+
+    Attributes:
+        maxsize: The maximum number of alignments to keep. If 0, nothing is cached.
+        hits: The number of alignments returned from the cache
+        misses: The number of alignments computed because they were not in the cache
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._alignments: OrderedDict[tuple, PixelAlignment] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._alignments)
+
+    def clear(self):
+        """Removes all alignments from the cache and resets the hit and miss counters"""
+        with self._lock:
+            self._alignments.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def align_with_mocs(
+        self,
+        left_tree: PixelTree,
+        right_tree: PixelTree,
+        left_moc: MOC | None,
+        right_moc: MOC | None,
+        alignment_type: PixelAlignmentType = PixelAlignmentType.INNER,
+        n_threads: int | None = None,
+        split_order: int = 0,
+    ) -> PixelAlignment:
+        """Aligns two pixel trees and mocs with `align_with_mocs`, or gets the alignment from the cache if
+        the same trees and mocs have been aligned before.
+
+        Args:
+            left_tree (PixelTree): The left tree to align
+            right_tree (PixelTree): The right tree to align
+            left_moc (mocpy.MOC): the moc with the coverage of the left catalog
+            right_moc (mocpy.MOC): the moc with the coverage of the right catalog
+            alignment_type (PixelAlignmentType): The type of alignment. See `align_with_mocs`.
+            n_threads (int): The number of threads to align with. See `align_trees`.
+            split_order (int): The HEALPix order the trees may be split at. See `align_trees`.
+
+        Returns:
+            The PixelAlignment object with the aligned trees filtered by the coverage in the catalogs.
+        """
+        key = (
+            left_tree.fingerprint(),
+            right_tree.fingerprint(),
+            _get_moc_fingerprint(left_moc),
+            _get_moc_fingerprint(right_moc),
+            PixelAlignmentType(alignment_type),
+        )
+        with self._lock:
+            alignment = self._alignments.get(key)
+            if alignment is not None:
+                self._alignments.move_to_end(key)
+                self.hits += 1
+                return alignment
+            self.misses += 1
+        alignment = align_with_mocs(
+            left_tree,
+            right_tree,
+            left_moc,
+            right_moc,
+            alignment_type=alignment_type,
+            n_threads=n_threads,
+            split_order=split_order,
+        )
+        if self.maxsize <= 0:
+            return alignment
+        _set_read_only(alignment)
+        with self._lock:
+            self._alignments[key] = alignment
+            self._alignments.move_to_end(key)
+            while len(self._alignments) > self.maxsize:
+                self._alignments.popitem(last=False)
+        return alignment
+
+
+def _set_read_only(alignment: PixelAlignment):
+    """Makes the aligned tree and mapping arrays of an alignment read-only, so a caller of a cached
+    alignment can't modify it for the other callers"""
+    alignment.pixel_tree.tree.setflags(write=False)
+    alignment.pixel_tree.pixels.setflags(write=False)
+    for values in alignment.pixel_mapping_arrays.values():
+        values.setflags(write=False)
+
+
+def _get_moc_fingerprint(moc: MOC | None) -> bytes | None:
+    """Gets a hash of the depth 29 ranges of a moc, or None if there is no moc"""
+    if moc is None:
+        return None
+    ranges = np.ascontiguousarray(moc.to_depth29_ranges, dtype=np.uint64)
+    return hashlib.blake2b(ranges.data, digest_size=16).digest()
+
+
+ALIGNMENT_CACHE = AlignmentCache()
+"""The cache used by `HealpixDataset.align` when called with `use_cache=True`"""
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import cdshealpix
+import numpy as np
+
+import hats.pixel_math.healpix_shim as hp
+from hats.pixel_tree.pixel_tree import PixelTree
+
+# The number of times the candidate cells covering each cone are split into their children and checked
+# again, which removes most cells that are close to the cone without overlapping it
+REFINE_ORDERS = 2
+
+# An upper bound on the distance from the center of a HEALPix cell to its vertices, in radians, for
+# cells at order 0. At each higher order, the bound halves. The largest distance at order k times 2**k
+# grows from 0.84 at order 0 towards 1.069.
+MAX_CELL_RADIUS_RAD = 1.07
+
+
+def get_cone_partition_indexes(
+    tree: PixelTree, ra: np.ndarray, dec: np.ndarray, radius_arcsec: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the pixels of a tree that overlap with each of many cones, without building a MOC per cone
+
+    Each cone is first covered by the HEALPix cell containing its center and that cell's neighbours, at
+    the highest order where the neighbours are wide enough to contain the cone. Cones too large for the
+    order 0 neighbours are covered by all 12 base cells. The cells are split into their children at
+    `REFINE_ORDERS` higher orders, and then matched to the pixels of the tree with `np.searchsorted`.
+    A cell or tree pixel is kept if it can overlap the cone, meaning the distance from the cone center to
+    the pixel center is no more than the cone radius plus the distance from the pixel center to its
+    vertices. This may keep pixels that are close to the cone without overlapping it.
+
+    Args:
+        tree (PixelTree): The tree to find the overlapping pixels of
+        ra (np.ndarray): Right ascensions of the centers of the cones, in degrees
+        dec (np.ndarray): Declinations of the centers of the cones, in degrees
+        radius_arcsec (np.ndarray): Radii of the cones, in arcseconds. May be a single radius used for
+            all cones.
+
+    Returns:
+        A tuple of (offsets, pixel_indexes) in compressed sparse row format. The indexes into the tree of
+        the pixels overlapping cone i are `pixel_indexes[offsets[i]:offsets[i + 1]]`, in sorted order.
+    """
+    ra, dec, radius_arcsec = np.broadcast_arrays(
+        np.asarray(ra, dtype=np.float64).ravel(),
+        np.asarray(dec, dtype=np.float64).ravel(),
+        np.asarray(radius_arcsec, dtype=np.float64).ravel(),
+    )
+    num_cones = len(ra)
+    if len(tree) == 0 or num_cones == 0:
+        return np.zeros(num_cones + 1, dtype=np.int64), np.empty(0, dtype=np.int64)
+    cone_indexes, cell_orders, cell_pixels = _get_candidate_cells(ra, dec, radius_arcsec)
+    cell_indexes, pixel_indexes = _get_overlapping_pixel_indexes(tree, cell_orders, cell_pixels)
+    cone_indexes = cone_indexes[cell_indexes]
+
+    # Tree pixels smaller than their cell may not overlap the cone, so check them too
+    is_smaller = tree.pixels[pixel_indexes, 0] > cell_orders[cell_indexes]
+    keep = np.ones(len(pixel_indexes), dtype=bool)
+    keep[is_smaller] = _can_overlap(
+        ra[cone_indexes[is_smaller]],
+        dec[cone_indexes[is_smaller]],
+        radius_arcsec[cone_indexes[is_smaller]],
+        tree.pixels[pixel_indexes[is_smaller], 0],
+        tree.pixels[pixel_indexes[is_smaller], 1],
+        use_cell_vertices=True,
+    )
+
+    # A tree pixel may overlap several cells of the same cone, so keep each (cone, pixel) pair once
+    pairs = np.unique(cone_indexes[keep] * len(tree) + pixel_indexes[keep])
+    offsets = np.searchsorted(pairs // len(tree), np.arange(num_cones + 1, dtype=np.int64))
+    return offsets, pairs % len(tree)
+
+
+def _get_candidate_cells(
+    ra: np.ndarray, dec: np.ndarray, radius_arcsec: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Covers each cone with HEALPix cells that may overlap it
+
+    Returns:
+        Arrays of the index of the cone, and the order and pixel of each cell
+    """
+    # Cover each cone with the cells at the highest order with neighbours wider than the cone
+    min_distances_arcmin = np.array([hp.order2mindist(order) for order in range(hp.MAX_HEALPIX_ORDER + 1)])
+    cone_orders = np.searchsorted(-min_distances_arcmin, -2 * radius_arcsec / 60, side="right") - 1
+    cone_indexes, cell_orders, cell_pixels = [], [], []
+    for order in np.unique(cone_orders):
+        order_cones = np.flatnonzero(cone_orders == order)
+        if order < 0:
+            cells = np.broadcast_to(np.arange(12, dtype=np.int64), (len(order_cones), 12))
+            order = 0
+        else:
+            center_pixels = hp.radec2pix(order, ra[order_cones], dec[order_cones])
+            cells = cdshealpix.neighbours(center_pixels.astype(np.uint64), np.uint8(order))
+        cone_indexes.append(np.repeat(order_cones, cells.shape[1]))
+        cell_pixels.append(cells.ravel())
+        cell_orders.append(np.full(cells.size, order, dtype=np.int64))
+    cone_indexes = np.concatenate(cone_indexes)
+    cell_orders = np.concatenate(cell_orders)
+    cell_pixels = np.concatenate(cell_pixels)
+    is_cell = cell_pixels >= 0
+    cone_indexes, cell_orders, cell_pixels = cone_indexes[is_cell], cell_orders[is_cell], cell_pixels[is_cell]
+
+    # The check is loose for cells about the size of the cone, so replace the cells by their children
+    for refine_index in range(REFINE_ORDERS + 1):
+        if refine_index > 0:
+            can_split = cell_orders < hp.MAX_HEALPIX_ORDER
+            num_cells = np.where(can_split, 4, 1)
+            child_numbers = np.arange(np.sum(num_cells)) - np.repeat(
+                np.cumsum(num_cells) - num_cells, num_cells
+            )
+            cone_indexes = np.repeat(cone_indexes, num_cells)
+            cell_pixels = np.repeat(cell_pixels << (2 * can_split), num_cells) + child_numbers
+            cell_orders = np.repeat(cell_orders + can_split, num_cells)
+        is_cell = _can_overlap(
+            ra[cone_indexes],
+            dec[cone_indexes],
+            radius_arcsec[cone_indexes],
+            cell_orders,
+            cell_pixels,
+            use_cell_vertices=refine_index == REFINE_ORDERS,
+        )
+        cone_indexes, cell_orders, cell_pixels = (
+            cone_indexes[is_cell],
+            cell_orders[is_cell],
+            cell_pixels[is_cell],
+        )
+    return cone_indexes, cell_orders, cell_pixels
+
+
+def _get_overlapping_pixel_indexes(
+    tree: PixelTree, cell_orders: np.ndarray, cell_pixels: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the tree pixels that overlap each HEALPix cell
+
+    Returns:
+        Arrays of the index of the cell and the index of the tree pixel, for each overlapping pair
+    """
+    # Convert the cells to the order of the tree by way of order 29, rounding outwards, as cells may be
+    # larger or smaller than the tree pixels
+    shift_29 = 2 * (hp.MAX_HEALPIX_ORDER - cell_orders)
+    tree_shift = 2 * (hp.MAX_HEALPIX_ORDER - tree.tree_order)
+    cell_starts = (cell_pixels << shift_29) >> tree_shift
+    cell_ends = (((cell_pixels + 1) << shift_29) + (1 << tree_shift) - 1) >> tree_shift
+    first_indexes = np.searchsorted(tree.tree[:, 1], cell_starts, side="right")
+    last_indexes = np.searchsorted(tree.tree[:, 0], cell_ends, side="left")
+    counts = np.maximum(last_indexes - first_indexes, 0)
+    cell_indexes = np.repeat(np.arange(len(cell_orders)), counts)
+    pixel_indexes = np.repeat(first_indexes - np.cumsum(counts) + counts, counts) + np.arange(
+        len(cell_indexes), dtype=np.int64
+    )
+    return cell_indexes, pixel_indexes
+
+
+def _can_overlap(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    radius_arcsec: np.ndarray,
+    orders: np.ndarray,
+    pixels: np.ndarray,
+    use_cell_vertices: bool = False,
+) -> np.ndarray:
+    """Checks whether each cone may overlap with each HEALPix cell, by comparing the distance between the
+    cone and cell centers to the cone radius plus the distance from the cell center to its vertices
+
+    If `use_cell_vertices` is False, the bound on that distance for all cells of the order is used, which
+    is faster to compute but keeps more cells that do not overlap the cone.
+    """
+    if len(orders) == 0:
+        return np.empty(0, dtype=bool)
+    depths = orders.astype(np.uint8)
+    ipix = pixels.astype(np.uint64)
+    center_lon, center_lat = cdshealpix.healpix_to_lonlat(ipix, depths)
+    cell_vectors = hp.ang2vec(center_lon.deg, center_lat.deg)
+    if use_cell_vertices:
+        vertex_lon, vertex_lat = cdshealpix.vertices(ipix, depths)
+        vertex_vectors = hp.ang2vec(vertex_lon.deg, vertex_lat.deg)
+        min_vertex_cos = np.min(np.einsum("nk,nvk->nv", cell_vectors, vertex_vectors), axis=1)
+        # Padded slightly, so that rounding never excludes a cell that touches the cone
+        cell_radius = np.arccos(np.clip(min_vertex_cos, -1, 1)) + 1e-12
+    else:
+        cell_radius = MAX_CELL_RADIUS_RAD * np.exp2(-orders)
+    center_cos = np.einsum("nk,nk->n", hp.ang2vec(ra, dec), cell_vectors)
+    radius_rad = np.radians(radius_arcsec / 3600)
+    return center_cos >= np.cos(np.minimum(radius_rad + cell_radius, np.pi))
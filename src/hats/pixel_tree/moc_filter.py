@@ -4,6 +4,10 @@ from numba import njit
 
 from hats.pixel_tree.pixel_tree import PixelTree
 
+# When one of the tree and the moc has this many times fewer intervals than the other, each of its
+# intervals is found in the other with a binary search instead of merging the two interval lists.
+SEARCH_SIZE_RATIO = 64
+
 
 def filter_by_moc(
     tree: PixelTree,
@@ -20,11 +24,55 @@ def filter_by_moc(
     """
     if len(tree) == 0:
         return tree
-    moc_ranges = moc.to_depth29_ranges
+    tree_indexes = get_filtered_indexes(tree, moc.to_depth29_ranges)
+    return PixelTree(tree.tree[tree_indexes], tree.tree_order)
+
+
+def get_filtered_indexes(tree: PixelTree, moc_ranges: np.ndarray) -> np.ndarray:
+    """Finds the indexes of the pixels in a tree that overlap with the ranges of a moc
+
+    If either the tree or the moc is much smaller than the other, the intervals of the smaller one are
+    found in the larger one with `np.searchsorted`, so the cost grows with the size of the smaller one
+    and only logarithmically with the larger one. Otherwise, the two interval lists are merged with
+    `perform_filter_by_moc`.
+
+    Args:
+        tree (PixelTree): The tree to find the overlapping pixels of
+        moc_ranges (np.ndarray): The depth 29 ranges of the moc
+
+    Returns:
+        A sorted array of the indexes of the pixels in the tree that overlap with the moc
+    """
+    moc_ranges = moc_ranges.astype(np.int64, copy=False)
+    if len(tree) == 0 or len(moc_ranges) == 0:
+        return np.empty(0, dtype=np.int64)
+    if len(moc_ranges) * SEARCH_SIZE_RATIO < len(tree):
+        return _search_moc_in_tree(tree, moc_ranges)
     # Convert tree intervals to order 29 to match moc intervals
     tree_29_ranges = tree.tree << (2 * (29 - tree.tree_order))
-    tree_mask = perform_filter_by_moc(tree_29_ranges, moc_ranges)
-    return PixelTree(tree.tree[tree_mask], tree.tree_order)
+    if len(tree) * SEARCH_SIZE_RATIO < len(moc_ranges):
+        moc_indexes = np.searchsorted(moc_ranges[:, 1], tree_29_ranges[:, 0], side="right")
+        in_moc = moc_indexes < len(moc_ranges)
+        in_moc[in_moc] = moc_ranges[moc_indexes[in_moc], 0] < tree_29_ranges[in_moc, 1]
+        return np.flatnonzero(in_moc)
+    return np.flatnonzero(perform_filter_by_moc(tree_29_ranges, moc_ranges))
+
+
+def _search_moc_in_tree(tree: PixelTree, moc_ranges: np.ndarray) -> np.ndarray:
+    """Finds the indexes of the pixels in a tree that overlap with the ranges of a much smaller moc, by
+    searching for the start and end of each moc range in the tree"""
+    # Convert the moc ranges down to the order of the tree, rounding outwards, so the tree is not shifted
+    shift = 2 * (29 - tree.tree_order)
+    moc_starts = moc_ranges[:, 0] >> shift
+    moc_ends = (moc_ranges[:, 1] + (1 << shift) - 1) >> shift
+    # The tree pixels from first to last - 1 overlap each moc range
+    first_indexes = np.searchsorted(tree.tree[:, 1], moc_starts, side="right")
+    last_indexes = np.searchsorted(tree.tree[:, 0], moc_ends, side="left")
+    # Consecutive moc ranges may overlap the same tree pixel, so skip pixels already found
+    first_indexes[1:] = np.maximum(first_indexes[1:], np.maximum.accumulate(last_indexes)[:-1])
+    counts = np.maximum(last_indexes - first_indexes, 0)
+    offsets = np.repeat(first_indexes - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(len(offsets), dtype=np.int64)
 
 
 @njit
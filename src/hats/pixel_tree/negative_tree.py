@@ -1,20 +1,27 @@
-from hats.pixel_math import HealpixPixel
-from hats.pixel_tree import PixelAlignmentType, align_trees
+import numpy as np
+
+from hats.pixel_math.healpix_pixel_function import get_pixels_from_intervals, split_ranges_into_intervals
+from hats.pixel_math.pixel_array import PixelArray
 from hats.pixel_tree.pixel_tree import PixelTree
 
 
-def compute_negative_tree_pixels(tree: PixelTree) -> list[HealpixPixel]:
+def compute_negative_tree_pixels(tree: PixelTree) -> PixelArray:
     """Computes a 'negative pixel tree' consisting of the pixels needed to cover the full sky not in the tree
 
+    The gaps between the intervals of the tree, over the full range of pixels at the order of the tree,
+    are split into the largest HEALPix pixels that fit in them.
+
     Args:
         tree (PixelTree): the input tree to compute the negative of
 
-    Returns (List[HealpixPixel]):
-        A list of HEALPix pixels needed to cover the part of the sky not covered by the tree, using the least
-        number of pixels possible.
+    Returns (PixelArray):
+        An array of HEALPix pixels needed to cover the part of the sky not covered by the tree, using the
+        least number of pixels possible, in the order of their pixel intervals.
     """
-    tree_pixels = set(tree.get_healpix_pixels())
-    full_tree = PixelTree.from_healpix([(0, i) for i in range(12)])
-    alignment = align_trees(full_tree, tree, alignment_type=PixelAlignmentType.OUTER)
-    aligned_tree = alignment.pixel_tree
-    return [p for p in aligned_tree.get_healpix_pixels() if p not in tree_pixels]
+    num_pixels = 12 * (np.int64(1) << (2 * tree.tree_order))
+    gap_starts = np.concatenate(([0], tree.tree[:, 1]))
+    gap_ends = np.concatenate((tree.tree[:, 0], [num_pixels]))
+    is_gap = gap_starts < gap_ends
+    starts, ends, _ = split_ranges_into_intervals(gap_starts[is_gap], gap_ends[is_gap], tree.tree_order)
+    orders, pixels = get_pixels_from_intervals(np.column_stack((starts, ends)), tree.tree_order).T
+    return PixelArray(orders, pixels)
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from mocpy import MOC
 from numba import njit
 
-from hats.pixel_math.healpix_pixel_function import get_pixels_from_intervals
-from hats.pixel_tree.moc_filter import perform_filter_by_moc
+from hats.pixel_math.healpix_pixel_function import get_pixels_from_intervals, split_ranges_into_intervals
+from hats.pixel_tree.moc_filter import get_filtered_indexes
 from hats.pixel_tree.pixel_alignment_types import PixelAlignmentType
 from hats.pixel_tree.pixel_tree import PixelTree
 
@@ -16,7 +18,6 @@ LEFT_INCLUDE_ALIGNMENT_TYPES = [PixelAlignmentType.LEFT, PixelAlignmentType.OUTE
 RIGHT_INCLUDE_ALIGNMENT_TYPES = [PixelAlignmentType.RIGHT, PixelAlignmentType.OUTER]
 
 
-NONE_PIX = np.array([-1, -1])
 LEFT_SIDE = True
 RIGHT_SIDE = False
 
@@ -31,7 +32,10 @@ class PixelAlignment:
 
     Attributes:
         pixel_mapping: A dataframe where each row contains a pixel from each tree that match, and
-            which pixel in the aligned tree they match with
+            which pixel in the aligned tree they match with. Columns have the nullable `Int64` dtype,
+            with missing pixels as `pd.NA`, and are built from `pixel_mapping_arrays` when first accessed.
+        pixel_mapping_arrays: The columns of the pixel mapping, as int64 arrays by column name, with
+            missing pixels as -1
         pixel_tree: The aligned tree generated by using the smallest pixels in each tree. For
             example, a tree with pixels at order 0, pixel 1, and a tree with order 1, pixel 4,5,6,
             and 7, would result in the smaller order 1 pixels in the aligned tree.
@@ -50,22 +54,62 @@ class PixelAlignment:
     JOIN_PIXEL_COLUMN_NAME = "join_Npix"
     ALIGNED_ORDER_COLUMN_NAME = "aligned_Norder"
     ALIGNED_PIXEL_COLUMN_NAME = "aligned_Npix"
+    # Column names for the pixels of each input tree in an alignment of many trees, by tree index
+    TREE_ORDER_COLUMN_NAME = "tree_{}_Norder"
+    TREE_PIXEL_COLUMN_NAME = "tree_{}_Npix"
 
     def __init__(
         self,
         aligned_tree: PixelTree,
-        pixel_mapping: pd.DataFrame,
+        pixel_mapping: pd.DataFrame | dict[str, np.ndarray],
         alignment_type: PixelAlignmentType,
         moc: MOC = None,
     ) -> None:
         self.pixel_tree = aligned_tree
-        self.pixel_mapping = pixel_mapping
+        # The mapping is kept as int64 arrays, and only converted to a DataFrame on first access.
+        if isinstance(pixel_mapping, pd.DataFrame):
+            self.pixel_mapping = pixel_mapping
+        else:
+            self._pixel_mapping = None
+            self.pixel_mapping_arrays = pixel_mapping
         self.alignment_type = alignment_type
         self.moc = moc
 
+    @property
+    def pixel_mapping(self) -> pd.DataFrame:
+        """The pixel mapping as a DataFrame of nullable `Int64` columns, built when first accessed."""
+        if self._pixel_mapping is None:
+            self._pixel_mapping = _get_pixel_mapping_df_from_arrays(self.pixel_mapping_arrays)
+        return self._pixel_mapping
+
+    @pixel_mapping.setter
+    def pixel_mapping(self, pixel_mapping: pd.DataFrame):
+        self._pixel_mapping = pixel_mapping
+        self.pixel_mapping_arrays = {
+            column: pixel_mapping[column].to_numpy(dtype=np.int64, na_value=-1)
+            for column in pixel_mapping.columns
+        }
+
+    def to_arrow(self) -> pa.Table:
+        """Gets the pixel mapping as a pyarrow Table of int64 columns, with missing pixels as nulls.
+
+        Returns:
+            A `pa.Table` with a column for each column of the pixel mapping
+        """
+        return pa.table(
+            {
+                column: pa.array(values, mask=values < 0)
+                for column, values in self.pixel_mapping_arrays.items()
+            }
+        )
+
 
 def align_trees(
-    left: PixelTree, right: PixelTree, alignment_type: PixelAlignmentType = PixelAlignmentType.INNER
+    left: PixelTree,
+    right: PixelTree,
+    alignment_type: PixelAlignmentType = PixelAlignmentType.INNER,
+    n_threads: int | None = None,
+    split_order: int = 0,
 ) -> PixelAlignment:
     """Generate a `PixelAlignment` object from two pixel trees
 
@@ -87,6 +131,12 @@ def align_trees(
                 - right - use all pixels that appear in the right catalog and any overlapping from the left
                 - outer - use all pixels from both catalogs
 
+        n_threads: If more than 1, both trees are split into chunks at the boundaries of the HEALPix
+            pixels at `split_order`, and the chunks are aligned concurrently on a pool of `n_threads`
+            threads. By default, the trees are aligned in a single sweep.
+        split_order: The HEALPix order of the pixels at whose boundaries the trees may be split. The
+            default of 0 splits at the 12 base pixels.
+
     Returns:
         The `PixelAlignment` object with the alignment from the two trees
     """
@@ -96,20 +146,77 @@ def align_trees(
     left_aligned = left.tree << (2 * (max_n - left.tree_order))
     right_aligned = right.tree << (2 * (max_n - right.tree_order))
 
-    if alignment_type == PixelAlignmentType.INNER:
-        mapping = perform_inner_align_trees(left_aligned, right_aligned)
+    if n_threads is not None and n_threads > 1:
+        left_splits, right_splits = _get_split_indexes(
+            left_aligned, right_aligned, max_n, min(split_order, max_n), 4 * n_threads
+        )
+        chunks = zip(np.split(left_aligned, left_splits), np.split(right_aligned, right_splits))
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            mappings = list(
+                executor.map(lambda chunk: _align_intervals(chunk[0], chunk[1], alignment_type), chunks)
+            )
+        mapping = np.concatenate(mappings, axis=1)
     else:
-        include_all_left = alignment_type in LEFT_INCLUDE_ALIGNMENT_TYPES
-        include_all_right = alignment_type in RIGHT_INCLUDE_ALIGNMENT_TYPES
-        mapping = perform_align_trees(left_aligned, right_aligned, include_all_left, include_all_right)
-        mapping = np.array(mapping).T
+        mapping = _align_intervals(left_aligned, right_aligned, alignment_type)
     result_tree = mapping[4:6].T if len(mapping) > 0 else np.empty((0, 2), dtype=np.int64)
-    result_mapping = get_pixel_mapping_df(mapping, max_n)
+    result_mapping = get_pixel_mapping_arrays(mapping, max_n)
     return PixelAlignment(PixelTree(result_tree, max_n), result_mapping, alignment_type)
 
 
-def get_pixel_mapping_df(mapping: np.ndarray, map_order: int) -> pd.DataFrame:
-    """Construct a DataFrame with HEALPix orders and pixels mapping left right and aligned pixels
+def _align_intervals(left: np.ndarray, right: np.ndarray, alignment_type: PixelAlignmentType) -> np.ndarray:
+    """Performs an alignment of the given type on arrays of pixel intervals of the same order
+
+    Returns:
+        The (6, n) array of left, right, and aligned pixel intervals
+    """
+    if alignment_type == PixelAlignmentType.INNER:
+        return perform_inner_align_trees(left, right)
+    include_all_left = alignment_type in LEFT_INCLUDE_ALIGNMENT_TYPES
+    include_all_right = alignment_type in RIGHT_INCLUDE_ALIGNMENT_TYPES
+    return perform_align_trees(left, right, include_all_left, include_all_right)
+
+
+def _get_split_indexes(
+    left: np.ndarray, right: np.ndarray, tree_order: int, split_order: int, max_chunks: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Finds where to split two arrays of pixel intervals into chunks that can be aligned independently
+
+    The arrays are only split at boundaries of pixels at `split_order` that are not inside an interval of
+    either array, so no pixel is split between two chunks. Of those boundaries, at most `max_chunks` - 1 are
+    chosen, to give chunks with similar numbers of intervals.
+
+    Args:
+        left (np.ndarray): the left array of intervals
+        right (np.ndarray): the right array of intervals
+        tree_order (int): the HEALPix order of the intervals
+        split_order (int): the HEALPix order of the pixels at whose boundaries the arrays may be split
+        max_chunks (int): the maximum number of chunks to split the arrays into
+
+    Returns:
+        The indexes to split the left and right arrays at, as used by `np.split`
+    """
+    boundaries = np.arange(1, 12 * 4**split_order, dtype=np.int64) << (2 * (tree_order - split_order))
+    valid = np.ones(len(boundaries), dtype=bool)
+    splits = []
+    for intervals in (left, right):
+        interval_splits = np.searchsorted(intervals[:, 0], boundaries)
+        if len(intervals) > 0:
+            # A boundary is inside an interval if the interval before it ends after the boundary
+            previous_ends = intervals[np.maximum(interval_splits - 1, 0), 1]
+            valid &= (interval_splits == 0) | (previous_ends <= boundaries)
+        splits.append(interval_splits)
+    left_splits = splits[0][valid]
+    right_splits = splits[1][valid]
+    if len(left_splits) == 0:
+        return left_splits, right_splits
+    targets = np.arange(1, max_chunks) * (len(left) + len(right)) // max_chunks
+    chosen = np.searchsorted(left_splits + right_splits, targets)
+    chosen = np.unique(np.minimum(chosen, len(left_splits) - 1))
+    return left_splits[chosen], right_splits[chosen]
+
+
+def get_pixel_mapping_arrays(mapping: np.ndarray, map_order: int) -> dict[str, np.ndarray]:
+    """Construct int64 arrays of HEALPix orders and pixels mapping left right and aligned pixels
 
     Args:
         mapping (np.ndarray): array of shape (6, len(aligned_pixels)) where the first two rows are the
@@ -117,30 +224,51 @@ def get_pixel_mapping_df(mapping: np.ndarray, map_order: int) -> pd.DataFrame:
         map_order (int): The HEALPix order of the intervals in the mapping array
 
     Returns:
-        A DataFrame with the orders and pixels of the aligned left and right pixels,
+        A dictionary of the orders and pixels of the aligned left and right pixels by mapping column name,
+        with -1 for missing pixels
     """
     if len(mapping) > 0:
         l_orders, l_pixels = get_pixels_from_intervals(mapping[0:2].T, map_order).T
         r_orders, r_pixels = get_pixels_from_intervals(mapping[2:4].T, map_order).T
         a_orders, a_pixels = get_pixels_from_intervals(mapping[4:6].T, map_order).T
     else:
-        l_orders, l_pixels, r_orders, r_pixels, a_orders, a_pixels = [], [], [], [], [], []
-    result_mapping = pd.DataFrame.from_dict(
-        {
-            PixelAlignment.PRIMARY_ORDER_COLUMN_NAME: l_orders,
-            PixelAlignment.PRIMARY_PIXEL_COLUMN_NAME: l_pixels,
-            PixelAlignment.JOIN_ORDER_COLUMN_NAME: r_orders,
-            PixelAlignment.JOIN_PIXEL_COLUMN_NAME: r_pixels,
-            PixelAlignment.ALIGNED_ORDER_COLUMN_NAME: a_orders,
-            PixelAlignment.ALIGNED_PIXEL_COLUMN_NAME: a_pixels,
-        }
+        l_orders, l_pixels, r_orders, r_pixels, a_orders, a_pixels = (np.empty(0, dtype=np.int64),) * 6
+    return {
+        PixelAlignment.PRIMARY_ORDER_COLUMN_NAME: l_orders,
+        PixelAlignment.PRIMARY_PIXEL_COLUMN_NAME: l_pixels,
+        PixelAlignment.JOIN_ORDER_COLUMN_NAME: r_orders,
+        PixelAlignment.JOIN_PIXEL_COLUMN_NAME: r_pixels,
+        PixelAlignment.ALIGNED_ORDER_COLUMN_NAME: a_orders,
+        PixelAlignment.ALIGNED_PIXEL_COLUMN_NAME: a_pixels,
+    }
+
+
+def get_pixel_mapping_df(mapping: np.ndarray, map_order: int) -> pd.DataFrame:
+    """Construct a DataFrame with HEALPix orders and pixels mapping left right and aligned pixels
+
+    Args:
+        mapping (np.ndarray): array of shape (6, len(aligned_pixels)) where the first two rows are the
+            intervals for the left pixels, the next two for right pixels, and the last two for aligned pixels
+        map_order (int): The HEALPix order of the intervals in the mapping array
+
+    Returns:
+        A DataFrame with the orders and pixels of the aligned left and right pixels, as nullable `Int64`
+        columns with missing pixels as `pd.NA`
+    """
+    return _get_pixel_mapping_df_from_arrays(get_pixel_mapping_arrays(mapping, map_order))
+
+
+def _get_pixel_mapping_df_from_arrays(mapping_arrays: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Wraps int64 mapping arrays, with -1 for missing pixels, in a DataFrame of nullable `Int64` columns
+    without copying the values"""
+    return pd.DataFrame(
+        {column: pd.arrays.IntegerArray(values, values < 0) for column, values in mapping_arrays.items()},
+        copy=False,
     )
-    result_mapping.replace(-1, None, inplace=True)
-    return result_mapping
 
 
 # pylint: disable=too-many-statements
-@njit
+@njit(nogil=True)
 def perform_inner_align_trees(
     left: np.ndarray,
     right: np.ndarray,
@@ -207,14 +335,58 @@ def perform_inner_align_trees(
     return mapping[:out_index].T
 
 
+@njit
+def _grow_mapping(mapping: np.ndarray, out_index: int) -> np.ndarray:
+    """Copies the first `out_index` rows of the mapping buffer into a new buffer of double the size"""
+    grown_mapping = np.empty((2 * mapping.shape[0] + 16, 6), dtype=np.int64)
+    for i in range(out_index):
+        for j in range(6):
+            grown_mapping[i, j] = mapping[i, j]
+    return grown_mapping
+
+
+@njit
+def _append_mapping_row(
+    mapping: np.ndarray,
+    out_index: int,
+    left_start: int,
+    left_end: int,
+    right_start: int,
+    right_end: int,
+    aligned_start: int,
+    aligned_end: int,
+) -> tuple[np.ndarray, int]:
+    """Writes a row of left, right, and aligned pixel intervals to the mapping buffer, doubling the size of
+    the buffer if it is full
+
+    Args:
+        mapping (np.ndarray): The (n, 6) buffer of left, right, and aligned pixel intervals
+        out_index (int): The index of the row to write
+
+    Returns:
+        The mapping buffer, which is a new array if it had to grow, and the index of the next row
+    """
+    if out_index >= mapping.shape[0]:
+        mapping = _grow_mapping(mapping, out_index)
+    mapping[out_index, 0] = left_start
+    mapping[out_index, 1] = left_end
+    mapping[out_index, 2] = right_start
+    mapping[out_index, 3] = right_end
+    mapping[out_index, 4] = aligned_start
+    mapping[out_index, 5] = aligned_end
+    return mapping, out_index + 1
+
+
 @njit
 def _add_pixels_until(
     add_from: int,
     add_to: int,
-    matching_pix: np.ndarray,
+    matching_start: int,
+    matching_end: int,
     is_left_pixel: bool,
-    mapping: list[np.ndarray],
-):
+    mapping: np.ndarray,
+    out_index: int,
+) -> tuple[np.ndarray, int]:
     """Adds pixels of the greatest possible order to fill output from `add-from` to `add_to`
 
     Adds these pixels to the mapping as the aligned pixel, with matching pix added as either the left or right
@@ -223,10 +395,15 @@ def _add_pixels_until(
     Args:
         add_from (int): The pixel number to add pixels from
         add_to (int): The pixel number to add pixels to
-        matching_pix (int): The matching pixel from the side of the catalog that exists to map the new pixels
-            to in the mapping
+        matching_start (int): The start of the matching pixel from the side of the catalog that exists to map
+            the new pixels to in the mapping
+        matching_end (int): The end of the matching pixel
         is_left_pixel (int): Is the matching pixel from the left side of the alignment
-        mapping (List[np.ndarray]): The List mapping left, right, and aligned pixels to add the new pixels to
+        mapping (np.ndarray): The buffer mapping left, right, and aligned pixels to add the new pixels to
+        out_index (int): The index of the next row to write in the mapping
+
+    Returns:
+        The mapping buffer and the index of the next row to write
     """
     while add_from < add_to:
         # maximum power of 4 that is a factor of add_from
@@ -242,12 +419,16 @@ def _add_pixels_until(
         max_p4_to = 1 << (max_p4_to_log2 - (max_p4_to_log2 & 1))
 
         pixel_size = min(max_p4_to, max_p4_from)
-        pixel = np.array([add_from, add_from + pixel_size])
         if is_left_pixel:
-            mapping.append(np.concatenate((matching_pix, NONE_PIX, pixel)))
+            mapping, out_index = _append_mapping_row(
+                mapping, out_index, matching_start, matching_end, -1, -1, add_from, add_from + pixel_size
+            )
         else:
-            mapping.append(np.concatenate((NONE_PIX, matching_pix, pixel)))
+            mapping, out_index = _append_mapping_row(
+                mapping, out_index, -1, -1, matching_start, matching_end, add_from, add_from + pixel_size
+            )
         add_from = add_from + pixel_size
+    return mapping, out_index
 
 
 @njit
@@ -256,8 +437,9 @@ def _add_remaining_pixels(
     pixel_list: np.ndarray,
     index: int,
     is_left_pixel: bool,
-    mapping: list[np.ndarray],
-):
+    mapping: np.ndarray,
+    out_index: int,
+) -> tuple[np.ndarray, int]:
     """Adds pixels to output and mapping from a given index in a list of pixel intervals
 
     Args:
@@ -266,118 +448,158 @@ def _add_remaining_pixels(
             pixels of
         index (int): The index of the pixel list to add the pixels from
         is_left_pixel (bool): Is the pixel list from left side of the alignment
-        mapping (List[np.ndarray]): The List mapping left, right, and aligned pixels to add the new pixels to
+        mapping (np.ndarray): The buffer mapping left, right, and aligned pixels to add the new pixels to
+        out_index (int): The index of the next row to write in the mapping
+
+    Returns:
+        The mapping buffer and the index of the next row to write
     """
 
     # first pixel may be partially covered
-    pix = pixel_list[index]
-    if pix[0] < added_until < pix[1]:
-        _add_pixels_until(added_until, pix[1], pix, is_left_pixel, mapping)
+    pix_start = pixel_list[index, 0]
+    pix_end = pixel_list[index, 1]
+    if pix_start < added_until < pix_end:
+        mapping, out_index = _add_pixels_until(
+            added_until, pix_end, pix_start, pix_end, is_left_pixel, mapping, out_index
+        )
         index += 1
-    if added_until >= pix[1]:
+    if added_until >= pix_end:
         index += 1
     while index < len(pixel_list):
-        pix = pixel_list[index]
+        pix_start = pixel_list[index, 0]
+        pix_end = pixel_list[index, 1]
         if is_left_pixel:
-            mapping.append(np.concatenate((pix, NONE_PIX, pix)))
+            mapping, out_index = _append_mapping_row(
+                mapping, out_index, pix_start, pix_end, -1, -1, pix_start, pix_end
+            )
         else:
-            mapping.append(np.concatenate((NONE_PIX, pix, pix)))
+            mapping, out_index = _append_mapping_row(
+                mapping, out_index, -1, -1, pix_start, pix_end, pix_start, pix_end
+            )
         index += 1
+    return mapping, out_index
 
 
 # pylint: disable=too-many-statements
-@njit
+@njit(nogil=True)
 def perform_align_trees(
     left: np.ndarray,
     right: np.ndarray,
     include_all_left: bool,
     include_all_right: bool,
-) -> list[np.ndarray]:
+) -> np.ndarray:
     """Performs an alignment on arrays of pixel intervals
 
     Pixel interval lists must be of to the same order
 
+    The mapping is written into a preallocated buffer, which is grown by doubling when pixels
+    added to fill gaps in coverage overflow it.
+
     Args:
         left (np.ndarray): the left array of intervals
         right (np.ndarray): the right array of intervals
         include_all_left (bool): if all pixels from the left tree should be covered in the final alignment
         include_all_right (bool): if all pixels from the right tree should be covered in the final alignment
 
-    Returns (List[np.ndarray]):
-        The pixel mapping of the matching left, right, and aligned pixels with each row containing an array of
-        [left_order, left_pixel, right_order, right_pixel, aligned_order, aligned_pixel]
+    Returns (np.ndarray):
+        The pixel mapping of the matching left, right, and aligned pixels, as an array of shape (6, n) with
+        rows of left_start, left_end, right_start, right_end, aligned_start, aligned_end intervals
     """
     added_until = 0
-    mapping = []
+    mapping = np.empty((left.shape[0] + right.shape[0], 6), dtype=np.int64)
+    out_index = 0
     left_index = 0
     right_index = 0
     while left_index < len(left) and right_index < len(right):
-        left_pix = left[left_index]
-        right_pix = right[right_index]
-        if left_pix[0] >= right_pix[1]:
+        left_start = left[left_index, 0]
+        left_end = left[left_index, 1]
+        right_start = right[right_index, 0]
+        right_end = right[right_index, 1]
+        # Each step may fill a gap in coverage with pixels matching one side, then add one row to the mapping
+        fill_from = 0
+        fill_to = 0
+        fill_is_left = LEFT_SIDE
+        aligned_start = -1
+        aligned_end = -1
+        add_row = True
+        if left_start >= right_end:
             # left pix ahead of right, no overlap, so move right on
-            if include_all_right:
-                if added_until <= right_pix[0]:
-                    # should cover right pix and no coverage of right pix => add whole right pix
-                    mapping.append(np.concatenate((NONE_PIX, right_pix, right_pix)))
-                    added_until = right_pix[1]
-                elif added_until < right_pix[1]:
-                    # should cover right pix and partial coverage of right pix => cover rest of right pix
-                    _add_pixels_until(added_until, right_pix[1], right_pix, RIGHT_SIDE, mapping)
-                    added_until = right_pix[1]
             right_index += 1
-            continue
-        if right_pix[0] >= left_pix[1]:
+            if not include_all_right or added_until >= right_end:
+                continue
+            if added_until <= right_start:
+                # should cover right pix and no coverage of right pix => add whole right pix
+                left_start, left_end = -1, -1
+                aligned_start, aligned_end = right_start, right_end
+            else:
+                # should cover right pix and partial coverage of right pix => cover rest of right pix
+                fill_from, fill_to, fill_is_left = added_until, right_end, RIGHT_SIDE
+                add_row = False
+            added_until = right_end
+        elif right_start >= left_end:
             # right pix ahead of left, no overlap, so move left on
-            if include_all_left:
-                if added_until <= left_pix[0]:
-                    # should cover left pix and no coverage of left pix => add whole left pix
-                    mapping.append(np.concatenate((left_pix, NONE_PIX, left_pix)))
-                    added_until = left_pix[1]
-                elif added_until < left_pix[1]:
-                    # should cover left pix and partial coverage of left pix => cover rest of left pix
-                    _add_pixels_until(added_until, left_pix[1], left_pix, LEFT_SIDE, mapping)
-                    added_until = left_pix[1]
             left_index += 1
-            continue
-        left_size = left_pix[1] - left_pix[0]
-        right_size = right_pix[1] - right_pix[0]
-        if left_size == right_size:
+            if not include_all_left or added_until >= left_end:
+                continue
+            if added_until <= left_start:
+                # should cover left pix and no coverage of left pix => add whole left pix
+                right_start, right_end = -1, -1
+                aligned_start, aligned_end = left_start, left_end
+            else:
+                # should cover left pix and partial coverage of left pix => cover rest of left pix
+                fill_from, fill_to, fill_is_left = added_until, left_end, LEFT_SIDE
+                add_row = False
+            added_until = left_end
+        elif left_end - left_start == right_end - right_start:
             # overlapping & same size => same pixel so add and move both on
-            mapping.append(np.concatenate((left_pix, right_pix, left_pix)))
-            added_until = left_pix[1]
+            aligned_start, aligned_end = left_start, left_end
+            added_until = left_end
             left_index += 1
             right_index += 1
-            continue
-        if left_size < right_size:
+        elif left_end - left_start < right_end - right_start:
             # overlapping and left smaller so add left and move left on
-            if include_all_right and left_pix[0] > right_pix[0] and left_pix[0] > added_until:
+            if include_all_right and left_start > right_start and left_start > added_until:
                 # need to cover all of right pix and start of left pix has a gap to current coverage
                 # so fill in gap
-                add_from = max(added_until, right_pix[0])
-                _add_pixels_until(add_from, left_pix[0], right_pix, RIGHT_SIDE, mapping)
-            mapping.append(np.concatenate((left_pix, right_pix, left_pix)))
-            added_until = left_pix[1]
+                fill_from, fill_to, fill_is_left = max(added_until, right_start), left_start, RIGHT_SIDE
+            aligned_start, aligned_end = left_start, left_end
+            added_until = left_end
             left_index += 1
-            continue
-        # else overlapping and right smaller so add right and move right on
+        else:
+            # overlapping and right smaller so add right and move right on
+            if include_all_left and right_start > left_start and right_start > added_until:
+                # need to cover all of left pix and start of right pix has a gap to current coverage
+                # so fill in gap
+                fill_from, fill_to, fill_is_left = max(added_until, left_start), right_start, LEFT_SIDE
+            aligned_start, aligned_end = right_start, right_end
+            added_until = right_end
+            right_index += 1
 
-        if include_all_left and right_pix[0] > left_pix[0] and right_pix[0] > added_until:
-            # need to cover all of left pix and start of right pix has a gap to current coverage
-            # so fill in gap
-            add_from = max(added_until, left_pix[0])
-            _add_pixels_until(add_from, right_pix[0], left_pix, LEFT_SIDE, mapping)
-        mapping.append(np.concatenate((left_pix, right_pix, right_pix)))
-        added_until = right_pix[1]
-        right_index += 1
+        if fill_from < fill_to:
+            if fill_is_left:
+                mapping, out_index = _add_pixels_until(
+                    fill_from, fill_to, left_start, left_end, LEFT_SIDE, mapping, out_index
+                )
+            else:
+                mapping, out_index = _add_pixels_until(
+                    fill_from, fill_to, right_start, right_end, RIGHT_SIDE, mapping, out_index
+                )
+        if add_row:
+            mapping, out_index = _append_mapping_row(
+                mapping, out_index, left_start, left_end, right_start, right_end, aligned_start, aligned_end
+            )
 
     # After loop, if either tree needs to be fully covered and loop hasn't checked all pixels from that tree
     # then cover the remaining pixels
     if include_all_right and right_index < len(right):
-        _add_remaining_pixels(added_until, right, right_index, RIGHT_SIDE, mapping)
+        mapping, out_index = _add_remaining_pixels(
+            added_until, right, right_index, RIGHT_SIDE, mapping, out_index
+        )
     if include_all_left and left_index < len(left):
-        _add_remaining_pixels(added_until, left, left_index, LEFT_SIDE, mapping)
-    return mapping
+        mapping, out_index = _add_remaining_pixels(
+            added_until, left, left_index, LEFT_SIDE, mapping, out_index
+        )
+    return mapping[:out_index].T
 
 
 def filter_alignment_by_moc(alignment: PixelAlignment, moc: MOC) -> PixelAlignment:
@@ -391,13 +613,10 @@ def filter_alignment_by_moc(alignment: PixelAlignment, moc: MOC) -> PixelAlignme
     Returns:
         PixelAlignment object with the filtered mapping and tree
     """
-    moc_ranges = moc.to_depth29_ranges
-    tree_29_ranges = alignment.pixel_tree.to_depth29_ranges()
-    tree_mask = perform_filter_by_moc(tree_29_ranges, moc_ranges)
-    new_tree = PixelTree(alignment.pixel_tree.tree[tree_mask], alignment.pixel_tree.tree_order)
-    return PixelAlignment(
-        new_tree, alignment.pixel_mapping.iloc[tree_mask], alignment.alignment_type, moc=moc
-    )
+    tree_indexes = get_filtered_indexes(alignment.pixel_tree, moc.to_depth29_ranges)
+    new_tree = PixelTree(alignment.pixel_tree.tree[tree_indexes], alignment.pixel_tree.tree_order)
+    new_mapping = {column: values[tree_indexes] for column, values in alignment.pixel_mapping_arrays.items()}
+    return PixelAlignment(new_tree, new_mapping, alignment.alignment_type, moc=moc)
 
 
 def align_with_mocs(
@@ -406,6 +625,8 @@ def align_with_mocs(
     left_moc: MOC | None,
     right_moc: MOC | None,
     alignment_type: PixelAlignmentType = PixelAlignmentType.INNER,
+    n_threads: int | None = None,
+    split_order: int = 0,
 ) -> PixelAlignment:
     """Aligns two pixel trees and mocs together, resulting in a pixel alignment with only aligned pixels that
     have coverage in the mocs.
@@ -423,6 +644,11 @@ def align_with_mocs(
                 - right - use all pixels that appear in the right catalog and any overlapping from the left
                 - outer - use all pixels from both catalogs
 
+        n_threads (int): If more than 1, the trees are aligned in chunks on a pool of `n_threads`
+            threads. See `align_trees`.
+        split_order (int): The HEALPix order of the pixels at whose boundaries the trees may be split
+            into chunks. See `align_trees`.
+
     Returns:
         The PixelAlignment object with the aligned trees filtered by the coverage in the catalogs.
     """
@@ -435,5 +661,93 @@ def align_with_mocs(
         PixelAlignmentType.OUTER: lambda l, r: l.union(r),
     }
     filter_moc = moc_intersection_methods[alignment_type](left_moc, right_moc)
-    alignment = align_trees(left_tree, right_tree, alignment_type=alignment_type)
+    alignment = align_trees(
+        left_tree, right_tree, alignment_type=alignment_type, n_threads=n_threads, split_order=split_order
+    )
     return filter_alignment_by_moc(alignment, filter_moc)
+
+
+def align_many(
+    trees: list[PixelTree], alignment_type: PixelAlignmentType = PixelAlignmentType.INNER
+) -> PixelAlignment:
+    """Generate a `PixelAlignment` object from any number of pixel trees, in a single sweep
+
+    The aligned tree uses the smallest pixels from the trees where they overlap, in the same way as
+    `align_trees`. The pixel mapping has a pair of columns with the order and pixel of each input tree,
+    named with `PixelAlignment.TREE_ORDER_COLUMN_NAME` and `PixelAlignment.TREE_PIXEL_COLUMN_NAME`
+    formatted with the index of the tree, and the aligned order and pixel columns. Trees with no pixel
+    covering an aligned pixel have missing values in their columns.
+
+    Args:
+        trees (List[PixelTree]): The trees to align
+        alignment_type (PixelAlignmentType): The type of alignment describing how to handle nodes which
+            exist in some trees but not others. Options are:
+
+                - inner - only use pixels that appear in all trees
+                - outer - use all pixels from all trees
+
+    Returns:
+        The `PixelAlignment` object with the alignment of all the trees
+    """
+    if len(trees) == 0:
+        raise ValueError("At least one tree is required for an alignment")
+    if alignment_type not in (PixelAlignmentType.INNER, PixelAlignmentType.OUTER):
+        raise ValueError("Alignments of many trees must be inner or outer")
+    max_n = max(tree.tree_order for tree in trees)
+    intervals = [tree.tree << (2 * (max_n - tree.tree_order)) for tree in trees]
+
+    # Split the sky at every interval boundary, and find which interval of each tree covers each segment
+    boundaries = np.sort(np.concatenate([tree_intervals.ravel() for tree_intervals in intervals]))
+    boundaries = np.concatenate((boundaries[:1], boundaries[1:][boundaries[1:] != boundaries[:-1]]))
+    segment_starts = boundaries[:-1]
+    segment_ends = boundaries[1:]
+    covering_indexes = np.full((len(trees), len(segment_starts)), -1, dtype=np.int64)
+    for tree_index, tree_intervals in enumerate(intervals):
+        if len(tree_intervals) == 0:
+            continue
+        indexes = np.searchsorted(tree_intervals[:, 0], segment_starts, side="right") - 1
+        is_covered = (indexes >= 0) & (tree_intervals[np.maximum(indexes, 0), 1] > segment_starts)
+        covering_indexes[tree_index, is_covered] = indexes[is_covered]
+    if alignment_type == PixelAlignmentType.INNER:
+        keep_segments = np.all(covering_indexes >= 0, axis=0)
+    else:
+        keep_segments = np.any(covering_indexes >= 0, axis=0)
+    segment_indexes = np.flatnonzero(keep_segments)
+
+    aligned_starts, aligned_ends, aligned_segments = split_ranges_into_intervals(
+        segment_starts[segment_indexes], segment_ends[segment_indexes], max_n
+    )
+    aligned_intervals = np.column_stack((aligned_starts, aligned_ends))
+    aligned_covering_indexes = covering_indexes[:, segment_indexes[aligned_segments]]
+
+    mapping_columns = _get_tree_mapping_columns(intervals, aligned_covering_indexes, max_n)
+    aligned_orders, aligned_pixels = get_pixels_from_intervals(aligned_intervals, max_n).T
+    mapping_columns[PixelAlignment.ALIGNED_ORDER_COLUMN_NAME] = aligned_orders
+    mapping_columns[PixelAlignment.ALIGNED_PIXEL_COLUMN_NAME] = aligned_pixels
+    return PixelAlignment(PixelTree(aligned_intervals, max_n), mapping_columns, alignment_type)
+
+
+def _get_tree_mapping_columns(
+    intervals: list[np.ndarray], covering_indexes: np.ndarray, max_n: int
+) -> dict[str, np.ndarray]:
+    """Gets the order and pixel mapping columns of each tree in a many-tree alignment
+
+    Args:
+        intervals (List[np.ndarray]): the intervals of each tree, at order `max_n`
+        covering_indexes (np.ndarray): array of shape (number of trees, number of aligned pixels), with
+            the index of the interval of each tree that covers each aligned pixel, or -1 if none does
+        max_n (int): the order of the intervals
+
+    Returns:
+        Dictionary of the order and pixel columns of each tree, with -1 where no pixel covers the
+        aligned pixel
+    """
+    mapping_columns = {}
+    for tree_index, tree_intervals in enumerate(intervals):
+        tree_indexes = covering_indexes[tree_index]
+        covering_intervals = np.full((len(tree_indexes), 2), -1, dtype=np.int64)
+        covering_intervals[tree_indexes >= 0] = tree_intervals[tree_indexes[tree_indexes >= 0]]
+        orders, pixels = get_pixels_from_intervals(covering_intervals, max_n).T
+        mapping_columns[PixelAlignment.TREE_ORDER_COLUMN_NAME.format(tree_index)] = orders
+        mapping_columns[PixelAlignment.TREE_PIXEL_COLUMN_NAME.format(tree_index)] = pixels
+    return mapping_columns
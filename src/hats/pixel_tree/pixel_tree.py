@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import hashlib
+import struct
 from collections.abc import Sequence
+from pathlib import Path
 
 import numpy as np
 from mocpy import MOC
+from upath import UPath
 
+from hats.io.file_io import get_upath
 from hats.pixel_math import HealpixPixel
 from hats.pixel_math.healpix_pixel_convertor import get_healpix_tuple
 from hats.pixel_math.healpix_pixel_function import get_pixels_from_intervals
+from hats.pixel_math.pixel_array import PixelArray
+from hats.pixel_math.spatial_index import DEFAULT_CHUNK_SIZE, SPATIAL_INDEX_ORDER
+
+# Header of a binary pixel tree file: magic bytes, format version, tree order, number of intervals, the
+# checksum of the partition info the tree was written with, and the length of the pixel order. The
+# little-endian int64 array of intervals follows the header, and then the optional int64 pixel order.
+PIXEL_TREE_FILE_MAGIC = b"HATSTREE"
+PIXEL_TREE_FILE_VERSION = 1
+PIXEL_TREE_FILE_HEADER = struct.Struct("<8sIIq16sq")
 
 
 class PixelTree:
@@ -24,12 +38,14 @@ class PixelTree:
             order then pixel number
     """
 
-    def __init__(self, tree: np.ndarray, order: int) -> None:
+    def __init__(self, tree: np.ndarray, order: int, pixels: np.ndarray | None = None) -> None:
         """Initialises a tree object from the nodes in the tree
 
         Args:
             tree (np.ndarray): sorted array of intervals that represent each pixel in the tree
             order (int): HEALPix order of the pixel numbers in the intervals
+            pixels (np.ndarray | None): (Default = None) array of the [order, pixel] of each interval,
+                if already known. If None, it is computed from the intervals.
         """
         self.tree_order = order
         self.tree = tree
@@ -37,7 +53,8 @@ class PixelTree:
         if not np.all((self.tree.T[0, 1:] - self.tree.T[1, :-1]) >= 0):
             raise ValueError("Invalid Catalog: Tree contains overlapping pixels")
 
-        self.pixels = get_pixels_from_intervals(self.tree, self.tree_order)
+        self.pixels = get_pixels_from_intervals(self.tree, self.tree_order) if pixels is None else pixels
+        self._fingerprint = None
 
     def __len__(self):
         """Gets the number of nodes in the tree
@@ -71,6 +88,89 @@ class PixelTree:
     def __contains__(self, item):
         return self.contains(item)
 
+    def contains_many(self, orders: np.ndarray | int, pixels: np.ndarray) -> np.ndarray:
+        """Check if tree contains nodes at each of many orders and pixels
+
+        This is the vectorized equivalent of calling `contains` on each (order, pixel) pair.
+
+        Args:
+            orders (np.ndarray | int): HEALPix orders of the pixels to check. May be a single
+                order, used for all pixels.
+            pixels (np.ndarray): HEALPix pixel numbers to check
+
+        Returns:
+            Boolean array, True where the tree contains the pixel at that order
+        """
+        orders, pixels = np.broadcast_arrays(
+            np.asarray(orders, dtype=np.int64), np.asarray(pixels, dtype=np.int64)
+        )
+        leaf_indexes = self.get_containing_leaf_indexes(orders, pixels)
+        contained = leaf_indexes >= 0
+        contained[contained] = self.pixels[leaf_indexes[contained], 0] == orders[contained]
+        return contained
+
+    def get_containing_leaf_indexes(self, orders: np.ndarray | int, pixels: np.ndarray) -> np.ndarray:
+        """Find the index of the leaf node that contains each of many orders and pixels
+
+        A leaf node contains a pixel if the pixel is the same as, or is a descendant of,
+        the leaf node's pixel.
+
+        Args:
+            orders (np.ndarray | int): HEALPix orders of the pixels to find. May be a single
+                order, used for all pixels.
+            pixels (np.ndarray): HEALPix pixel numbers to find
+
+        Returns:
+            int64 array with the index into the tree of the leaf node containing each pixel,
+            or -1 where no leaf node contains the pixel
+        """
+        orders, pixels = np.broadcast_arrays(
+            np.asarray(orders, dtype=np.int64), np.asarray(pixels, dtype=np.int64)
+        )
+        leaf_indexes = np.full(orders.shape, -1, dtype=np.int64)
+        if len(self.tree) == 0 or orders.size == 0:
+            return leaf_indexes
+        left_shift = 2 * np.maximum(self.tree_order - orders, 0)
+        right_shift = 2 * np.maximum(orders - self.tree_order, 0)
+        pixels_at_tree_order = (pixels << left_shift) >> right_shift
+        indexes = np.searchsorted(self.tree[:, 1], pixels_at_tree_order, side="right")
+        in_tree = indexes < len(self.tree)
+        indexes = np.minimum(indexes, len(self.tree) - 1)
+        contained = (
+            in_tree & (self.tree[indexes, 0] <= pixels_at_tree_order) & (self.pixels[indexes, 0] <= orders)
+        )
+        leaf_indexes[contained] = indexes[contained]
+        return leaf_indexes
+
+    def get_spatial_index_leaf_indexes(self, spatial_index: np.ndarray) -> np.ndarray:
+        """Find the index of the leaf node that contains each of many order 29 pixels
+
+        This is equivalent to `get_containing_leaf_indexes` at order 29, but shifts the pixels down to the
+        order of the tree and searches the tree in chunks, so the intermediate arrays are bounded by the
+        chunk size.
+
+        Args:
+            spatial_index (np.ndarray): `_healpix_29` values of the points to find
+
+        Returns:
+            int64 array with the index into the tree of the leaf node containing each pixel,
+            or -1 where no leaf node contains the pixel
+        """
+        spatial_index = np.asarray(spatial_index, dtype=np.int64)
+        leaf_indexes = np.full(spatial_index.shape, -1, dtype=np.int64)
+        if len(self.tree) == 0:
+            return leaf_indexes
+        shift = 2 * (SPATIAL_INDEX_ORDER - self.tree_order)
+        flat_index = spatial_index.ravel()
+        flat_leaf_indexes = leaf_indexes.ravel()
+        for start in range(0, len(flat_index), DEFAULT_CHUNK_SIZE):
+            pixels = flat_index[start : start + DEFAULT_CHUNK_SIZE] >> shift
+            indexes = np.searchsorted(self.tree[:, 1], pixels, side="right")
+            np.minimum(indexes, len(self.tree) - 1, out=indexes)
+            contained = (self.tree[indexes, 0] <= pixels) & (pixels < self.tree[indexes, 1])
+            flat_leaf_indexes[start : start + DEFAULT_CHUNK_SIZE] = np.where(contained, indexes, -1)
+        return leaf_indexes
+
     def get_max_depth(self) -> int:
         """Get the max depth (or highest healpix order) represented in the list of pixels.
 
@@ -79,22 +179,179 @@ class PixelTree:
         """
         return np.max(self.pixels.T[0])
 
-    def get_healpix_pixels(self) -> list[HealpixPixel]:
+    def get_healpix_pixels(self) -> PixelArray:
         """Creates a list of HealpixPixels in the tree
 
-        Returns (List[HealpixPixel]):
-            A list of the HEALPix pixels in the tree
+        Returns (PixelArray):
+            An array-backed list of the HEALPix pixels in the tree
         """
-        return [HealpixPixel(p[0], p[1]) for p in self.pixels]
+        return PixelArray(self.pixels[:, 0], self.pixels[:, 1])
 
     def to_moc(self) -> MOC:
         """Returns the MOC object that covers the same pixels as the tree"""
         return MOC.from_healpix_cells(self.pixels.T[1], self.pixels.T[0], self.tree_order)
 
+    def fingerprint(self) -> bytes:
+        """Gets a hash of the contents of the tree, which is the same for trees with the same intervals and
+        order. The hash is computed on the first call and then reused, since a tree is not modified in
+        place: `insert_pixels`, `remove_pixels` and `split_pixels` return new trees.
+
+        Returns:
+            The 16 byte digest of the tree order and intervals
+        """
+        if self._fingerprint is None:
+            tree_hash = hashlib.blake2b(digest_size=16)
+            tree_hash.update(np.int64(self.tree_order).tobytes())
+            tree_hash.update(np.ascontiguousarray(self.tree, dtype=np.int64).data)
+            self._fingerprint = tree_hash.digest()
+        return self._fingerprint
+
     def to_depth29_ranges(self) -> np.ndarray:
         """Returns the ranges of the pixels in the tree at depth 29"""
         return self.tree << (2 * (29 - self.tree_order))
 
+    def insert_pixels(self, orders: np.ndarray | int, pixels: np.ndarray) -> PixelTree:
+        """Creates a new tree with the given pixels added as leaf nodes, without rebuilding the tree
+
+        The new pixels are placed with `np.searchsorted` and spliced into a copy of the tree, so this
+        does not sort the tree. If any pixel is of a higher order than the tree, the new tree is at the
+        highest order of the pixels.
+
+        Args:
+            orders (np.ndarray | int): HEALPix orders of the pixels to add. May be a single order, used
+                for all pixels.
+            pixels (np.ndarray): HEALPix pixel numbers of the pixels to add
+
+        Returns:
+            A new tree with the pixels of this tree and the added pixels
+
+        Raises:
+            ValueError: if an added pixel overlaps with a pixel in the tree or another added pixel
+        """
+        orders, pixels = self._get_pixel_arrays(orders, pixels)
+        if len(orders) == 0:
+            return self
+        tree_order = max(self.tree_order, int(np.max(orders)))
+        shift = 2 * (tree_order - self.tree_order)
+        tree = self.tree << shift if shift > 0 else self.tree
+        new_intervals = np.empty((len(orders), 2), dtype=np.int64)
+        np.left_shift(pixels, 2 * (tree_order - orders), out=new_intervals[:, 0])
+        np.left_shift(pixels + 1, 2 * (tree_order - orders), out=new_intervals[:, 1])
+        sort_order = np.argsort(new_intervals[:, 0], kind="stable")
+        new_intervals = new_intervals[sort_order]
+        positions = np.searchsorted(tree[:, 0], new_intervals[:, 0])
+        # Each new pixel must end before the next pixel in the tree, and start after the previous one
+        next_starts = np.full(len(positions), np.iinfo(np.int64).max)
+        has_next = positions < len(tree)
+        next_starts[has_next] = tree[positions[has_next], 0]
+        previous_ends = np.zeros(len(positions), dtype=np.int64)
+        has_previous = positions > 0
+        previous_ends[has_previous] = tree[positions[has_previous] - 1, 1]
+        if (
+            np.any(new_intervals[:, 1] > next_starts)
+            or np.any(new_intervals[:, 0] < previous_ends)
+            or np.any(new_intervals[1:, 0] < new_intervals[:-1, 1])
+        ):
+            raise ValueError("Pixels to insert overlap with each other or with pixels in the tree")
+        new_pixels = np.column_stack((orders, pixels))[sort_order]
+        no_rows = np.empty(0, dtype=np.int64)
+        return PixelTree(
+            _splice_rows(tree, no_rows, positions, new_intervals),
+            tree_order,
+            pixels=_splice_rows(self.pixels, no_rows, positions, new_pixels),
+        )
+
+    def remove_pixels(self, orders: np.ndarray | int, pixels: np.ndarray) -> PixelTree:
+        """Creates a new tree without the given leaf nodes, without rebuilding the tree
+
+        Args:
+            orders (np.ndarray | int): HEALPix orders of the pixels to remove. May be a single order,
+                used for all pixels.
+            pixels (np.ndarray): HEALPix pixel numbers of the pixels to remove
+
+        Returns:
+            A new tree with the pixels of this tree other than the removed pixels
+
+        Raises:
+            ValueError: if a pixel to remove is not a leaf node of the tree
+        """
+        leaf_indexes = self._get_leaf_indexes(orders, pixels)
+        no_rows = np.empty(0, dtype=np.int64)
+        return PixelTree(
+            _splice_rows(self.tree, leaf_indexes, no_rows, np.empty((0, 2), dtype=np.int64)),
+            self.tree_order,
+            pixels=_splice_rows(self.pixels, leaf_indexes, no_rows, np.empty((0, 2), dtype=np.int64)),
+        )
+
+    def split_pixels(self, orders: np.ndarray | int, pixels: np.ndarray) -> PixelTree:
+        """Creates a new tree with each of the given leaf nodes replaced by its four children, without
+        rebuilding the tree
+
+        If any child is of a higher order than the tree, the new tree is at the order of the children.
+
+        Args:
+            orders (np.ndarray | int): HEALPix orders of the pixels to split. May be a single order,
+                used for all pixels.
+            pixels (np.ndarray): HEALPix pixel numbers of the pixels to split
+
+        Returns:
+            A new tree with the pixels of this tree, with the split pixels replaced by their children
+
+        Raises:
+            ValueError: if a pixel to split is not a leaf node of the tree, or is already at the
+                highest HEALPix order
+        """
+        leaf_indexes = self._get_leaf_indexes(orders, pixels)
+        if len(leaf_indexes) == 0:
+            return self
+        max_child_order = int(np.max(self.pixels[leaf_indexes, 0])) + 1
+        if max_child_order > SPATIAL_INDEX_ORDER:
+            raise ValueError(f"Cannot split pixels of order {SPATIAL_INDEX_ORDER}")
+        tree_order = max(self.tree_order, max_child_order)
+        shift = 2 * (tree_order - self.tree_order)
+        tree = self.tree << shift if shift > 0 else self.tree
+        # Each split pixel is replaced by the four quarters of its interval
+        parent_intervals = tree[leaf_indexes]
+        child_sizes = (parent_intervals[:, 1:] - parent_intervals[:, :1]) >> 2
+        child_starts = (parent_intervals[:, :1] + np.arange(4) * child_sizes).ravel()
+        child_intervals = np.column_stack((child_starts, child_starts + np.repeat(child_sizes, 4)))
+        parent_pixels = self.pixels[leaf_indexes]
+        child_pixels = np.column_stack(
+            (np.repeat(parent_pixels[:, 0] + 1, 4), ((parent_pixels[:, 1:] << 2) + np.arange(4)).ravel())
+        )
+        positions = np.repeat(leaf_indexes, 4)
+        return PixelTree(
+            _splice_rows(tree, leaf_indexes, positions, child_intervals),
+            tree_order,
+            pixels=_splice_rows(self.pixels, leaf_indexes, positions, child_pixels),
+        )
+
+    def _get_leaf_indexes(self, orders: np.ndarray | int, pixels: np.ndarray) -> np.ndarray:
+        """Finds the sorted indexes of the leaf nodes of the given pixels, which must be in the tree"""
+        orders, pixels = self._get_pixel_arrays(orders, pixels)
+        leaf_indexes = self.get_containing_leaf_indexes(orders, pixels)
+        is_leaf = leaf_indexes >= 0
+        is_leaf[is_leaf] = self.pixels[leaf_indexes[is_leaf], 0] == orders[is_leaf]
+        if not np.all(is_leaf):
+            raise ValueError("Pixels are not leaf nodes of the tree")
+        leaf_indexes = np.sort(leaf_indexes)
+        if np.any(leaf_indexes[1:] == leaf_indexes[:-1]):
+            raise ValueError("Pixels must not be repeated")
+        return leaf_indexes
+
+    @staticmethod
+    def _get_pixel_arrays(orders: np.ndarray | int, pixels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Broadcasts orders and pixels to one-dimensional int64 arrays of valid HEALPix pixels"""
+        orders, pixels = np.broadcast_arrays(
+            np.asarray(orders, dtype=np.int64), np.asarray(pixels, dtype=np.int64)
+        )
+        orders, pixels = orders.ravel(), pixels.ravel()
+        if np.any((orders < 0) | (orders > SPATIAL_INDEX_ORDER)):
+            raise ValueError(f"HEALPix orders must be between 0 and {SPATIAL_INDEX_ORDER}")
+        if np.any((pixels < 0) | (pixels >= 12 * (np.int64(1) << (2 * orders)))):
+            raise ValueError("HEALPix pixel numbers must be between 0 and 12 * 4 ** order")
+        return orders, pixels
+
     @classmethod
     def from_healpix(
         cls, healpix_pixels: Sequence[HealpixPixel | tuple[int, int]], tree_order=None
@@ -102,7 +359,9 @@ class PixelTree:
         """Build a tree from a list of constituent healpix pixels
 
         Args:
-            healpix_pixels: list of healpix pixels
+            healpix_pixels: list of healpix pixels, or a `PixelArray`. May also be an integer
+                numpy array of shape (n, 2) with a row of (order, pixel) for each healpix pixel.
+                Neither of these creates a `HealpixPixel` for each pixel.
             tree_order (int): (Default = None) order to generate the tree at. If None, will use the highest
                 order from input pixels
 
@@ -112,13 +371,174 @@ class PixelTree:
         if len(healpix_pixels) == 0:
             return PixelTree(np.empty((0, 2), dtype=np.int64), 0)
 
-        pixel_tuples = [get_healpix_tuple(p) for p in healpix_pixels]
-        pixel_array = np.array(pixel_tuples).T
-        orders = pixel_array[0]
-        pixels = pixel_array[1]
-        max_order = np.max(orders) if tree_order is None else tree_order
-        starts = pixels * 4 ** (max_order - orders)
-        ends = (pixels + 1) * 4 ** (max_order - orders)
-        result = np.vstack((starts, ends)).T
-        result.sort(axis=0)
+        if isinstance(healpix_pixels, PixelArray):
+            return cls.from_arrays(healpix_pixels.orders, healpix_pixels.pixels, tree_order=tree_order)
+        if isinstance(healpix_pixels, np.ndarray) and healpix_pixels.ndim == 2:
+            pixel_array = healpix_pixels.T
+        else:
+            pixel_tuples = [get_healpix_tuple(p) for p in healpix_pixels]
+            pixel_array = np.array(pixel_tuples).T
+        return cls.from_arrays(pixel_array[0], pixel_array[1], tree_order=tree_order)
+
+    @classmethod
+    def from_arrays(cls, orders: np.ndarray, pixels: np.ndarray, tree_order=None) -> PixelTree:
+        """Build a tree from arrays of the orders and pixel numbers of constituent healpix pixels
+
+        Args:
+            orders (np.ndarray): HEALPix orders of the leaf pixels
+            pixels (np.ndarray): HEALPix pixel numbers of the leaf pixels, at the
+                corresponding order in `orders`
+            tree_order (int): (Default = None) order to generate the tree at. If None, will use the highest
+                order from input pixels
+
+        Returns:
+            The pixel tree with the leaf pixels specified in the arrays
+        """
+        orders = np.asarray(orders, dtype=np.int64)
+        pixels = np.asarray(pixels, dtype=np.int64)
+        if orders.ndim != 1 or orders.shape != pixels.shape:
+            raise ValueError("orders and pixels must be one-dimensional arrays of the same length")
+        if len(orders) == 0:
+            return PixelTree(np.empty((0, 2), dtype=np.int64), 0)
+        max_order = int(np.max(orders)) if tree_order is None else tree_order
+        if np.min(orders) < 0 or np.max(orders) > max_order:
+            raise ValueError("pixel orders must be between 0 and the tree order")
+        d_order = 2 * (max_order - orders)
+        result = np.empty((len(orders), 2), dtype=np.int64)
+        np.left_shift(pixels, d_order, out=result[:, 0])
+        np.left_shift(pixels + 1, d_order, out=result[:, 1])
+        if np.any(result[1:, 0] < result[:-1, 0]):
+            result.sort(axis=0)
         return cls(result, max_order)
+
+    def write_to_file(
+        self, file_pointer: str | Path | UPath, checksum: bytes = b"", pixel_order: np.ndarray | None = None
+    ):
+        """Write the tree to a binary file, as the raw array of intervals after a fixed size header
+
+        Args:
+            file_pointer: location of the file to write
+            checksum (bytes): up to 16 bytes identifying the partition info the tree was built from,
+                which is checked when the file is read
+            pixel_order (np.ndarray | None): indexes into the tree of the pixels, in the order of the
+                list the tree was built from, so the list can be read back in its original order
+        """
+        if len(checksum) > 16:
+            raise ValueError("checksum must be at most 16 bytes")
+        if pixel_order is not None and len(pixel_order) != len(self.tree):
+            raise ValueError("pixel_order must have one index for each pixel in the tree")
+        num_ordered = 0 if pixel_order is None else len(pixel_order)
+        header = PIXEL_TREE_FILE_HEADER.pack(
+            PIXEL_TREE_FILE_MAGIC,
+            PIXEL_TREE_FILE_VERSION,
+            self.tree_order,
+            len(self.tree),
+            checksum,
+            num_ordered,
+        )
+        file_pointer = get_upath(file_pointer)
+        with file_pointer.open("wb") as _file:
+            _file.write(header)
+            _file.write(np.ascontiguousarray(self.tree, dtype="<i8").data)
+            if pixel_order is not None:
+                _file.write(np.ascontiguousarray(pixel_order, dtype="<i8").data)
+
+    @classmethod
+    def read_from_file(
+        cls, file_pointer: str | Path | UPath, checksum: bytes | None = None, return_pixel_order: bool = False
+    ) -> PixelTree | tuple[PixelTree, np.ndarray | None]:
+        """Read a tree from a binary file written by `write_to_file`
+
+        Local files are memory-mapped, so the intervals are not parsed or sorted, and are only read from
+        disk when they are used.
+
+        Args:
+            file_pointer: location of the file to read
+            checksum (bytes | None): if given, the checksum the file must have been written with
+            return_pixel_order (bool): if True, also return the pixel order stored in the file
+
+        Returns:
+            The pixel tree stored in the file. If `return_pixel_order` is True, a tuple of the tree
+            and the pixel order, which is None if the file has no pixel order.
+
+        Raises:
+            ValueError: if the file is not a pixel tree file, or the checksum does not match
+        """
+        file_pointer = get_upath(file_pointer)
+        with file_pointer.open("rb") as _file:
+            header = _file.read(PIXEL_TREE_FILE_HEADER.size)
+            if len(header) < PIXEL_TREE_FILE_HEADER.size:
+                raise ValueError(f"File is not a pixel tree file: {file_pointer}")
+            magic, version, order, num_intervals, file_checksum, num_ordered = PIXEL_TREE_FILE_HEADER.unpack(
+                header
+            )
+            if magic != PIXEL_TREE_FILE_MAGIC or version != PIXEL_TREE_FILE_VERSION:
+                raise ValueError(f"File is not a pixel tree file: {file_pointer}")
+            if checksum is not None and file_checksum != checksum.ljust(16, b"\0"):
+                raise ValueError(f"Pixel tree file does not match the expected checksum: {file_pointer}")
+            tree = _read_int64_array(file_pointer, _file, PIXEL_TREE_FILE_HEADER.size, (num_intervals, 2))
+            pixel_order = None
+            if return_pixel_order and num_ordered > 0:
+                pixel_order = _read_int64_array(
+                    file_pointer, _file, PIXEL_TREE_FILE_HEADER.size + num_intervals * 16, (num_ordered,)
+                )
+        pixel_tree = cls(tree, order)
+        return (pixel_tree, pixel_order) if return_pixel_order else pixel_tree
+
+
+def _read_int64_array(file_pointer: UPath, file, offset: int, shape: tuple) -> np.ndarray:
+    """Reads an array of little-endian int64 values at an offset of an open file, memory-mapping local
+    files and reading the bytes of remote ones"""
+    size = int(np.prod(shape))
+    if size == 0:
+        return np.empty(shape, dtype=np.int64)
+    if file_pointer.protocol in ("", "file", "local"):
+        array = np.memmap(file_pointer.path, dtype="<i8", mode="r", offset=offset, shape=shape)
+    else:
+        file.seek(offset)
+        array = np.frombuffer(file.read(size * 8), dtype="<i8").reshape(shape)
+    return np.asarray(array, dtype=np.int64)
+
+
+def _splice_rows(
+    array: np.ndarray, delete_indexes: np.ndarray, insert_positions: np.ndarray, insert_rows: np.ndarray
+) -> np.ndarray:
+    """Copies an array with some rows deleted and others inserted, without a mask over the whole array
+
+    The rows that are kept are copied in contiguous blocks, so this costs one copy of the array plus
+    work proportional to the number of deleted and inserted rows.
+
+    Args:
+        array (np.ndarray): the array to copy
+        delete_indexes (np.ndarray): sorted, unique indexes of the rows of `array` to delete
+        insert_positions (np.ndarray): sorted indexes of the rows of `array` that each inserted row is
+            placed before. Inserted rows are placed in the order given.
+        insert_rows (np.ndarray): the rows to insert
+
+    Returns:
+        A new array with the rows deleted and inserted
+    """
+    result = np.empty((len(array) - len(delete_indexes) + len(insert_rows),) + array.shape[1:], array.dtype)
+    # Each row moves back by the number of deleted rows before it, and forward by the inserted rows
+    insert_destinations = (
+        insert_positions
+        - np.searchsorted(delete_indexes, insert_positions)
+        + np.arange(len(insert_positions))
+    )
+    result[insert_destinations] = insert_rows
+    block_bounds = np.unique(
+        np.concatenate(([0, len(array)], delete_indexes, delete_indexes + 1, insert_positions))
+    )
+    block_starts, block_ends = block_bounds[:-1], block_bounds[1:]
+    kept_blocks = np.isin(block_starts, delete_indexes, invert=True)
+    block_starts, block_ends = block_starts[kept_blocks], block_ends[kept_blocks]
+    block_destinations = (
+        block_starts
+        - np.searchsorted(delete_indexes, block_starts)
+        + np.searchsorted(insert_positions, block_starts, side="right")
+    )
+    for start, end, destination in zip(
+        block_starts.tolist(), block_ends.tolist(), block_destinations.tolist()
+    ):
+        result[destination : destination + end - start] = array[start:end]
+    return result
@@ -1,4 +1,11 @@
+import shutil
+
+import pytest
+
+from hats.catalog import PartitionInfo
+from hats.io import paths
 from hats.loaders import read_hats
+from hats.pixel_tree.pixel_tree import PixelTree
 
 
 def test_read_hats_branches(
@@ -17,3 +24,37 @@ def test_read_hats_branches(
     read_hats(margin_catalog_path)
     read_hats(small_sky_source_dir)
     read_hats(test_data_dir / "square_map")
+
+
+@pytest.mark.parametrize("catalog_dir_name", ["small_sky_order1_dir", "small_sky_source_dir"])
+def test_read_hats_pixel_tree_file(tmp_path, catalog_dir_name, request):
+    catalog_dir = request.getfixturevalue(catalog_dir_name)
+    catalog_path = tmp_path / "catalog"
+    shutil.copytree(catalog_dir, catalog_path)
+    expected_pixels = read_hats(catalog_dir).get_healpix_pixels()
+    PartitionInfo.read_from_dir(catalog_path).write_to_file()
+
+    # The pixel tree is read from the file, and the partitions keep the order of the CSV file
+    catalog = read_hats(catalog_path)
+    assert catalog._pixel_tree is not None
+    assert catalog.get_healpix_pixels() == expected_pixels
+    assert (
+        catalog.pixel_tree.get_healpix_pixels()
+        == PixelTree.from_healpix(expected_pixels).get_healpix_pixels()
+    )
+    assert catalog.partition_info.catalog_base_dir == catalog_path
+    catalog.partition_info.write_to_file()
+    catalog.partition_info.write_to_metadata_files()
+    assert read_hats(catalog_path).get_healpix_pixels() == expected_pixels
+
+    # A pixel tree file that does not match the partition info is not used
+    PartitionInfo.from_healpix(expected_pixels[1:]).write_to_file(
+        catalog_path=catalog_path, write_pixel_tree=False
+    )
+    with pytest.warns(UserWarning, match="does not match"):
+        catalog = read_hats(catalog_path)
+    assert catalog._pixel_tree is None
+    assert catalog.get_healpix_pixels() == expected_pixels[1:]
+
+    paths.get_pixel_tree_pointer(catalog_path).unlink()
+    assert read_hats(catalog_path)._pixel_tree is None
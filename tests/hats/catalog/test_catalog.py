@@ -15,7 +15,7 @@ from hats.catalog.healpix_dataset.healpix_dataset import HealpixDataset
 from hats.io import paths
 from hats.io.file_io import read_fits_image
 from hats.loaders import read_hats
-from hats.pixel_math import HealpixPixel
+from hats.pixel_math import HealpixPixel, PixelArray, compute_spatial_index
 from hats.pixel_math.validators import ValidatorsErrors
 from hats.pixel_tree.pixel_tree import PixelTree
 
@@ -39,6 +39,34 @@ def test_partition_info_pixel_input_types(catalog_info, catalog_pixels):
         assert hp_pixel in catalog.pixel_tree
 
 
+def test_pixel_array_input(catalog_info, catalog_pixels):
+    pixel_array = PixelArray.from_healpix(catalog_pixels)
+    catalog = Catalog(catalog_info, pixel_array)
+    assert catalog.get_healpix_pixels() == catalog_pixels
+    np.testing.assert_array_equal(catalog.pixel_tree.tree, PixelTree.from_healpix(catalog_pixels).tree)
+    assert catalog.filter_from_pixel_list(pixel_array[:1]).get_healpix_pixels() == catalog_pixels[:1]
+
+
+def test_lazy_pixel_representations(catalog_info, catalog_pixels):
+    catalog = Catalog(catalog_info, catalog_pixels)
+    assert catalog._pixel_tree is None
+    assert catalog.get_healpix_pixels() == catalog_pixels
+    assert catalog._pixel_tree is None
+    tree = catalog.pixel_tree
+    assert catalog.pixel_tree is tree
+
+    filtered_catalog = catalog.filter_by_moc(tree.to_moc()).filter_by_moc(tree.to_moc())
+    assert filtered_catalog._partition_info is None
+    partition_info = filtered_catalog.partition_info
+    assert filtered_catalog.partition_info is partition_info
+    assert filtered_catalog.get_healpix_pixels() == filtered_catalog.pixel_tree.get_healpix_pixels()
+
+    tree_catalog = Catalog(catalog_info, tree)
+    assert tree_catalog.pixel_tree is tree
+    assert tree_catalog._partition_info is None
+    assert tree_catalog.get_healpix_pixels() == catalog_pixels
+
+
 def test_tree_pixel_input(catalog_info, catalog_pixels):
     tree = PixelTree.from_healpix(catalog_pixels)
     catalog = Catalog(catalog_info, tree)
@@ -213,6 +241,57 @@ def test_cone_filter_invalid_cone_center(small_sky_order1_catalog):
         small_sky_order1_catalog.filter_by_cone(0, 10, -1)
 
 
+def test_get_partitions_in_cones(small_sky_order1_catalog):
+    ra = np.array([315, 315, 0, 47.1])
+    dec = np.array([-66.443, -66.443, 0, 6])
+    radius = np.array([0.1, 30 * 3600, 0.1, 30 * 3600])
+    offsets, pixel_indexes = small_sky_order1_catalog.get_partitions_in_cones(ra, dec, radius)
+    assert len(offsets) == 5
+    pixels = small_sky_order1_catalog.pixel_tree.get_healpix_pixels()
+    for i in range(4):
+        expected = small_sky_order1_catalog.filter_by_cone(ra[i], dec[i], radius[i]).get_healpix_pixels()
+        assert pixels[pixel_indexes[offsets[i] : offsets[i + 1]]] == expected
+
+
+def test_get_partitions_in_cones_multiple_order(catalog_info):
+    catalog_pixel_list = [
+        HealpixPixel(6, 30),
+        HealpixPixel(7, 124),
+        HealpixPixel(7, 5000),
+    ]
+    catalog = Catalog(catalog_info, catalog_pixel_list)
+    offsets, pixel_indexes = catalog.get_partitions_in_cones([47.1, 47.1], [6, 6], 30 * 3600)
+    np.testing.assert_array_equal(offsets, [0, 2, 4])
+    assert catalog.pixel_tree.get_healpix_pixels()[pixel_indexes[:2]] == [
+        HealpixPixel(6, 30),
+        HealpixPixel(7, 124),
+    ]
+
+
+def test_get_partitions_in_cones_invalid(small_sky_order1_catalog):
+    with pytest.raises(ValueError, match=ValidatorsErrors.INVALID_DEC):
+        small_sky_order1_catalog.get_partitions_in_cones([0, 0], [10, -100], 0.1)
+    with pytest.raises(ValueError, match=ValidatorsErrors.INVALID_RADIUS):
+        small_sky_order1_catalog.get_partitions_in_cones([0, 0], [10, 10], [1, -1])
+
+
+def test_locate_partitions(small_sky_order1_catalog):
+    ra = np.array([315, 282, 0, 315])
+    dec = np.array([-66.443, -58, 0, -66.443])
+    leaf_indexes = small_sky_order1_catalog.locate_partitions(ra, dec)
+    pixels = small_sky_order1_catalog.pixel_tree.get_healpix_pixels()
+    assert leaf_indexes[2] == -1
+    assert pixels[leaf_indexes[[0, 1, 3]]] == [HealpixPixel(1, 44), HealpixPixel(1, 46), HealpixPixel(1, 44)]
+    np.testing.assert_array_equal(
+        small_sky_order1_catalog.locate_partitions(ra, dec, n_threads=2, chunk_size=3), leaf_indexes
+    )
+
+    spatial_index = compute_spatial_index(ra, dec)
+    np.testing.assert_array_equal(
+        small_sky_order1_catalog.locate_partitions_from_spatial_index(spatial_index), leaf_indexes
+    )
+
+
 def test_polygonal_filter(small_sky_order1_catalog):
     polygon_vertices = [(282, -58), (282, -55), (272, -55), (272, -58)]
     filtered_catalog = small_sky_order1_catalog.filter_by_polygon(polygon_vertices)
@@ -512,6 +591,19 @@ def test_generate_negative_tree_pixels_multi_order(small_sky_order1_catalog):
     assert negative_tree == expected_pixels
 
 
+def test_generate_negative_tree_pixels_empty_and_full(small_sky_order1_catalog):
+    """Test generate_negative_tree_pixels on catalogs covering none or all of the sky."""
+    small_sky_order1_catalog.pixel_tree = PixelTree.from_healpix([])
+    negative_tree = small_sky_order1_catalog.generate_negative_tree_pixels()
+    assert isinstance(negative_tree, PixelArray)
+    assert negative_tree == [HealpixPixel(0, i) for i in range(12)]
+
+    small_sky_order1_catalog.pixel_tree = PixelTree.from_healpix(
+        [HealpixPixel(1, i) for i in range(4)] + [HealpixPixel(0, i) for i in range(1, 12)]
+    )
+    assert len(small_sky_order1_catalog.generate_negative_tree_pixels()) == 0
+
+
 def test_catalog_len_is_undetermined(small_sky_order1_catalog):
     """Tests that catalogs modified by queries and spatial filters have an undetermined
     number of rows, case in which an error is thrown"""
@@ -1,12 +1,15 @@
 """Tests of partition info functionality"""
 
+import warnings
+
 import numpy.testing as npt
 import pandas as pd
 import pytest
 
 from hats.catalog import PartitionInfo
 from hats.io import paths
-from hats.pixel_math import HealpixPixel
+from hats.pixel_math import HealpixPixel, PixelArray
+from hats.pixel_tree.pixel_tree import PixelTree
 
 
 def test_load_partition_info_small_sky(small_sky_dir):
@@ -128,6 +131,83 @@ def test_write_to_file(tmp_path, small_sky_pixels):
     assert partition_info.get_healpix_pixels() == new_partition_info.get_healpix_pixels()
 
 
+def test_write_to_file_pixel_tree(tmp_path, small_sky_order1_pixels):
+    """Writing the partition info also writes the binary pixel tree, with the checksum of the CSV file."""
+    partition_info_pointer = paths.get_partition_info_pointer(tmp_path)
+    PartitionInfo.from_healpix(small_sky_order1_pixels).write_to_file(partition_info_pointer)
+
+    pixel_tree = PixelTree.read_from_file(
+        paths.get_pixel_tree_pointer(tmp_path), checksum=PartitionInfo.get_checksum(partition_info_pointer)
+    )
+    assert (
+        pixel_tree.get_healpix_pixels()
+        == PixelTree.from_healpix(small_sky_order1_pixels).get_healpix_pixels()
+    )
+
+    paths.get_pixel_tree_pointer(tmp_path).unlink()
+    PartitionInfo.from_healpix(small_sky_order1_pixels).write_to_file(
+        partition_info_pointer, write_pixel_tree=False
+    )
+    assert not paths.get_pixel_tree_pointer(tmp_path).exists()
+
+
+def test_write_to_file_overlapping_pixels(tmp_path):
+    """Pixels that do not form a valid tree are written to CSV, without the binary pixel tree."""
+    pixels = [HealpixPixel(0, 0), HealpixPixel(1, 0)]
+    PartitionInfo.from_healpix(pixels).write_to_file(catalog_path=tmp_path)
+
+    assert PartitionInfo.read_from_dir(tmp_path).get_healpix_pixels() == pixels
+    assert not paths.get_pixel_tree_pointer(tmp_path).exists()
+    assert PartitionInfo.read_from_pixel_tree_file(tmp_path) is None
+
+
+def test_write_to_file_custom_name_keeps_pixel_tree(tmp_path, small_sky_pixels, pixel_list_depth_first):
+    """Writing partitions to another CSV file does not replace the directory's binary pixel tree."""
+    PartitionInfo.from_healpix(small_sky_pixels).write_to_file(catalog_path=tmp_path)
+    pixel_tree_pointer = paths.get_pixel_tree_pointer(tmp_path)
+    pixel_tree_bytes = pixel_tree_pointer.read_bytes()
+
+    backup_file = tmp_path / "partition_info_backup.csv"
+    PartitionInfo.from_healpix(pixel_list_depth_first).write_to_file(backup_file)
+    assert PartitionInfo.read_from_csv(backup_file).get_healpix_pixels() == pixel_list_depth_first
+    assert pixel_tree_pointer.read_bytes() == pixel_tree_bytes
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        partition_info, _ = PartitionInfo.read_from_pixel_tree_file(tmp_path)
+    assert partition_info.get_healpix_pixels() == small_sky_pixels
+
+
+def test_read_from_pixel_tree_file(tmp_path, pixel_list_depth_first):
+    """The partitions read from the binary pixel tree keep the order of the CSV file."""
+    PartitionInfo.from_healpix(pixel_list_depth_first).write_to_file(catalog_path=tmp_path)
+
+    partition_info, pixel_tree = PartitionInfo.read_from_pixel_tree_file(tmp_path)
+    assert partition_info.get_healpix_pixels() == pixel_list_depth_first
+    assert partition_info.catalog_base_dir == tmp_path
+    assert (
+        pixel_tree.get_healpix_pixels() == PixelTree.from_healpix(pixel_list_depth_first).get_healpix_pixels()
+    )
+
+
+def test_pixel_array_partition_info(tmp_path, small_sky_pixels):
+    """Partition info read from csv is array-backed, and behaves the same as the list."""
+    partition_info_pointer = paths.get_partition_info_pointer(tmp_path)
+    PartitionInfo.from_healpix(small_sky_pixels).write_to_file(partition_info_pointer)
+
+    new_partition_info = PartitionInfo.read_from_csv(partition_info_pointer)
+    pixels = new_partition_info.get_healpix_pixels()
+    assert isinstance(pixels, PixelArray)
+    assert pixels == small_sky_pixels
+    assert new_partition_info.get_highest_order() == max(small_sky_pixels).order
+    assert new_partition_info.calculate_fractional_coverage() == pytest.approx(
+        PartitionInfo.from_healpix(small_sky_pixels).calculate_fractional_coverage()
+    )
+    pd.testing.assert_frame_equal(
+        new_partition_info.as_dataframe(), PartitionInfo.from_healpix(small_sky_pixels).as_dataframe()
+    )
+
+
 def test_write_to_file_sorted(tmp_path, pixel_list_depth_first, pixel_list_breadth_first):
     """Write out the partition info to file and make sure that it's sorted by breadth-first healpix,
     even though the original pixel list is in Norder-major sorting (depth-first)."""
@@ -1,7 +1,11 @@
 import numpy as np
 import numpy.testing as npt
 
-from hats.pixel_math.healpix_pixel_function import get_pixel_argsort, sort_pixels
+from hats.pixel_math.healpix_pixel_function import (
+    get_pixel_argsort,
+    sort_pixels,
+    split_ranges_into_intervals,
+)
 
 
 def test_get_pixel_argsort(pixel_list_depth_first, pixel_list_breadth_first):
@@ -39,3 +43,28 @@ def test_sort_pixels_empty():
 
     sort_result = sort_pixels(np.array([]))
     npt.assert_array_equal(sort_result, [])
+
+
+def test_split_ranges_into_intervals():
+    # At order 1: [1, 8) is pixels (1, 1), (1, 2), (1, 3), (0, 1), and [9, 10) is pixel (1, 9)
+    starts, ends, range_indexes = split_ranges_into_intervals(np.array([1, 9]), np.array([8, 10]), 1)
+    npt.assert_array_equal(starts, [1, 2, 3, 4, 9])
+    npt.assert_array_equal(ends, [2, 3, 4, 8, 10])
+    npt.assert_array_equal(range_indexes, [0, 0, 0, 0, 1])
+
+
+def test_split_ranges_into_intervals_spanning_order_0_pixels():
+    # No pixel is larger than an order 0 pixel, even where the range would fit a larger one
+    starts, ends, range_indexes = split_ranges_into_intervals(np.array([0]), np.array([48]), 1)
+    npt.assert_array_equal(starts, np.arange(0, 48, 4))
+    npt.assert_array_equal(ends, np.arange(4, 52, 4))
+    npt.assert_array_equal(range_indexes, np.zeros(12))
+
+    starts, ends, _ = split_ranges_into_intervals(np.array([0]), np.array([12]), 0)
+    npt.assert_array_equal(starts, np.arange(12))
+    npt.assert_array_equal(ends, np.arange(1, 13))
+
+
+def test_split_ranges_into_intervals_empty():
+    starts, ends, range_indexes = split_ranges_into_intervals(np.array([]), np.array([]), 3)
+    assert len(starts) == len(ends) == len(range_indexes) == 0
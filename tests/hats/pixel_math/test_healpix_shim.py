@@ -55,6 +55,18 @@ def test_ang2vec():
     assert_array_equal(actual, hps.ang2vec(ra, dec))
 
 
+def test_ang2vec_skycoord():
+    """Tests that the numpy conversion matches the astropy conversion"""
+    ra = np.array([-180.0, 0.0, 45.5, 230.14467816, 359.9])
+    dec = np.array([-90.0, 0.0, -28.6352765, 38.78080888, 90.0])
+    assert_allclose(hps.ang2vec(ra, dec), hps.ang2vec(ra, dec, frame="icrs"), rtol=0, atol=1e-15)
+
+    assert hps.ang2vec(10.0, 20.0).shape == (3,)
+
+    with pytest.raises(ValueError, match="Latitude"):
+        hps.ang2vec([10.0], [91.0])
+
+
 def test_npix2order():
     orders = [0, 1, 5, 10, 20, 29]
     npix = [12 * (4**order) for order in orders]
@@ -182,6 +194,48 @@ def test_radec2pix_lonlat_float32():
         assert np.all(pixels == expected_pixels)
 
 
+def test_radec2pix_native_matches_astropy():
+    """The native path for float64 arrays gives the same pixels as wrapping in astropy angles"""
+    rng = np.random.default_rng(seed=53)
+    ras = rng.uniform(-720.0, 720.0, size=1_000)
+    decs = rng.uniform(-90.0, 90.0, size=1_000)
+    decs[:2] = [-90.0, 90.0]
+    ras[:4] = [-180.0, -1e-17, 360.0, 540.0]
+    for order in [0, 1, 5, 10, 20, 29]:
+        pixels = hps.radec2pix(order, ras, decs)
+        assert pixels.dtype == np.int64
+        assert_array_equal(pixels, hps._radec2pix_astropy(order, ras, decs))
+        assert_array_equal(
+            hps.radec2pix(order, ras.reshape(10, 100), decs.reshape(10, 100)), pixels.reshape(10, 100)
+        )
+    # Longitudes already in [0, 360) are not wrapped
+    in_range_ras = rng.uniform(0.0, 360.0, size=1_000)
+    in_range_ras[0] = 0.0
+    for order in [0, 10, 29]:
+        assert_array_equal(
+            hps.radec2pix(order, in_range_ras, decs), hps._radec2pix_astropy(order, in_range_ras, decs)
+        )
+    assert len(hps.radec2pix(5, np.array([]), np.array([]))) == 0
+
+
+def test_radec2pix_out():
+    """Pixels can be written into a provided output array"""
+    ras = np.arange(-180.0, 180.0, 10.0)
+    decs = np.arange(-90.0, 90.0, 180 // len(ras))
+    expected_pixels = hps.radec2pix(10, ras, decs)
+
+    out = np.zeros(len(ras), dtype=np.int64)
+    assert hps.radec2pix(10, ras, decs, out=out) is out
+    assert_array_equal(out, expected_pixels)
+
+    out = np.zeros(len(ras), dtype=np.int64)
+    assert hps.radec2pix(10, list(ras), list(decs), out=out, num_threads=1) is out
+    assert_array_equal(out, expected_pixels)
+
+    with pytest.raises(ValueError, match="out must be"):
+        hps.radec2pix(10, ras, decs, out=np.zeros(len(ras), dtype=np.float64))
+
+
 def test_radec2pix_invalid():
     orders = [0, 1, 5, 10, 20, 29]
     invalid_orders = [-1000, -1, 30, 40]
@@ -193,3 +247,5 @@ def test_radec2pix_invalid():
     for order in orders:
         with pytest.raises(ValueError, match="angle"):
             hps.radec2pix(order, ras, decs)
+        with pytest.raises(ValueError, match="angle"):
+            hps.radec2pix(order, list(ras), list(decs))
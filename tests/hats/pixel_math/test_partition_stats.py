@@ -3,10 +3,13 @@
 import numpy as np
 import numpy.testing as npt
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 import hats.pixel_math as hist
 import hats.pixel_math.healpix_shim as hp
+from hats.pixel_math import partition_stats
+from hats.pixel_math.sparse_histogram import SparseHistogram
 
 
 def test_small_sky_same_pixel():
@@ -195,3 +198,191 @@ def test_alignment_even_sky(drop_empty_siblings):
     # everything maps to order 7 (would be 5, but lowest of 7 is enforced)
     for mapping in result:
         assert mapping[0] == 7
+
+
+@pytest.mark.parametrize("lowest_order", [0, 2])
+def test_nested_sums_match_per_pixel_rollup(lowest_order):
+    """Vectorized rollup of lower order sums agrees with a per-pixel parent accumulation."""
+    highest_order = 4
+    rng = np.random.default_rng(seed=53)
+    initial_histogram = rng.integers(0, 50, size=hp.order2npix(highest_order), dtype=np.int64)
+    initial_histogram[rng.random(hp.order2npix(highest_order)) < 0.6] = 0
+
+    expected = [hist.empty_histogram(i) for i in range(0, highest_order)] + [initial_histogram]
+    for read_order in range(highest_order, lowest_order, -1):
+        for index, count in enumerate(expected[read_order]):
+            expected[read_order - 1][index >> 2] += count
+
+    result = partition_stats._get_nested_sums(initial_histogram, highest_order, lowest_order)
+    assert len(result) == highest_order + 1
+    for order in range(0, highest_order + 1):
+        npt.assert_array_equal(result[order], expected[order])
+
+
+@pytest.mark.parametrize("drop_empty_siblings", [True, False])
+def test_alignment_arrays_small_sky_order2(drop_empty_siblings):
+    """Create alignment as parallel arrays from small sky's distribution at order 2"""
+    initial_histogram = hist.empty_histogram(2)
+    filled_pixels = [4, 11, 14, 13, 5, 7, 8, 9, 11, 23, 4, 4, 17, 0, 1, 0]
+    initial_histogram[176:] = filled_pixels[:]
+    orders, pixels, counts = hist.generate_alignment(
+        initial_histogram,
+        highest_order=2,
+        threshold=250,
+        drop_empty_siblings=drop_empty_siblings,
+        return_arrays=True,
+    )
+
+    for result in [orders, pixels, counts]:
+        assert result.dtype == np.int64
+        assert len(result) == hp.order2npix(2)
+
+    expected_orders = np.full(hp.order2npix(2), -1)
+    expected_orders[176:] = 0
+    expected_pixels = np.full(hp.order2npix(2), -1)
+    expected_pixels[176:] = 11
+    expected_counts = np.zeros(hp.order2npix(2))
+    expected_counts[176:] = 131
+    npt.assert_array_equal(orders, expected_orders)
+    npt.assert_array_equal(pixels, expected_pixels)
+    npt.assert_array_equal(counts, expected_counts)
+
+
+@pytest.mark.parametrize("drop_empty_siblings", [True, False])
+def test_alignment_arrays_match_tuples(drop_empty_siblings):
+    """The parallel array form of the alignment holds the same values as the tuple form."""
+    rng = np.random.default_rng(seed=53)
+    initial_histogram = rng.integers(0, 50, size=hp.order2npix(4), dtype=np.int64)
+    initial_histogram[rng.random(hp.order2npix(4)) < 0.8] = 0
+
+    kwargs = {"highest_order": 4, "threshold": 500, "drop_empty_siblings": drop_empty_siblings}
+    tuples = hist.generate_alignment(initial_histogram, **kwargs)
+    orders, pixels, counts = hist.generate_alignment(initial_histogram, return_arrays=True, **kwargs)
+
+    for index, mapping in enumerate(tuples):
+        if mapping is None:
+            assert (orders[index], pixels[index], counts[index]) == (-1, -1, 0)
+        else:
+            assert (orders[index], pixels[index], counts[index]) == mapping
+
+
+def test_alignment_isolated_pixels_empty_siblings():
+    """Isolated pixels keep their high order, while their non-empty neighbors collapse."""
+    initial_histogram = hist.empty_histogram(3)
+    initial_histogram[5] = 10
+    initial_histogram[704:708] = [1, 2, 3, 4]
+    result = hist.generate_alignment(
+        initial_histogram, highest_order=3, threshold=250, drop_empty_siblings=True
+    )
+
+    expected = np.full(hp.order2npix(3), None)
+    expected[5] = (3, 5, 10)
+    expected[704:708] = [(2, 176, 10)] * 4
+
+    npt.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("drop_empty_siblings", [True, False])
+def test_sparse_alignment_small_sky_order2(drop_empty_siblings):
+    """Create sparse alignment from small sky's distribution at order 2"""
+    filled_pixels = [4, 11, 14, 13, 5, 7, 8, 9, 11, 23, 4, 4, 17, 0, 1, 0]
+    indexes = np.nonzero(filled_pixels)[0] + 176
+    counts = np.array(filled_pixels)[indexes - 176]
+    histogram = SparseHistogram.make_from_counts(indexes, counts, 2)
+
+    pixels, orders, destination_pixels, destination_counts = hist.generate_sparse_alignment(
+        histogram, highest_order=2, threshold=250, drop_empty_siblings=drop_empty_siblings
+    )
+
+    npt.assert_array_equal(pixels, indexes)
+    npt.assert_array_equal(orders, np.zeros(len(indexes)))
+    npt.assert_array_equal(destination_pixels, np.full(len(indexes), 11))
+    npt.assert_array_equal(destination_counts, np.full(len(indexes), 131))
+
+
+@pytest.mark.parametrize("drop_empty_siblings", [True, False])
+@pytest.mark.parametrize("lowest_order", [0, 3])
+def test_sparse_alignment_matches_dense(drop_empty_siblings, lowest_order):
+    """The sparse alignment agrees with the dense alignment at all non-empty pixels."""
+    rng = np.random.default_rng(seed=53)
+    initial_histogram = rng.integers(0, 50, size=hp.order2npix(5), dtype=np.int64)
+    initial_histogram[rng.random(hp.order2npix(5)) < 0.9] = 0
+    (non_empty,) = np.nonzero(initial_histogram)
+
+    kwargs = {
+        "highest_order": 5,
+        "lowest_order": lowest_order,
+        "threshold": 400,
+        "drop_empty_siblings": drop_empty_siblings,
+    }
+    orders, pixels, counts = hist.generate_alignment(initial_histogram, return_arrays=True, **kwargs)
+    result = hist.generate_sparse_alignment((non_empty, initial_histogram[non_empty]), **kwargs)
+
+    npt.assert_array_equal(result[0], non_empty)
+    npt.assert_array_equal(result[1], orders[non_empty])
+    npt.assert_array_equal(result[2], pixels[non_empty])
+    npt.assert_array_equal(result[3], counts[non_empty])
+
+
+def test_sparse_alignment_unsorted_arrays():
+    """Unsorted, repeated pixels are summed before partitioning."""
+    result = hist.generate_sparse_alignment(([47, 44, 47, 45], [10, 20, 5, 0]), highest_order=1, threshold=30)
+
+    npt.assert_array_equal(result[0], [44, 47])
+    npt.assert_array_equal(result[1], [1, 1])
+    npt.assert_array_equal(result[2], [44, 47])
+    npt.assert_array_equal(result[3], [20, 15])
+
+
+def test_sparse_alignment_errors():
+    """Check that the sparse alignment raises the same errors as the dense alignment."""
+    with pytest.raises(ValueError, match="histogram is not the right size"):
+        hist.generate_sparse_alignment(SparseHistogram.make_from_counts([11], [131], 0), highest_order=1)
+    with pytest.raises(ValueError, match="histogram is not the right size"):
+        hist.generate_sparse_alignment(([12], [131]), highest_order=0)
+    with pytest.raises(ValueError, match="histogram is not the right size"):
+        hist.generate_sparse_alignment(([5, -3], [1, 1]), highest_order=1, threshold=10)
+    with pytest.raises(ValueError, match="same length"):
+        hist.generate_sparse_alignment(([11], [131, 4]), highest_order=0)
+    with pytest.raises(ValueError, match="lowest_order"):
+        hist.generate_sparse_alignment(([11], [131]), highest_order=0, lowest_order=1)
+    with pytest.raises(ValueError, match="exceeds threshold"):
+        hist.generate_sparse_alignment(([11], [131]), highest_order=0, threshold=20)
+
+
+def test_sparse_alignment_empty():
+    """An empty histogram has an empty alignment."""
+    result = hist.generate_sparse_alignment(SparseHistogram.make_empty(3), highest_order=3)
+    assert len(result) == 4
+    for array in result:
+        assert len(array) == 0
+        assert array.dtype == np.int64
+
+
+@pytest.mark.parametrize("sparse", [True, False])
+def test_histogram_from_batches(sparse):
+    """Streaming batches of arrow data and arrays gives the same counts as the full data frame."""
+    rng = np.random.default_rng(seed=53)
+    data = pd.DataFrame(
+        {"ra_mean": rng.uniform(0, 360, size=1_000), "dec_mean": rng.uniform(-90, 90, size=1_000)}
+    )
+    expected = hist.generate_histogram(data, highest_order=3, ra_column="ra_mean", dec_column="dec_mean")
+
+    table = pa.Table.from_pandas(data)
+    batches = [*table.to_batches(max_chunksize=50), table.slice(0, 0), table.slice(0, 100)]
+    batches.append((data["ra_mean"].values[100:], data["dec_mean"].values[100:]))
+    result = hist.generate_histogram_from_batches(
+        iter(batches), highest_order=3, ra_column="ra_mean", dec_column="dec_mean", sparse=sparse
+    )
+
+    if sparse:
+        assert isinstance(result, SparseHistogram)
+        result = result.to_array()
+    npt.assert_array_equal(result, expected * 2)
+
+
+def test_histogram_from_batches_column_names_error():
+    """Test with non-default column names (without specifying column names)"""
+    batch = pa.RecordBatch.from_pydict({"ra_mean": [282.5, 299.5], "dec_mean": [-58.5, -48.5]})
+    with pytest.raises(ValueError, match="Invalid column names"):
+        hist.generate_histogram_from_batches([batch], highest_order=0)
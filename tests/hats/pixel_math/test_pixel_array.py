@@ -0,0 +1,53 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from hats.pixel_math import HealpixPixel, PixelArray
+
+
+def test_pixel_array_sequence(pixel_list_breadth_first):
+    pixel_array = PixelArray.from_healpix(pixel_list_breadth_first)
+    assert len(pixel_array) == len(pixel_list_breadth_first)
+    assert pixel_array == pixel_list_breadth_first
+    assert list(pixel_array) == pixel_list_breadth_first
+    assert pixel_array[0] == pixel_list_breadth_first[0]
+    assert pixel_array[-1] == pixel_list_breadth_first[-1]
+    assert isinstance(pixel_array[np.int64(1)], HealpixPixel)
+    assert pixel_array[1:4] == pixel_list_breadth_first[1:4]
+    assert isinstance(pixel_array[1:4], PixelArray)
+    assert pixel_array.index(pixel_list_breadth_first[2]) == 2
+    assert pixel_list_breadth_first[3] in pixel_array
+    assert (pixel_list_breadth_first[3].order, pixel_list_breadth_first[3].pixel) in pixel_array
+    assert HealpixPixel(5, 5) not in pixel_array
+    assert "not a pixel" not in pixel_array
+    assert pixel_array != pixel_list_breadth_first[:-1]
+    assert sorted(pixel_array) == sorted(pixel_list_breadth_first)
+    npt.assert_array_equal(pixel_array, pixel_list_breadth_first)
+
+
+def test_pixel_array_from_healpix(pixel_list_depth_first):
+    pixel_array = PixelArray.from_healpix(pixel_list_depth_first)
+    npt.assert_array_equal(pixel_array.orders, [p.order for p in pixel_list_depth_first])
+    npt.assert_array_equal(pixel_array.pixels, [p.pixel for p in pixel_list_depth_first])
+    assert pixel_array.orders.dtype == np.int64
+    assert PixelArray.from_healpix(pixel_array) is pixel_array
+    assert PixelArray.from_healpix([(0, 11), (1, 2)]) == [HealpixPixel(0, 11), HealpixPixel(1, 2)]
+    assert len(PixelArray.from_healpix([])) == 0
+
+
+def test_pixel_array_add(pixel_list_depth_first):
+    pixel_array = PixelArray.from_healpix(pixel_list_depth_first[:3])
+    assert pixel_array + pixel_list_depth_first[3:] == pixel_list_depth_first
+    assert pixel_list_depth_first[:3] + PixelArray.from_healpix(pixel_list_depth_first[3:]) == (
+        pixel_list_depth_first
+    )
+    assert isinstance(pixel_array + pixel_array, PixelArray)
+
+
+def test_pixel_array_invalid():
+    with pytest.raises(ValueError, match="same length"):
+        PixelArray(np.array([0, 1]), np.array([0]))
+    with pytest.raises(ValueError, match="greater than"):
+        PixelArray(np.array([30]), np.array([0]))
+    with pytest.raises(TypeError):
+        PixelArray.from_healpix(["not a pixel"])
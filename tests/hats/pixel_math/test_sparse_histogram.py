@@ -4,10 +4,10 @@ import numpy as np
 import numpy.testing as npt
 import pytest
 from numpy import frombuffer
-from scipy.sparse import csr_array
+from scipy.sparse import csc_array, csr_array, load_npz, save_npz
 
 import hats.pixel_math.healpix_shim as hp
-from hats.pixel_math.sparse_histogram import SparseHistogram
+from hats.pixel_math.sparse_histogram import SparseHistogram, merge_histogram_files
 
 
 def test_make_empty():
@@ -70,11 +70,155 @@ def test_add_different_type():
 
 
 def test_init_bad_inputs():
-    """Test that the SparseHistogram type requires a compressed sparse column
-    as its sole `sparse_array` argument."""
-    with pytest.raises(ValueError, match="must be a scipy sparse array"):
-        SparseHistogram(5)
-
-    with pytest.raises(ValueError, match="must be a Compressed Sparse Column"):
-        row_sparse_array = csr_array((1, 12), dtype=np.int64)
-        SparseHistogram(row_sparse_array)
+    """Test that the SparseHistogram type requires sorted, unique indexes,
+    with a count for each index."""
+    with pytest.raises(ValueError, match="same length"):
+        SparseHistogram([1, 2], [5], 0)
+
+    with pytest.raises(ValueError, match="sorted and unique"):
+        SparseHistogram([2, 1], [5, 5], 0)
+
+    with pytest.raises(ValueError, match="sorted and unique"):
+        SparseHistogram([1, 1], [5, 5], 0)
+
+    with pytest.raises(ValueError, match="valid pixels"):
+        SparseHistogram([1, 12], [5, 5], 0)
+
+
+def test_from_sparse_array():
+    """Test that histograms can still be created from scipy sparse arrays, as they were previously
+    stored, with a deprecation warning when passed to the constructor."""
+    sparse_array = csc_array(([4, 131], ([0, 0], [1, 11])), shape=(1, 12))
+    histogram = SparseHistogram.from_sparse_array(sparse_array)
+    npt.assert_array_equal(histogram.indexes, [1, 11])
+    npt.assert_array_equal(histogram.counts, [4, 131])
+    assert histogram.order == 0
+
+    with pytest.warns(DeprecationWarning, match="from_sparse_array"):
+        histogram = SparseHistogram(csr_array(sparse_array))
+    npt.assert_array_equal(histogram.to_array(), sparse_array.toarray()[0])
+
+    with pytest.warns(DeprecationWarning, match="sparse_array is deprecated"):
+        npt.assert_array_equal(histogram.sparse_array.toarray(), sparse_array.toarray())
+
+    with pytest.raises(ValueError, match="scipy sparse array"):
+        SparseHistogram.from_sparse_array(np.zeros((1, 12)))
+    with pytest.raises(ValueError, match="single row"):
+        SparseHistogram.from_sparse_array(csc_array((2, 12), dtype=np.int64))
+
+
+def test_make_from_counts_unsorted():
+    """Test that counts at unsorted and repeated indexes are summed."""
+    histogram = SparseHistogram.make_from_counts([11, 1, 11, 4], [3, 4, 128, 0], 0)
+    npt.assert_array_equal(histogram.indexes, [1, 11])
+    npt.assert_array_equal(histogram.counts, [4, 131])
+    expected = [0, 4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 131]
+    npt.assert_array_equal(histogram.to_array(), expected)
+
+
+def test_read_legacy_file(tmp_path):
+    """Test that we can read histogram files that were saved as scipy sparse arrays."""
+    file_name = tmp_path / "legacy_sparse.npz"
+    row = np.zeros(2, dtype=np.int64)
+    save_npz(file_name, csc_array(([4, 131], (row, [1, 11])), shape=(1, hp.order2npix(0))))
+
+    read_histogram = SparseHistogram.from_file(file_name)
+    assert read_histogram.order == 0
+    expected = [0, 4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 131]
+    npt.assert_array_equal(read_histogram.to_array(), expected)
+
+    file_name = tmp_path / "legacy_sparse_row.npz"
+    save_npz(file_name, csr_array(([4, 131], (row, [1, 11])), shape=(1, hp.order2npix(0))))
+    read_histogram = SparseHistogram.from_file(file_name)
+    npt.assert_array_equal(read_histogram.to_array(), expected)
+
+
+def test_written_file_is_scipy_readable(tmp_path):
+    """Test that histogram files can still be read as scipy sparse arrays."""
+    histogram = SparseHistogram.make_from_counts([1, 11], [4, 131], 0)
+    file_name = tmp_path / "round_trip_sparse.npz"
+    histogram.to_file(file_name)
+
+    sparse_array = load_npz(file_name)
+    assert sparse_array.shape == (1, 12)
+    npt.assert_array_equal(sparse_array.toarray()[0], histogram.to_array())
+
+
+def test_read_not_histogram(tmp_path):
+    """Test that we raise a helpful error for npz files without a sparse array."""
+    file_name = tmp_path / "not_sparse.npz"
+    np.savez(file_name, data=[1, 2, 3])
+    with pytest.raises(ValueError, match="does not contain a sparse histogram"):
+        SparseHistogram.from_file(file_name)
+
+
+def test_merge_many():
+    """Test that we can sum many histograms in one merge, and get the same result as
+    adding them one at a time."""
+    rng = np.random.default_rng(seed=53)
+    partials = []
+    for _ in range(20):
+        indexes = rng.choice(hp.order2npix(2), size=rng.integers(0, 30), replace=False)
+        partials.append(SparseHistogram.make_from_counts(indexes, rng.integers(1, 100, len(indexes)), 2))
+
+    merged = SparseHistogram.merge_many(partials)
+
+    total = SparseHistogram.make_empty(2)
+    for partial in partials:
+        total.add(partial)
+    npt.assert_array_equal(merged.indexes, total.indexes)
+    npt.assert_array_equal(merged.counts, total.counts)
+    npt.assert_array_equal(merged.to_array(), np.sum([partial.to_array() for partial in partials], axis=0))
+
+
+def test_merge_many_bad_inputs():
+    """Test that we can NOT merge histograms of different orders, or non-histograms."""
+    with pytest.raises(ValueError, match="At least one"):
+        SparseHistogram.merge_many([])
+
+    with pytest.raises(ValueError, match="addends should be SparseHistogram"):
+        SparseHistogram.merge_many([SparseHistogram.make_empty(0), 5])
+
+    with pytest.raises(ValueError, match="partials have incompatible sizes"):
+        SparseHistogram.merge_many([SparseHistogram.make_empty(0), SparseHistogram.make_empty(1)])
+
+
+def test_get_nonzero():
+    """Test that we can fetch the non-zero pixels and counts, in pixel order."""
+    histogram = SparseHistogram.make_from_counts([11, 8, 1], [131, 9, 0], 0)
+    assert histogram.order == 0
+    indexes, counts = histogram.get_nonzero()
+    npt.assert_array_equal(indexes, [8, 11])
+    npt.assert_array_equal(counts, [9, 131])
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_merge_histogram_files(tmp_path, use_processes):
+    """Test that we can read and sum many histogram files, and get the same result as
+    adding them one at a time."""
+    rng = np.random.default_rng(seed=53)
+    file_names = []
+    total = SparseHistogram.make_empty(3)
+    for index in range(11):
+        indexes = rng.choice(hp.order2npix(3), size=rng.integers(0, 50), replace=False)
+        partial = SparseHistogram.make_from_counts(indexes, rng.integers(1, 100, len(indexes)), 3)
+        file_name = tmp_path / f"partial_{index}.npz"
+        partial.to_file(file_name)
+        file_names.append(file_name)
+        total.add(partial)
+
+    merged = merge_histogram_files(file_names, max_workers=2, use_processes=use_processes, files_per_task=2)
+    npt.assert_array_equal(merged.indexes, total.indexes)
+    npt.assert_array_equal(merged.counts, total.counts)
+
+    merged = merge_histogram_files(file_names[:1])
+    npt.assert_array_equal(merged.to_array(), SparseHistogram.from_file(file_names[0]).to_array())
+
+
+def test_merge_histogram_files_bad_inputs():
+    """Test that we require some files to merge."""
+    with pytest.raises(ValueError, match="At least one"):
+        merge_histogram_files([])
+
+    with pytest.raises(ValueError, match="files_per_task"):
+        merge_histogram_files(["file.npz"], files_per_task=0)
@@ -71,6 +71,32 @@ def test_load():
     assert len(result) == test_num
 
 
+@pytest.mark.parametrize("n_threads,chunk_size", [(3, 1_000), (None, 999), (2, None)])
+def test_chunked(n_threads, chunk_size):
+    """Computing the index in chunks, on a thread pool, gives the same result as a single call."""
+    rng = np.random.default_rng(seed=800)
+    test_num = 10_000
+
+    ra_arr = rng.uniform(0, 360, test_num)
+    dec_arr = rng.uniform(-90, 90, test_num)
+    result = compute_spatial_index(ra_arr, dec_arr, n_threads=n_threads, chunk_size=chunk_size)
+
+    assert result.dtype == np.int64
+    npt.assert_array_equal(result, compute_spatial_index(ra_arr, dec_arr))
+
+    result = compute_spatial_index(list(ra_arr[:10]), list(dec_arr[:10]), n_threads=2, chunk_size=3)
+    npt.assert_array_equal(result, compute_spatial_index(ra_arr[:10], dec_arr[:10]))
+
+
+def test_chunked_errors():
+    """Invalid inputs raise errors from the chunked computation."""
+    with pytest.raises(ValueError, match="angle"):
+        compute_spatial_index([5, 1, 5], [5, 100, 5], n_threads=2, chunk_size=1)
+
+    with pytest.raises(ValueError, match="chunk_size"):
+        compute_spatial_index([5, 1, 5], [5, 1, 5], chunk_size=0)
+
+
 def test_spatial_index_to_healpix():
     """Test the inverse operation"""
     ids = [
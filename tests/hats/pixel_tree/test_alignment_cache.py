@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from hats.catalog import Catalog
+from hats.pixel_math import HealpixPixel
+from hats.pixel_tree.alignment_cache import ALIGNMENT_CACHE, AlignmentCache
+from hats.pixel_tree.pixel_alignment import PixelAlignment, align_with_mocs
+from hats.pixel_tree.pixel_tree import PixelTree
+
+
+def test_tree_fingerprint(pixel_tree_2, pixel_tree_3):
+    assert (
+        pixel_tree_2.fingerprint()
+        == PixelTree(pixel_tree_2.tree.copy(), pixel_tree_2.tree_order).fingerprint()
+    )
+    assert pixel_tree_2.fingerprint() != pixel_tree_3.fingerprint()
+    assert (
+        pixel_tree_2.fingerprint() != PixelTree(pixel_tree_2.tree, pixel_tree_2.tree_order + 1).fingerprint()
+    )
+
+
+def test_tree_mutators_return_new_trees(pixel_tree_2, pixel_tree_3):
+    cache = AlignmentCache()
+    alignment = cache.align_with_mocs(pixel_tree_2, pixel_tree_3, None, None)
+    fingerprint = pixel_tree_2.fingerprint()
+    intervals = pixel_tree_2.tree.copy()
+    leaf = pixel_tree_2.get_healpix_pixels()[0]
+
+    removed = pixel_tree_2.remove_pixels(leaf.order, [leaf.pixel])
+    inserted = removed.insert_pixels(leaf.order, [leaf.pixel])
+    split = pixel_tree_2.split_pixels(leaf.order, [leaf.pixel])
+    for tree in [removed, inserted, split]:
+        assert tree is not pixel_tree_2
+    np.testing.assert_array_equal(pixel_tree_2.tree, intervals)
+    assert pixel_tree_2.fingerprint() == fingerprint
+    assert inserted.fingerprint() == fingerprint
+    assert removed.fingerprint() != fingerprint
+    assert split.fingerprint() != fingerprint
+
+    assert cache.align_with_mocs(inserted, pixel_tree_3, None, None) is alignment
+    split_alignment = cache.align_with_mocs(split, pixel_tree_3, None, None)
+    assert split_alignment is not alignment
+    np.testing.assert_array_equal(
+        split_alignment.pixel_tree.tree, align_with_mocs(split, pixel_tree_3, None, None).pixel_tree.tree
+    )
+
+
+def test_alignment_cache_hits(pixel_tree_2, pixel_tree_3):
+    cache = AlignmentCache()
+    alignment = cache.align_with_mocs(pixel_tree_2, pixel_tree_3, None, None)
+    assert (cache.hits, cache.misses) == (0, 1)
+    expected = align_with_mocs(pixel_tree_2, pixel_tree_3, None, None)
+    np.testing.assert_array_equal(alignment.pixel_tree.tree, expected.pixel_tree.tree)
+
+    tree_copy = PixelTree(pixel_tree_3.tree.copy(), pixel_tree_3.tree_order)
+    assert cache.align_with_mocs(pixel_tree_2, tree_copy, None, None, "inner") is alignment
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert cache.align_with_mocs(pixel_tree_2, pixel_tree_3, None, None, "outer") is not alignment
+    moc = PixelTree.from_healpix([HealpixPixel(0, 4)]).to_moc()
+    assert cache.align_with_mocs(pixel_tree_2, pixel_tree_3, moc, None) is not alignment
+    assert cache.align_with_mocs(pixel_tree_3, pixel_tree_2, None, None) is not alignment
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert len(cache) == 4
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_alignment_cache_evicts_least_recently_used(pixel_tree_1, pixel_tree_2, pixel_tree_3):
+    cache = AlignmentCache(maxsize=2)
+    first = cache.align_with_mocs(pixel_tree_1, pixel_tree_2, None, None)
+    cache.align_with_mocs(pixel_tree_1, pixel_tree_3, None, None)
+    assert cache.align_with_mocs(pixel_tree_1, pixel_tree_2, None, None) is first
+    cache.align_with_mocs(pixel_tree_2, pixel_tree_3, None, None)
+    assert len(cache) == 2
+    assert cache.align_with_mocs(pixel_tree_1, pixel_tree_2, None, None) is first
+    cache.align_with_mocs(pixel_tree_1, pixel_tree_3, None, None)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    no_cache = AlignmentCache(maxsize=0)
+    no_cache.align_with_mocs(pixel_tree_1, pixel_tree_2, None, None)
+    no_cache.align_with_mocs(pixel_tree_1, pixel_tree_2, None, None)
+    assert len(no_cache) == 0
+    assert no_cache.misses == 2
+
+
+def test_cached_alignment_is_read_only(pixel_tree_2, pixel_tree_3):
+    cache = AlignmentCache()
+    alignment = cache.align_with_mocs(pixel_tree_2, pixel_tree_3, None, None)
+    assert not alignment.pixel_tree.tree.flags.writeable
+    assert not alignment.pixel_tree.pixels.flags.writeable
+    for values in alignment.pixel_mapping_arrays.values():
+        assert not values.flags.writeable
+    with pytest.raises(ValueError):
+        alignment.pixel_mapping_arrays[PixelAlignment.PRIMARY_PIXEL_COLUMN_NAME][0] = 0
+    with pytest.raises(ValueError):
+        alignment.pixel_mapping.iloc[0, 0] = 0
+    assert cache.align_with_mocs(pixel_tree_2, pixel_tree_3, None, None) is alignment
+
+    uncached = AlignmentCache(maxsize=0).align_with_mocs(pixel_tree_2, pixel_tree_3, None, None)
+    assert uncached.pixel_tree.tree.flags.writeable
+
+
+def test_catalog_align_cache_is_opt_in(pixel_tree_2, pixel_tree_3, catalog_info):
+    ALIGNMENT_CACHE.clear()
+    left_cat = Catalog(catalog_info, pixel_tree_2)
+    right_cat = Catalog(catalog_info, pixel_tree_3)
+    alignment = left_cat.align(right_cat)
+    assert left_cat.align(right_cat) is not alignment
+    assert (ALIGNMENT_CACHE.hits, ALIGNMENT_CACHE.misses) == (0, 0)
+
+    alignment = left_cat.align(right_cat, use_cache=True)
+    assert Catalog(catalog_info, pixel_tree_2).align(Catalog(catalog_info, pixel_tree_3), use_cache=True) is (
+        alignment
+    )
+    assert (ALIGNMENT_CACHE.hits, ALIGNMENT_CACHE.misses) == (1, 1)
+    ALIGNMENT_CACHE.clear()
@@ -0,0 +1,33 @@
+import numpy as np
+
+from hats.pixel_math import HealpixPixel
+from hats.pixel_tree.cone_filter import get_cone_partition_indexes
+from hats.pixel_tree.pixel_tree import PixelTree
+
+
+def test_cone_partition_indexes(pixel_tree_2):
+    offsets, pixel_indexes = get_cone_partition_indexes(
+        pixel_tree_2, [315, 0, 315], [-66.443, 0, -66.443], [0.1, 0.1, 30 * 3600]
+    )
+    np.testing.assert_array_equal(offsets, [0, 1, 1, len(pixel_indexes)])
+    pixels = pixel_tree_2.get_healpix_pixels()
+    assert pixels[pixel_indexes[0]] == HealpixPixel(1, 44)
+    cone_pixels = pixels[pixel_indexes[offsets[2] :]]
+    assert HealpixPixel(1, 44) in cone_pixels
+    assert np.all(np.diff(pixel_indexes[offsets[2] :]) > 0)
+
+
+def test_cone_partition_indexes_large_cone():
+    tree = PixelTree.from_arrays(np.full(48, 1), np.arange(48))
+    offsets, pixel_indexes = get_cone_partition_indexes(tree, 10, 80, 179 * 3600)
+    np.testing.assert_array_equal(offsets, [0, 48])
+    np.testing.assert_array_equal(pixel_indexes, np.arange(48))
+
+
+def test_cone_partition_indexes_empty(pixel_tree_2):
+    offsets, pixel_indexes = get_cone_partition_indexes(pixel_tree_2, [], [], 1)
+    np.testing.assert_array_equal(offsets, [0])
+    assert len(pixel_indexes) == 0
+    offsets, pixel_indexes = get_cone_partition_indexes(PixelTree.from_healpix([]), [1, 2], [3, 4], 1)
+    np.testing.assert_array_equal(offsets, [0, 0, 0])
+    assert len(pixel_indexes) == 0
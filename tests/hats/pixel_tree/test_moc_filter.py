@@ -1,8 +1,10 @@
 import numpy as np
+import pytest
 from mocpy import MOC
 
+import hats.pixel_tree.moc_filter
 from hats.pixel_math import HealpixPixel
-from hats.pixel_tree.moc_filter import filter_by_moc
+from hats.pixel_tree.moc_filter import filter_by_moc, get_filtered_indexes, perform_filter_by_moc
 from hats.pixel_tree.pixel_tree import PixelTree
 
 
@@ -67,3 +69,27 @@ def test_moc_filter_empty_result(pixel_tree_2):
     moc = MOC.from_healpix_cells(pixels, orders, 0)
     filtered_tree = filter_by_moc(pixel_tree_2, moc)
     assert filtered_tree.get_healpix_pixels() == []
+
+
+@pytest.mark.parametrize("search_size_ratio", [0, 1_000_000])
+def test_moc_filter_search_matches_merge(pixel_tree_2, search_size_ratio, monkeypatch):
+    """Both binary search strategies give the same pixels as merging the interval lists"""
+    monkeypatch.setattr(hats.pixel_tree.moc_filter, "SEARCH_SIZE_RATIO", search_size_ratio)
+    tree_29_ranges = pixel_tree_2.to_depth29_ranges()
+    for orders, pixels, max_depth in [
+        ([1, 1, 2], [45, 46, 128], 2),
+        ([0, 1], [11, 32], 1),
+        ([1, 3], [40, 520], 3),
+        ([4, 4, 4, 5], [2048, 2049, 2100, 10000], 5),
+    ]:
+        moc = MOC.from_healpix_cells(np.array(pixels), np.array(orders), max_depth)
+        expected = np.flatnonzero(perform_filter_by_moc(tree_29_ranges, moc.to_depth29_ranges))
+        np.testing.assert_array_equal(get_filtered_indexes(pixel_tree_2, moc.to_depth29_ranges), expected)
+        np.testing.assert_array_equal(filter_by_moc(pixel_tree_2, moc).tree, pixel_tree_2.tree[expected])
+
+
+def test_moc_filter_small_moc_large_tree():
+    tree = PixelTree.from_arrays(np.full(12 * 4**5, 5), np.arange(12 * 4**5))
+    moc = MOC.from_healpix_cells(np.array([100, 101, 4000, 4000 * 16 + 3]), np.array([7, 7, 7, 9]), 9)
+    filtered_tree = filter_by_moc(tree, moc)
+    assert filtered_tree.get_healpix_pixels() == [HealpixPixel(5, 6), HealpixPixel(5, 250)]
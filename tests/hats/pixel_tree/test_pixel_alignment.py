@@ -1,9 +1,10 @@
 import numpy as np
+import pandas as pd
 import pytest
 
 from hats.catalog import Catalog
 from hats.pixel_math import HealpixPixel
-from hats.pixel_tree.pixel_alignment import PixelAlignment, align_trees, align_with_mocs
+from hats.pixel_tree.pixel_alignment import PixelAlignment, align_many, align_trees, align_with_mocs
 from hats.pixel_tree.pixel_tree import PixelTree
 
 
@@ -18,21 +19,21 @@ def assert_mapping_matches_tree(alignment: PixelAlignment):
             HealpixPixel(
                 row[PixelAlignment.PRIMARY_ORDER_COLUMN_NAME], row[PixelAlignment.PRIMARY_PIXEL_COLUMN_NAME]
             )
-            if row[PixelAlignment.PRIMARY_ORDER_COLUMN_NAME] is not None
+            if not pd.isna(row[PixelAlignment.PRIMARY_ORDER_COLUMN_NAME])
             else None
         )
         right_pixel = (
             HealpixPixel(
                 row[PixelAlignment.JOIN_ORDER_COLUMN_NAME], row[PixelAlignment.JOIN_PIXEL_COLUMN_NAME]
             )
-            if row[PixelAlignment.JOIN_ORDER_COLUMN_NAME] is not None
+            if not pd.isna(row[PixelAlignment.JOIN_ORDER_COLUMN_NAME])
             else None
         )
         aligned_pixel = (
             HealpixPixel(
                 row[PixelAlignment.ALIGNED_ORDER_COLUMN_NAME], row[PixelAlignment.ALIGNED_PIXEL_COLUMN_NAME]
             )
-            if row[PixelAlignment.ALIGNED_ORDER_COLUMN_NAME] is not None
+            if not pd.isna(row[PixelAlignment.ALIGNED_ORDER_COLUMN_NAME])
             else None
         )
         assert pixel == aligned_pixel
@@ -280,3 +281,123 @@ def test_outer_align_start_0():
     )
     assert_trees_equal(alignment.pixel_tree, expected_tree)
     assert_mapping_matches_tree(alignment)
+
+
+def test_outer_alignment_fills_gaps():
+    """Filling the gaps around a small pixel in a large one adds more rows than there are input pixels"""
+    left_tree = PixelTree.from_healpix([HealpixPixel(0, 0)])
+    right_tree = PixelTree.from_healpix([HealpixPixel(3, 1)])
+    alignment = align_trees(left_tree, right_tree, "outer")
+    expected_tree = PixelTree.from_healpix(
+        [HealpixPixel(3, pixel) for pixel in range(4)]
+        + [HealpixPixel(2, pixel) for pixel in range(1, 4)]
+        + [HealpixPixel(1, pixel) for pixel in range(1, 4)]
+    )
+    assert_trees_equal(alignment.pixel_tree, expected_tree)
+    assert_mapping_matches_tree(alignment)
+    assert len(alignment.pixel_mapping) == 10
+    assert (alignment.pixel_mapping[PixelAlignment.PRIMARY_ORDER_COLUMN_NAME] == 0).all()
+
+
+@pytest.mark.parametrize("alignment_type", ["inner", "left", "right", "outer"])
+@pytest.mark.parametrize("split_order", [0, 1, 2, 5])
+def test_threaded_alignment_matches(pixel_tree_2, pixel_tree_3, alignment_type, split_order):
+    alignment = align_trees(pixel_tree_2, pixel_tree_3, alignment_type)
+    threaded_alignment = align_trees(
+        pixel_tree_2, pixel_tree_3, alignment_type, n_threads=2, split_order=split_order
+    )
+    assert_trees_equal(threaded_alignment.pixel_tree, alignment.pixel_tree)
+    pd.testing.assert_frame_equal(threaded_alignment.pixel_mapping, alignment.pixel_mapping)
+
+    empty_tree = PixelTree.from_healpix([])
+    threaded_alignment = align_trees(pixel_tree_2, empty_tree, alignment_type, n_threads=2)
+    assert_trees_equal(
+        threaded_alignment.pixel_tree, align_trees(pixel_tree_2, empty_tree, alignment_type).pixel_tree
+    )
+
+
+def test_threaded_alignment_with_mocs(pixel_tree_2, pixel_tree_3, aligned_trees_2_3_inner):
+    moc_pixels = aligned_trees_2_3_inner.get_healpix_pixels()[:-3]
+    moc = PixelTree.from_healpix(moc_pixels).to_moc()
+    alignment = align_with_mocs(pixel_tree_2, pixel_tree_3, moc, None)
+    threaded_alignment = align_with_mocs(pixel_tree_2, pixel_tree_3, moc, None, n_threads=3)
+    assert_trees_equal(threaded_alignment.pixel_tree, alignment.pixel_tree)
+    pd.testing.assert_frame_equal(threaded_alignment.pixel_mapping, alignment.pixel_mapping)
+
+
+@pytest.mark.parametrize("alignment_type", ["inner", "outer"])
+def test_align_many_matches_align_trees(pixel_tree_2, pixel_tree_3, alignment_type):
+    alignment = align_trees(pixel_tree_2, pixel_tree_3, alignment_type)
+    many_alignment = align_many([pixel_tree_2, pixel_tree_3], alignment_type)
+    assert_trees_equal(many_alignment.pixel_tree, alignment.pixel_tree)
+    assert many_alignment.alignment_type == alignment_type
+    expected_mapping = alignment.pixel_mapping.rename(
+        columns={
+            PixelAlignment.PRIMARY_ORDER_COLUMN_NAME: PixelAlignment.TREE_ORDER_COLUMN_NAME.format(0),
+            PixelAlignment.PRIMARY_PIXEL_COLUMN_NAME: PixelAlignment.TREE_PIXEL_COLUMN_NAME.format(0),
+            PixelAlignment.JOIN_ORDER_COLUMN_NAME: PixelAlignment.TREE_ORDER_COLUMN_NAME.format(1),
+            PixelAlignment.JOIN_PIXEL_COLUMN_NAME: PixelAlignment.TREE_PIXEL_COLUMN_NAME.format(1),
+        }
+    )
+    pd.testing.assert_frame_equal(many_alignment.pixel_mapping, expected_mapping)
+
+
+def test_align_many_three_trees():
+    trees = [
+        PixelTree.from_healpix([HealpixPixel(0, 0), HealpixPixel(0, 1)]),
+        PixelTree.from_healpix([HealpixPixel(1, 1), HealpixPixel(1, 4)]),
+        PixelTree.from_healpix([HealpixPixel(2, 5), HealpixPixel(1, 2), HealpixPixel(1, 4)]),
+    ]
+    inner = align_many(trees, "inner")
+    assert_trees_equal(inner.pixel_tree, PixelTree.from_healpix([HealpixPixel(2, 5), HealpixPixel(1, 4)]))
+    assert inner.pixel_mapping[PixelAlignment.TREE_ORDER_COLUMN_NAME.format(0)].tolist() == [0, 0]
+    assert inner.pixel_mapping[PixelAlignment.TREE_PIXEL_COLUMN_NAME.format(0)].tolist() == [0, 1]
+    assert inner.pixel_mapping[PixelAlignment.TREE_PIXEL_COLUMN_NAME.format(1)].tolist() == [1, 4]
+    assert inner.pixel_mapping[PixelAlignment.TREE_PIXEL_COLUMN_NAME.format(2)].tolist() == [5, 4]
+
+    outer = align_many(trees, "outer")
+    expected_tree = PixelTree.from_healpix(
+        [HealpixPixel(1, 0), HealpixPixel(2, 4), HealpixPixel(2, 5)]
+        + [HealpixPixel(2, pixel) for pixel in range(6, 8)]
+        + [HealpixPixel(1, 2), HealpixPixel(1, 3), HealpixPixel(1, 4)]
+        + [HealpixPixel(1, pixel) for pixel in range(5, 8)]
+    )
+    assert_trees_equal(outer.pixel_tree, expected_tree)
+    np.testing.assert_array_equal(
+        outer.pixel_mapping_arrays[PixelAlignment.TREE_ORDER_COLUMN_NAME.format(1)],
+        [-1, 1, 1, 1, 1, -1, -1, 1, -1, -1, -1],
+    )
+    assert outer.pixel_mapping[PixelAlignment.TREE_ORDER_COLUMN_NAME.format(1)].isna().sum() == 6
+
+
+def test_align_many_invalid():
+    with pytest.raises(ValueError, match="one tree"):
+        align_many([])
+    with pytest.raises(ValueError, match="inner or outer"):
+        align_many([PixelTree.from_healpix([HealpixPixel(0, 0)])], "left")
+
+
+def test_pixel_mapping_is_nullable_int():
+    left_tree = PixelTree.from_healpix([HealpixPixel(0, 0)])
+    right_tree = PixelTree.from_healpix([HealpixPixel(1, 1)])
+    alignment = align_trees(left_tree, right_tree, "outer")
+    mapping = alignment.pixel_mapping
+    assert (mapping.dtypes == pd.Int64Dtype()).all()
+    assert mapping[PixelAlignment.JOIN_PIXEL_COLUMN_NAME].isna().tolist() == [True, False, True, True]
+    join_pixels = alignment.pixel_mapping_arrays[PixelAlignment.JOIN_PIXEL_COLUMN_NAME]
+    np.testing.assert_array_equal(join_pixels, [-1, 1, -1, -1])
+    assert np.shares_memory(mapping[PixelAlignment.JOIN_PIXEL_COLUMN_NAME].array._data, join_pixels)
+
+    table = alignment.to_arrow()
+    assert table.column_names == list(mapping.columns)
+    assert table[PixelAlignment.JOIN_PIXEL_COLUMN_NAME].to_pylist() == [None, 1, None, None]
+    assert table[PixelAlignment.PRIMARY_PIXEL_COLUMN_NAME].null_count == 0
+
+
+def test_pixel_mapping_from_dataframe():
+    mapping = pd.DataFrame({PixelAlignment.PRIMARY_ORDER_COLUMN_NAME: [1, None]}, dtype=object)
+    alignment = PixelAlignment(PixelTree.from_healpix([]), mapping, "outer")
+    assert alignment.pixel_mapping is mapping
+    np.testing.assert_array_equal(
+        alignment.pixel_mapping_arrays[PixelAlignment.PRIMARY_ORDER_COLUMN_NAME], [1, -1]
+    )
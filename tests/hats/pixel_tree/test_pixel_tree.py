@@ -1,5 +1,7 @@
 import numpy as np
+import pytest
 
+import hats.pixel_tree.pixel_tree
 from hats.pixel_math import HealpixPixel
 from hats.pixel_math.healpix_pixel import get_higher_order_pixels
 from hats.pixel_tree.pixel_tree import PixelTree
@@ -19,6 +21,33 @@ def test_get_healpix_pixels(pixel_tree_2, pixel_list_breadth_first):
     assert pixel_tree_2.get_healpix_pixels() == pixel_list_breadth_first
 
 
+def test_pixel_tree_from_arrays(pixel_tree_2, pixel_list_breadth_first):
+    orders = np.array([pixel.order for pixel in pixel_list_breadth_first])
+    pixels = np.array([pixel.pixel for pixel in pixel_list_breadth_first])
+    tree = PixelTree.from_arrays(orders, pixels)
+    assert tree.tree_order == pixel_tree_2.tree_order
+    np.testing.assert_array_equal(tree.tree, pixel_tree_2.tree)
+    np.testing.assert_array_equal(tree.pixels, pixel_tree_2.pixels)
+
+    reversed_tree = PixelTree.from_arrays(orders[::-1], pixels[::-1], tree_order=5)
+    assert reversed_tree.tree_order == 5
+    assert reversed_tree.get_healpix_pixels() == pixel_list_breadth_first
+
+    array_tree = PixelTree.from_healpix(np.column_stack((orders, pixels)))
+    np.testing.assert_array_equal(array_tree.tree, pixel_tree_2.tree)
+
+    assert len(PixelTree.from_arrays(np.array([]), np.array([]))) == 0
+
+
+def test_pixel_tree_from_arrays_invalid():
+    with pytest.raises(ValueError, match="same length"):
+        PixelTree.from_arrays(np.array([0, 1]), np.array([0]))
+    with pytest.raises(ValueError, match="tree order"):
+        PixelTree.from_arrays(np.array([0, 3]), np.array([0, 1]), tree_order=2)
+    with pytest.raises(ValueError, match="overlapping"):
+        PixelTree.from_arrays(np.array([0, 1]), np.array([0, 1]))
+
+
 def test_pixel_tree_max_depth(pixel_tree_1, pixel_tree_2, pixel_tree_3):
     assert pixel_tree_1.get_max_depth() == 0
     assert pixel_tree_2.get_max_depth() == 2
@@ -60,3 +89,181 @@ def test_pixel_tree_contains():
     assert (1, 1) not in tree
     assert HealpixPixel(1, 1) not in tree
     assert (0, 10) not in tree
+
+
+def test_pixel_tree_contains_many(pixel_tree_2):
+    orders = np.array([0, 1, 1, 2, 2, 0, 3, 1])
+    pixels = np.array([0, 1, 33, 128, 129, 11, 512, 0])
+    expected = [pixel_tree_2.contains((order, pixel)) for order, pixel in zip(orders, pixels)]
+    np.testing.assert_array_equal(pixel_tree_2.contains_many(orders, pixels), expected)
+    assert np.any(expected)
+
+    healpix_pixels = pixel_tree_2.get_healpix_pixels()
+    all_orders = np.array([p.order for p in healpix_pixels])
+    all_pixels = np.array([p.pixel for p in healpix_pixels])
+    assert np.all(pixel_tree_2.contains_many(all_orders, all_pixels))
+    assert not np.any(pixel_tree_2.contains_many(all_orders + 1, all_pixels << 2))
+
+    np.testing.assert_array_equal(
+        pixel_tree_2.contains_many(0, np.arange(12)), [pixel_tree_2.contains((0, p)) for p in range(12)]
+    )
+    assert len(pixel_tree_2.contains_many(np.array([]), np.array([]))) == 0
+    empty_tree = PixelTree.from_healpix([])
+    assert not np.any(empty_tree.contains_many(orders, pixels))
+
+
+def test_pixel_tree_get_spatial_index_leaf_indexes(pixel_tree_2, monkeypatch):
+    rng = np.random.default_rng(0)
+    spatial_index = rng.integers(0, 12 * 4**29, size=1000)
+    expected = pixel_tree_2.get_containing_leaf_indexes(29, spatial_index)
+    assert np.any(expected >= 0) and np.any(expected < 0)
+    np.testing.assert_array_equal(pixel_tree_2.get_spatial_index_leaf_indexes(spatial_index), expected)
+    monkeypatch.setattr(hats.pixel_tree.pixel_tree, "DEFAULT_CHUNK_SIZE", 7)
+    np.testing.assert_array_equal(pixel_tree_2.get_spatial_index_leaf_indexes(spatial_index), expected)
+    np.testing.assert_array_equal(
+        pixel_tree_2.get_spatial_index_leaf_indexes(spatial_index.reshape(10, 100)), expected.reshape(10, 100)
+    )
+    empty_tree = PixelTree.from_healpix([])
+    np.testing.assert_array_equal(empty_tree.get_spatial_index_leaf_indexes(spatial_index[:3]), [-1, -1, -1])
+
+
+def test_pixel_tree_get_containing_leaf_indexes(pixel_tree_2):
+    healpix_pixels = pixel_tree_2.get_healpix_pixels()
+    all_orders = np.array([p.order for p in healpix_pixels])
+    all_pixels = np.array([p.pixel for p in healpix_pixels])
+    expected_indexes = np.arange(len(pixel_tree_2))
+    np.testing.assert_array_equal(
+        pixel_tree_2.get_containing_leaf_indexes(all_orders, all_pixels), expected_indexes
+    )
+    # Children of each leaf are contained in that leaf, at any order
+    np.testing.assert_array_equal(
+        pixel_tree_2.get_containing_leaf_indexes(all_orders + 1, (all_pixels << 2) + 3), expected_indexes
+    )
+    np.testing.assert_array_equal(
+        pixel_tree_2.get_containing_leaf_indexes(29, all_pixels << (2 * (29 - all_orders))),
+        expected_indexes,
+    )
+    # Parents of leaves are not contained in a single leaf
+    leaf_index = pixel_tree_2.get_containing_leaf_indexes(
+        np.array([1, 0, 2]), np.array([healpix_pixels[-1].pixel >> 2, 11, 0])
+    )
+    np.testing.assert_array_equal(leaf_index, [-1, -1, -1])
+
+
+def test_pixel_tree_write_and_read_file(tmp_path, pixel_tree_2):
+    file_pointer = tmp_path / "pixel_tree.bin"
+    pixel_tree_2.write_to_file(file_pointer, checksum=b"abc")
+
+    tree = PixelTree.read_from_file(file_pointer, checksum=b"abc")
+    assert tree.tree_order == pixel_tree_2.tree_order
+    np.testing.assert_array_equal(tree.tree, pixel_tree_2.tree)
+    np.testing.assert_array_equal(tree.pixels, pixel_tree_2.pixels)
+    assert tree.tree.dtype == np.int64
+    assert not tree.tree.flags.writeable
+
+    # The checksum is only checked if one is given
+    tree = PixelTree.read_from_file(file_pointer)
+    np.testing.assert_array_equal(tree.tree, pixel_tree_2.tree)
+    with pytest.raises(ValueError, match="checksum"):
+        PixelTree.read_from_file(file_pointer, checksum=b"abd")
+
+    _, pixel_order = PixelTree.read_from_file(file_pointer, return_pixel_order=True)
+    assert pixel_order is None
+    pixel_order = np.arange(len(pixel_tree_2))[::-1]
+    pixel_tree_2.write_to_file(file_pointer, pixel_order=pixel_order)
+    tree, read_pixel_order = PixelTree.read_from_file(file_pointer, return_pixel_order=True)
+    np.testing.assert_array_equal(tree.tree, pixel_tree_2.tree)
+    np.testing.assert_array_equal(read_pixel_order, pixel_order)
+    with pytest.raises(ValueError, match="one index"):
+        pixel_tree_2.write_to_file(file_pointer, pixel_order=pixel_order[1:])
+
+    empty_tree = PixelTree.from_healpix([])
+    empty_tree.write_to_file(file_pointer)
+    assert len(PixelTree.read_from_file(file_pointer, checksum=b"")) == 0
+
+
+def test_pixel_tree_read_invalid_file(tmp_path, pixel_tree_2):
+    file_pointer = tmp_path / "pixel_tree.bin"
+    file_pointer.write_bytes(b"order,pixel\n")
+    with pytest.raises(ValueError, match="not a pixel tree file"):
+        PixelTree.read_from_file(file_pointer)
+
+    pixel_tree_2.write_to_file(file_pointer)
+    file_pointer.write_bytes(file_pointer.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        PixelTree.read_from_file(file_pointer)
+
+    with pytest.raises(ValueError, match="16 bytes"):
+        pixel_tree_2.write_to_file(file_pointer, checksum=bytes(17))
+
+
+def test_pixel_tree_insert_pixels(pixel_tree_2):
+    healpix_pixels = list(pixel_tree_2.get_healpix_pixels())
+    removed = [healpix_pixels[0], healpix_pixels[4], healpix_pixels[-1]]
+    tree = PixelTree.from_healpix([p for p in healpix_pixels if p not in removed])
+
+    inserted = tree.insert_pixels([p.order for p in removed], [p.pixel for p in removed])
+    assert inserted.tree_order == pixel_tree_2.tree_order
+    np.testing.assert_array_equal(inserted.tree, pixel_tree_2.tree)
+    np.testing.assert_array_equal(inserted.pixels, pixel_tree_2.pixels)
+    # The original tree is unchanged
+    assert len(tree) == len(pixel_tree_2) - 3
+
+    # Pixels at a higher order than the tree change the order of the tree
+    higher_order = tree.insert_pixels(5, [removed[0].pixel << 4])
+    assert higher_order.tree_order == 5
+    expected = PixelTree.from_healpix(
+        [HealpixPixel(5, removed[0].pixel << 4)] + [p for p in healpix_pixels if p not in removed]
+    )
+    assert higher_order.get_healpix_pixels() == expected.get_healpix_pixels()
+
+    assert PixelTree.from_healpix([]).insert_pixels(2, [5, 1]).get_healpix_pixels() == [
+        HealpixPixel(2, 1),
+        HealpixPixel(2, 5),
+    ]
+
+
+def test_pixel_tree_insert_overlapping_pixels(pixel_tree_2):
+    leaf = pixel_tree_2.get_healpix_pixels()[2]
+    with pytest.raises(ValueError, match="overlap"):
+        pixel_tree_2.insert_pixels(leaf.order, [leaf.pixel])
+    with pytest.raises(ValueError, match="overlap"):
+        pixel_tree_2.insert_pixels(leaf.order + 1, [leaf.pixel << 2])
+    with pytest.raises(ValueError, match="overlap"):
+        pixel_tree_2.insert_pixels(leaf.order - 1, [leaf.pixel >> 2])
+    with pytest.raises(ValueError, match="overlap"):
+        PixelTree.from_healpix([]).insert_pixels([0, 1], [5, 20])
+    with pytest.raises(ValueError, match="between"):
+        pixel_tree_2.insert_pixels(0, [12])
+
+
+def test_pixel_tree_remove_pixels(pixel_tree_2):
+    healpix_pixels = list(pixel_tree_2.get_healpix_pixels())
+    removed = [healpix_pixels[-1], healpix_pixels[0], healpix_pixels[4]]
+    tree = pixel_tree_2.remove_pixels([p.order for p in removed], [p.pixel for p in removed])
+    expected = PixelTree.from_healpix([p for p in healpix_pixels if p not in removed])
+    np.testing.assert_array_equal(tree.tree, expected.tree)
+    np.testing.assert_array_equal(tree.pixels, expected.pixels)
+
+    leaf = healpix_pixels[2]
+    with pytest.raises(ValueError, match="not leaf nodes"):
+        pixel_tree_2.remove_pixels(leaf.order + 1, [leaf.pixel << 2])
+    with pytest.raises(ValueError, match="repeated"):
+        pixel_tree_2.remove_pixels(leaf.order, [leaf.pixel, leaf.pixel])
+
+
+def test_pixel_tree_split_pixels(pixel_tree_2):
+    healpix_pixels = list(pixel_tree_2.get_healpix_pixels())
+    split = [healpix_pixels[1], healpix_pixels[-1]]
+    tree = pixel_tree_2.split_pixels([p.order for p in split], [p.pixel for p in split])
+    children = [child for p in split for child in p.convert_to_higher_order(1)]
+    expected = PixelTree.from_healpix([p for p in healpix_pixels if p not in split] + children)
+    assert tree.tree_order == expected.tree_order
+    np.testing.assert_array_equal(tree.tree, expected.tree)
+    np.testing.assert_array_equal(tree.pixels, expected.pixels)
+
+    leaf = healpix_pixels[2]
+    with pytest.raises(ValueError, match="not leaf nodes"):
+        pixel_tree_2.split_pixels(leaf.order - 1, [leaf.pixel >> 2])
+    with pytest.raises(ValueError, match="Cannot split"):
+        PixelTree.from_healpix([HealpixPixel(29, 0)]).split_pixels(29, [0])